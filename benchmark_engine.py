@@ -0,0 +1,575 @@
+#!/usr/bin/env python3
+"""
+Benchmarks do Motor do Jogo
+===========================
+
+Mede passos por segundo do motor do jogo em diferentes tamanhos de cobra.
+A cobra percorre um ciclo hamiltoniano do tabuleiro, então nunca colide e
+o custo medido é apenas o do motor (movimento, colisão e comida).
+
+"""
+
+import sys
+import os
+import time
+import random
+from collections import deque
+
+# Adicionar src ao path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+# Permite rodar o SnakeGame (pygame) em máquinas sem display
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+from src.game.headless_game import HeadlessSnakeGame, Direction, Point
+
+SNAKE_LENGTHS = [3, 50, 200, 600]
+BODY_LENGTHS = [3, 100, 800]
+FILL_LEVELS = [0.01, 0.5, 0.9, 0.99]
+BATCH_SIZES = [1, 16, 64, 256, 1024]
+STEPS_PER_CHUNK = 1000
+TIME_PER_MEASURE = 1.0  # segundos
+FLOOD_FILL_BUDGET_US = 100  # Orçamento por passo da área alcançável (3 jogadas), no p99
+
+def hamiltonian_cycle(grid_width, grid_height):
+    """
+    Retorna as células de um ciclo hamiltoniano (grade com altura par):
+    a coluna 0 sobe e as demais colunas são percorridas em zigue-zague.
+    """
+    cycle = []
+    for y in range(grid_height):
+        xs = range(1, grid_width) if y % 2 == 0 else range(grid_width - 1, 0, -1)
+        for x in xs:
+            cycle.append(Point(x, y))
+    for y in range(grid_height - 1, 0, -1):
+        cycle.append(Point(0, y))
+    cycle.append(Point(0, 0))
+    # Rotacionar para que o ciclo comece em (0, 0) e volte ao início
+    return cycle[-1:] + cycle[:-1]
+
+def _direction_between(a, b):
+    if b.x > a.x:
+        return Direction.RIGHT
+    if b.x < a.x:
+        return Direction.LEFT
+    if b.y > a.y:
+        return Direction.DOWN
+    return Direction.UP
+
+def cycle_action_table(cycle):
+    """Tabela (cabeça, direção) -> ação relativa que mantém a cobra no ciclo"""
+    clock_wise = [Direction.RIGHT, Direction.DOWN, Direction.LEFT, Direction.UP]
+    table = {}
+    n = len(cycle)
+    for i, cell in enumerate(cycle):
+        incoming = _direction_between(cycle[i - 1], cell)
+        outgoing = _direction_between(cell, cycle[(i + 1) % n])
+        turn = (clock_wise.index(outgoing) - clock_wise.index(incoming)) % 4
+        table[(cell, incoming)] = {0: 0, 1: 1, 3: 2}[turn]
+    return table
+
+def place_snake_on_cycle(game, cycle, length):
+    """Coloca a cobra com o tamanho pedido sobre o ciclo (cabeça no fim do trecho)"""
+    body = [cycle[i] for i in range(length - 1, -1, -1)]
+    direction = _direction_between(body[1], body[0])
+    game.set_snake(body, direction)
+
+def measure_steps_per_second(game, length, duration=TIME_PER_MEASURE):
+    """Mede passos/segundo do play_step com a cobra seguindo o ciclo hamiltoniano"""
+    cycle = hamiltonian_cycle(game.grid_width, game.grid_height)
+    table = cycle_action_table(cycle)
+
+    steps = 0
+    elapsed = 0.0
+    while elapsed < duration:
+        # Reposicionar a cobra a cada bloco para manter o tamanho estável
+        place_snake_on_cycle(game, cycle, length)
+        start = time.perf_counter()
+        for _ in range(STEPS_PER_CHUNK):
+            game.frame_iteration = 0  # Evitar o timeout do jogo
+            game.play_step(table[(game.head, game.direction)])
+        elapsed += time.perf_counter() - start
+        steps += STEPS_PER_CHUNK
+
+    return steps / elapsed
+
+def benchmark_headless_engine():
+    """Compara SnakeGame (pygame) com HeadlessSnakeGame em vários tamanhos de cobra"""
+    print("\n⚡ SnakeGame (pygame) vs HeadlessSnakeGame")
+    print("=" * 60)
+
+    from src.game.snake_game import SnakeGame
+
+    print(f"{'Tamanho':>8} | {'SnakeGame':>12} | {'Headless':>12} | {'Ganho':>6}")
+    print("-" * 60)
+    for length in SNAKE_LENGTHS:
+        pygame_sps = measure_steps_per_second(SnakeGame(), length)
+        headless_sps = measure_steps_per_second(HeadlessSnakeGame(), length)
+        print(f"{length:>8} | {pygame_sps:>10.0f}/s | {headless_sps:>10.0f}/s | {headless_sps / pygame_sps:>5.2f}x")
+
+def _time_body_moves(body, move, iterations=200000):
+    """Tempo médio (ns) de um movimento: cabeça nova na frente, cauda removida"""
+    head = body[0]
+    start = time.perf_counter()
+    for _ in range(iterations):
+        move(body, head)
+    return (time.perf_counter() - start) / iterations * 1e9
+
+def benchmark_body_structure():
+    """Compara o corpo em lista (insert(0)/pop) com o deque (appendleft/pop)"""
+    print("\n⚡ Corpo da cobra: lista vs deque")
+    print("=" * 60)
+
+    def list_move(body, head):
+        body.insert(0, head)
+        body.pop()
+
+    def deque_move(body, head):
+        body.appendleft(head)
+        body.pop()
+
+    game = HeadlessSnakeGame()
+    cycle = hamiltonian_cycle(game.grid_width, game.grid_height)
+
+    print(f"{'Tamanho':>8} | {'lista':>10} | {'deque':>10} | {'play_step':>12}")
+    print("-" * 60)
+    for length in BODY_LENGTHS:
+        body = [cycle[i] for i in range(length - 1, -1, -1)]
+        list_ns = _time_body_moves(list(body), list_move)
+        deque_ns = _time_body_moves(deque(body), deque_move)
+        steps_per_second = measure_steps_per_second(game, length)
+        print(f"{length:>8} | {list_ns:>7.0f} ns | {deque_ns:>7.0f} ns | {steps_per_second:>10.0f}/s")
+
+def _rejection_sample_food(game, rng):
+    """Posicionamento antigo: sorteia qualquer célula e repete enquanto cair no corpo"""
+    while True:
+        food = Point(rng.randint(0, game.grid_width - 1), rng.randint(0, game.grid_height - 1))
+        if food not in game.snake:
+            return food
+
+def benchmark_food_placement():
+    """Compara o sorteio por rejeição com o índice de células livres em vários níveis de ocupação"""
+    print("\n⚡ Posicionamento da comida por ocupação do tabuleiro")
+    print("=" * 60)
+
+    game = HeadlessSnakeGame(seed=0)
+    rng = random.Random(0)
+    cycle = hamiltonian_cycle(game.grid_width, game.grid_height)
+
+    print(f"{'Ocupação':>9} | {'rejeição':>12} | {'células livres':>14}")
+    print("-" * 60)
+    for fill in FILL_LEVELS:
+        place_snake_on_cycle(game, cycle, max(3, int(fill * len(cycle))))
+
+        iterations = 2000
+        start = time.perf_counter()
+        for _ in range(iterations):
+            _rejection_sample_food(game, rng)
+        rejection_us = (time.perf_counter() - start) / iterations * 1e6
+
+        start = time.perf_counter()
+        for _ in range(iterations):
+            game._place_food()
+        index_us = (time.perf_counter() - start) / iterations * 1e6
+
+        print(f"{fill * 100:>8.0f}% | {rejection_us:>9.2f} µs | {index_us:>11.2f} µs")
+
+def _time_per_call(function):
+    """Microssegundos por chamada, medidos por TIME_PER_MEASURE segundos"""
+    iterations = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < TIME_PER_MEASURE:
+        for _ in range(100):
+            function()
+        iterations += 100
+    return (time.perf_counter() - start) / iterations * 1e6
+
+def _time_once(function):
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+def benchmark_state_extraction():
+    """Mede o custo de get_state (colisões, raios e armadilhas) por tamanho de cobra: GameState vs IncrementalGameState"""
+    print("\n⚡ get_state por tamanho de cobra: GameState vs IncrementalGameState")
+    print("=" * 60)
+
+    from src.game.game_state import GameState
+    from src.game.incremental_state import IncrementalGameState
+
+    game = HeadlessSnakeGame()
+    cycle = hamiltonian_cycle(game.grid_width, game.grid_height)
+    game_state = GameState(game)
+    incremental = IncrementalGameState(game)
+
+    print(f"{'Tamanho':>8} | {'GameState':>12} | {'Incremental':>12} | {'Ganho':>6}")
+    print("-" * 60)
+    for length in SNAKE_LENGTHS:
+        place_snake_on_cycle(game, cycle, length)
+        full_us = _time_per_call(game_state.get_state)
+        incremental_us = _time_per_call(incremental.get_state)
+        print(f"{length:>8} | {full_us:>9.1f} µs | {incremental_us:>9.1f} µs | {full_us / incremental_us:>5.1f}x")
+
+    # Partidas reais: cobra curta, cabeça longe do corpo, raios longos
+    rng = random.Random(0)
+    game.reset()
+    full_total = incremental_total = 0.0
+    for _ in range(5000):
+        full_total += _time_once(game_state.get_state)
+        incremental_total += _time_once(incremental.get_state)
+        _, done, _ = game.play_step(rng.choice([0, 0, 0, 1, 2]))
+        if done:
+            game.reset()
+    print(f"{'aleatório':>8} | {full_total / 5000 * 1e6:>9.1f} µs | {incremental_total / 5000 * 1e6:>9.1f} µs | "
+          f"{full_total / incremental_total:>5.1f}x")
+
+def benchmark_batch_env():
+    """Passos de ambiente por segundo (passo + estado) do BatchSnakeEnv vs um HeadlessSnakeGame"""
+    print("\n⚡ BatchSnakeEnv vs HeadlessSnakeGame (passo + get_state, ações aleatórias)")
+    print("=" * 60)
+
+    import numpy as np
+    from src.game.game_state import GameState
+    from src.game.batch_env import BatchSnakeEnv
+
+    # Referência: uma partida por vez, como no Trainer
+    game = HeadlessSnakeGame(seed=0)
+    game_state = GameState(game)
+    rng = random.Random(0)
+    steps = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < TIME_PER_MEASURE:
+        game_state.get_state()
+        reward, done, score = game.play_step(rng.randint(0, 2))
+        if done:
+            game.reset()
+        steps += 1
+    single_sps = steps / (time.perf_counter() - start)
+    print(f"{'HeadlessSnakeGame':>20} | {single_sps:>10.0f} passos/s")
+
+    np_rng = np.random.default_rng(0)
+    for num_envs in BATCH_SIZES:
+        env = BatchSnakeEnv(num_envs, seed=0)
+        steps = 0
+        start = time.perf_counter()
+        while time.perf_counter() - start < TIME_PER_MEASURE:
+            env.get_state()
+            env.step(np_rng.integers(0, 3, size=num_envs))
+            steps += num_envs
+        batch_sps = steps / (time.perf_counter() - start)
+        print(f"{'BatchSnakeEnv N=' + str(num_envs):>20} | {batch_sps:>10.0f} passos/s | {batch_sps / single_sps:>6.1f}x")
+
+def legacy_batch_rays(env):
+    """Raios e densidades do BatchSnakeEnv antes de features.py: um passo de raio por iteração"""
+    import numpy as np
+    ids = env._env_ids
+    hx, hy = env.heads[:, 0], env.heads[:, 1]
+
+    def blocked(x, y):
+        out_of_bounds = (x < 0) | (x >= env.grid_width) | (y < 0) | (y >= env.grid_height)
+        cx = np.clip(x, 0, env.grid_width - 1)
+        cy = np.clip(y, 0, env.grid_height - 1)
+        return out_of_bounds | (env.occupancy[ids, cy, cx] > 0)
+
+    densities, free_counts = [], []
+    for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
+        count = np.zeros(env.num_envs, dtype=np.int64)
+        for i in range(1, 4):
+            x, y = hx + dx * i, hy + dy * i
+            inside = (x >= 0) & (x < env.grid_width) & (y >= 0) & (y < env.grid_height)
+            count += inside & (env.occupancy[ids, np.clip(y, 0, env.grid_height - 1),
+                                             np.clip(x, 0, env.grid_width - 1)] > 0)
+        densities.append(count / 3)
+
+        count = np.zeros(env.num_envs, dtype=np.int64)
+        running = np.ones(env.num_envs, dtype=bool)
+        for i in range(1, max(env.grid_width, env.grid_height) + 1):
+            running &= ~blocked(hx + dx * i, hy + dy * i)
+            if not running.any():
+                break
+            count += running
+        free_counts.append(count)
+    return densities, free_counts
+
+def benchmark_directional_features():
+    """Custo das 8 features direcionais (densidades e espaços livres) por tabuleiro: laços vs features.py"""
+    print("\n⚡ Features direcionais: laços célula a célula vs raios NumPy (features.py)")
+    print("=" * 60)
+
+    import numpy as np
+    from src.game.game_state import GameState
+    from src.game.batch_env import BatchSnakeEnv
+    from src.game.features import game_grid, directional_features
+
+    offsets = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+    game = HeadlessSnakeGame(seed=0)
+    game_state = GameState(game)
+
+    def scalar_features():
+        head = game.head
+        for direction in offsets:
+            game_state._count_body_segments_in_direction(head, direction, 3)
+            game_state._count_free_spaces_in_direction(head, direction)
+
+    def numpy_features():
+        directional_features(game_grid(game), np.array([[game.head.x, game.head.y]]))
+
+    rng = random.Random(0)
+    scalar_total = numpy_total = 0.0
+    for _ in range(5000):
+        scalar_total += _time_once(scalar_features)
+        numpy_total += _time_once(numpy_features)
+        _, done, _ = game.play_step(rng.choice([0, 0, 0, 1, 2]))
+        if done:
+            game.reset()
+    print(f"{'Tabuleiros':>10} | {'Laços':>12} | {'features.py':>12} | {'Ganho':>6}  (µs por tabuleiro)")
+    print("-" * 60)
+    print(f"{'1 (jogo)':>10} | {scalar_total / 5000 * 1e6:>9.1f} µs | {numpy_total / 5000 * 1e6:>9.1f} µs | "
+          f"{scalar_total / numpy_total:>5.1f}x")
+
+    np_rng = np.random.default_rng(0)
+    for num_envs in BATCH_SIZES:
+        env = BatchSnakeEnv(num_envs, seed=0)
+        legacy_total = numpy_total = 0.0
+        rounds = 200
+        for _ in range(rounds):
+            legacy_total += _time_once(lambda: legacy_batch_rays(env))
+            numpy_total += _time_once(lambda: directional_features(env._grid, env.heads))
+            env.step(np_rng.choice([0, 0, 0, 1, 2], size=num_envs))
+        legacy_us = legacy_total / rounds / num_envs * 1e6
+        numpy_us = numpy_total / rounds / num_envs * 1e6
+        print(f"{num_envs:>10} | {legacy_us:>9.2f} µs | {numpy_us:>9.2f} µs | {legacy_us / numpy_us:>5.1f}x")
+
+def naive_reachable_areas(game):
+    """Referência ingênua: BFS completa célula a célula para cada jogada, a cada passo"""
+    from collections import deque as queue_type
+    body = set(game.snake)
+    body.discard(game.snake[-1])
+    clock_wise = [Direction.RIGHT, Direction.DOWN, Direction.LEFT, Direction.UP]
+    deltas = [(1, 0), (0, 1), (-1, 0), (0, -1)]
+    idx = clock_wise.index(game.direction)
+    areas = []
+    for turn in (0, 1, 3):
+        dx, dy = deltas[(idx + turn) % 4]
+        start = Point(game.head.x + dx, game.head.y + dy)
+        if game.is_collision(start) and start != game.snake[-1]:
+            areas.append(0)
+            continue
+        seen = {start}
+        queue = queue_type([start])
+        while queue:
+            pt = queue.popleft()
+            for ndx, ndy in deltas:
+                neighbor = Point(pt.x + ndx, pt.y + ndy)
+                if (neighbor not in seen and neighbor not in body and
+                        0 <= neighbor.x < game.grid_width and 0 <= neighbor.y < game.grid_height):
+                    seen.add(neighbor)
+                    queue.append(neighbor)
+        areas.append(min(len(seen), len(game.snake)))
+    return tuple(areas)
+
+def _percentiles(samples):
+    samples = sorted(samples)
+    return (samples[len(samples) // 2] * 1e6, samples[int(len(samples) * 0.99)] * 1e6, samples[-1] * 1e6)
+
+def benchmark_flood_fill():
+    """Custo por passo da área alcançável num tabuleiro 30x30: BFS ingênua vs flood fill em bitsets"""
+    print(f"\n⚡ Área alcançável por passo (30x30, orçamento {FLOOD_FILL_BUDGET_US} µs no p99)")
+    print("=" * 60)
+
+    from src.game.flood_fill import ReachableArea
+
+    game = HeadlessSnakeGame(seed=0)
+    cycle = hamiltonian_cycle(game.grid_width, game.grid_height)
+    table = cycle_action_table(cycle)
+    print(f"{'Tamanho':>9} | {'BFS p50/p99':>15} | {'sem reuso p50/p99/máx':>22} | {'flood p50/p99/máx':>20}")
+    print("-" * 78)
+
+    def measure(length, policy, steps=2000):
+        """Tempos por passo (BFS, flood sem reaproveitar entre passos, flood completo)"""
+        naive, fresh, cached = [], [], []
+        fresh_area = ReachableArea(game)
+        reachable = ReachableArea(game)
+        if length is None:
+            game.reset()
+        else:
+            place_snake_on_cycle(game, cycle, length)
+        for _ in range(steps):
+            naive.append(_time_once(lambda: naive_reachable_areas(game)))
+            fresh_area.invalidate()
+            fresh.append(_time_once(fresh_area.get_areas))
+            cached.append(_time_once(reachable.get_areas))
+            game.frame_iteration = 0  # Evitar o timeout do jogo
+            _, done, _ = game.play_step(policy())
+            if done:
+                game.reset()
+        return naive, fresh, cached
+
+    rng = random.Random(0)
+    worst_p99 = 0.0
+    rows = [(str(length), length, lambda: table[(game.head, game.direction)]) for length in SNAKE_LENGTHS]
+    rows.append(("aleatório", None, lambda: rng.choice([0, 0, 0, 1, 2])))
+    for label, length, policy in rows:
+        naive, fresh, cached = measure(length, policy)
+        naive_p = _percentiles(naive)
+        fresh_p = _percentiles(fresh)
+        cached_p = _percentiles(cached)
+        worst_p99 = max(worst_p99, cached_p[1])
+        print(f"{label:>9} | {naive_p[0]:>6.0f}/{naive_p[1]:>6.0f} µs | "
+              f"{fresh_p[0]:>5.1f}/{fresh_p[1]:>5.1f}/{fresh_p[2]:>6.1f} µs | "
+              f"{cached_p[0]:>4.1f}/{cached_p[1]:>5.1f}/{cached_p[2]:>6.1f} µs")
+    status = "dentro do" if worst_p99 <= FLOOD_FILL_BUDGET_US else "ACIMA do"
+    print(f"Pior p99 com reaproveitamento: {worst_p99:.1f} µs ({status} orçamento de {FLOOD_FILL_BUDGET_US} µs)")
+
+def python_grid_state(game):
+    """Imagem (4, H, W) montada em Python a cada passo: array novo e um laço pelo corpo"""
+    import numpy as np
+    planes = np.zeros((4, game.grid_height, game.grid_width), dtype=np.float32)
+    length = len(game.snake)
+    for i, pt in enumerate(game.snake):
+        if 0 <= pt.x < game.grid_width and 0 <= pt.y < game.grid_height:
+            planes[1 if i == 0 else 0, pt.y, pt.x] = 1.0
+            planes[3, pt.y, pt.x] = (length - i) / length
+    planes[2, game.food.y, game.food.x] = 1.0
+    return planes
+
+def benchmark_grid_encoder():
+    """Estado em imagem (C, H, W): montagem em Python vs GridEncoder (um jogo e lotes)"""
+    print("\n⚡ Estado em grade (C, H, W): Python por passo vs GridEncoder")
+    print("=" * 60)
+
+    import numpy as np
+    from src.game.batch_env import BatchSnakeEnv
+    from src.game.grid_encoder import GridEncoder
+
+    game = HeadlessSnakeGame()
+    cycle = hamiltonian_cycle(game.grid_width, game.grid_height)
+    plain = GridEncoder()
+    aged = GridEncoder(age_channel=True)
+    print(f"{'Tamanho':>8} | {'Python':>10} | {'3 canais':>10} | {'4 canais':>10} | {'Ganho (4)':>9}")
+    print("-" * 60)
+    for length in SNAKE_LENGTHS:
+        place_snake_on_cycle(game, cycle, length)
+        python_us = _time_per_call(lambda: python_grid_state(game))
+        plain_us = _time_per_call(lambda: plain.encode(game))
+        aged_us = _time_per_call(lambda: aged.encode(game))
+        print(f"{length:>8} | {python_us:>7.1f} µs | {plain_us:>7.1f} µs | {aged_us:>7.1f} µs | {python_us / aged_us:>8.1f}x")
+
+    print(f"\n{'Lote':>8} | {'3 canais':>14} | {'4 canais':>14}  (µs por tabuleiro)")
+    print("-" * 60)
+    np_rng = np.random.default_rng(0)
+    for num_envs in BATCH_SIZES:
+        env = BatchSnakeEnv(num_envs, seed=0)
+        for _ in range(50):
+            env.step(np_rng.choice([0, 0, 0, 1, 2], size=num_envs))
+        plain = GridEncoder(num_boards=num_envs)
+        aged = GridEncoder(num_boards=num_envs, age_channel=True)
+        plain_us = _time_per_call(lambda: plain.encode_batch(env)) / num_envs
+        aged_us = _time_per_call(lambda: aged.encode_batch(env)) / num_envs
+        print(f"{num_envs:>8} | {plain_us:>11.2f} µs | {aged_us:>11.2f} µs")
+
+def _count_points(function):
+    """Executa function contando quantos Points (namedtuple) são criados"""
+    created = [0]
+    original_new = Point.__new__
+
+    def counting_new(cls, *args, **kwargs):
+        created[0] += 1
+        return original_new(cls, *args, **kwargs)
+
+    Point.__new__ = counting_new
+    try:
+        function()
+    finally:
+        Point.__new__ = original_new
+    return created[0]
+
+def benchmark_point_allocations():
+    """Points criados por passo e passos/s: só play_step e play_step + GameState (partidas aleatórias)"""
+    print("\n⚡ Alocação de Points e passos/s (partidas aleatórias, 30x30)")
+    print("=" * 60)
+
+    from src.game.game_state import GameState
+
+    steps = 20000
+    rng = random.Random(0)
+    actions = [rng.choice([0, 0, 0, 1, 2]) for _ in range(steps)]
+    HeadlessSnakeGame()  # Tabelas do tabuleiro montadas fora da contagem
+
+    def run(with_state):
+        game = HeadlessSnakeGame(seed=0)
+        game_state = GameState(game)
+        for action in actions:
+            if with_state:
+                game_state.get_state()
+            _, done, _ = game.play_step(action)
+            if done:
+                game.reset()
+
+    print(f"{'Laço':>22} | {'Points/passo':>12} | {'passos/s':>10}")
+    print("-" * 60)
+    for name, with_state in [("play_step", False), ("play_step + get_state", True)]:
+        points = _count_points(lambda: run(with_state))
+        start = time.perf_counter()
+        run(with_state)
+        elapsed = time.perf_counter() - start
+        print(f"{name:>22} | {points / steps:>12.2f} | {steps / elapsed:>10.0f}")
+
+def benchmark_snapshot_restore():
+    """Custo de ramificar o jogo para simular jogadas: copy.deepcopy vs snapshot()/restore()"""
+    print("\n⚡ Ramificar o jogo para busca: deepcopy vs snapshot/restore")
+    print("=" * 60)
+
+    import copy
+    from src.game.snake_game import SnakeGame
+
+    try:
+        copy.deepcopy(SnakeGame())
+        print("deepcopy(SnakeGame): ok")
+    except Exception as e:
+        print(f"deepcopy(SnakeGame) falha: {type(e).__name__}: {e}")
+
+    game = HeadlessSnakeGame(seed=0)
+    cycle = hamiltonian_cycle(game.grid_width, game.grid_height)
+    table = cycle_action_table(cycle)
+    print(f"{'Tamanho':>8} | {'deepcopy':>10} | {'snapshot':>10} | {'restore':>10} | {'jogadas simuladas/s':>20}")
+    print("-" * 72)
+    for length in SNAKE_LENGTHS:
+        place_snake_on_cycle(game, cycle, length)
+        deepcopy_us = _time_per_call(lambda: copy.deepcopy(game))
+        snapshot_us = _time_per_call(game.snapshot)
+        snapshot = game.snapshot()
+        restore_us = _time_per_call(lambda: game.restore(snapshot))
+
+        # Busca de 1 passo: voltar ao snapshot e testar uma jogada
+        def simulate_move():
+            game.restore(snapshot)
+            game.play_step(table[(game.head, game.direction)])
+        simulate_us = _time_per_call(simulate_move)
+        game.restore(snapshot)
+        print(f"{length:>8} | {deepcopy_us:>7.1f} µs | {snapshot_us:>7.1f} µs | {restore_us:>7.1f} µs | "
+              f"{1e6 / simulate_us:>18.0f}/s")
+
+def main():
+    """Executa todos os benchmarks do motor"""
+    print("🚀 Benchmarks do Motor do Jogo")
+    print("=" * 60)
+
+    benchmarks = [
+        benchmark_headless_engine,
+        benchmark_point_allocations,
+        benchmark_body_structure,
+        benchmark_food_placement,
+        benchmark_state_extraction,
+        benchmark_directional_features,
+        benchmark_flood_fill,
+        benchmark_grid_encoder,
+        benchmark_snapshot_restore,
+        benchmark_batch_env,
+    ]
+
+    for benchmark in benchmarks:
+        benchmark()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,575 @@
+#!/usr/bin/env python3
+"""
+Benchmarks do Treinamento
+=========================
+
+Mede o custo das peças do aprendizado (atualizações da rede, memória de
+replay, inferência) e compara com as versões anteriores.
+
+"""
+
+import sys
+import os
+import time
+import random
+import tracemalloc
+import tempfile
+import io
+import contextlib
+import subprocess
+import numpy as np
+from collections import deque
+
+# Adicionar src ao path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+import torch
+from src.ai.neural_network import DQN, QTrainer
+from src.ai.agent import Agent
+from src.ai.replay_buffer import ReplayBuffer
+from src.ai.numpy_policy import NumpyDQN
+from src.ai.training import Trainer
+from src.ai.planner import LookaheadPlanner
+from src.ai.actor_learner import ActorLearnerTrainer
+from src.ai.parallel_actors import ParallelActorTrainer
+from src.ai.distributed import run_local
+from src.ai.pbt import checkpoint_to_bytes, checkpoint_from_bytes
+from src.game.headless_game import HeadlessSnakeGame
+from src.game.constants import *
+
+TRAIN_BATCH_SIZES = [32, 256, 1024]
+TIME_PER_MEASURE = 2.0  # segundos
+MEMORY_CAPACITIES = [10_000, 100_000, 1_000_000]
+
+DECISIONS_PER_MEASURE = 20_000
+
+# Corridas de treinamento até uma média de score (comparação de configurações)
+SCORE_TARGET = 0.5  # média dos últimos SCORE_WINDOW jogos
+SCORE_WINDOW = 25
+MAX_TRAIN_GAMES = 400
+TRAIN_SEEDS = [0, 1]
+ACTOR_COUNTS = [1, 2, 4]
+WORKER_COUNTS = [1, 2, 4, 8]
+RANK_COUNTS = [1, 2, 4]
+SHIELD_MAX_OVERHEAD = 0.05  # Custo máximo aceito do escudo de segurança nos passos/s do treino
+PLANNER_GAMES = 10
+# (camadas, segundos por jogada); o último mostra a queda para poucas camadas sem tempo
+PLANNER_CONFIGS = [(1, 0.015), (2, 0.015), (4, 0.015), (6, 0.015), (6, 0.001)]
+
+def legacy_train_step(trainer, state, action, reward, next_state, done):
+    """QTrainer.train_step original: um forward por amostra para o próximo estado (referência)"""
+    state = torch.tensor(np.array(state), dtype=torch.float)
+    next_state = torch.tensor(np.array(next_state), dtype=torch.float)
+    action = torch.tensor(action, dtype=torch.long)
+    reward = torch.tensor(reward, dtype=torch.float)
+
+    if len(state.shape) == 1:
+        state = torch.unsqueeze(state, 0)
+        next_state = torch.unsqueeze(next_state, 0)
+        action = torch.unsqueeze(action, 0)
+        reward = torch.unsqueeze(reward, 0)
+        done = (done, )
+
+    pred = trainer.model(state)
+
+    target = pred.clone()
+    for idx in range(len(done)):
+        Q_new = reward[idx]
+        if not done[idx]:
+            Q_new = reward[idx] + trainer.gamma * torch.max(trainer.model(next_state[idx]))
+
+        target[idx][torch.argmax(action[idx]).item()] = Q_new
+
+    trainer.optimizer.zero_grad()
+    loss = trainer.criterion(target, pred)
+    loss.backward()
+
+    trainer.optimizer.step()
+
+def random_batch(batch_size, rng):
+    """Lote sintético no formato usado por Agent.train_long_memory (tuplas de estados e ações one-hot)"""
+    states = tuple(rng.random(STATE_SIZE, dtype=np.float32) for _ in range(batch_size))
+    next_states = tuple(rng.random(STATE_SIZE, dtype=np.float32) for _ in range(batch_size))
+    actions = tuple([1 if i == a else 0 for i in range(ACTION_SIZE)] for a in rng.integers(0, ACTION_SIZE, batch_size))
+    rewards = tuple(float(r) for r in rng.choice([REWARD_DEATH, 0, REWARD_FOOD, 2.5], batch_size))
+    dones = tuple(bool(d) for d in rng.random(batch_size) < 0.1)
+    return states, actions, rewards, next_states, dones
+
+def _updates_per_second(step, trainer, batch):
+    updates = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < TIME_PER_MEASURE:
+        step(trainer, *batch)
+        updates += 1
+    return updates / (time.perf_counter() - start)
+
+def benchmark_train_step():
+    """Atualizações por segundo do train_step vetorizado vs o laço por amostra original"""
+    print("\n⚡ QTrainer.train_step: laço original vs vetorizado")
+    print("=" * 60)
+
+    torch.set_num_threads(1)
+    rng = np.random.default_rng(0)
+
+    print(f"{'Lote':>6} | {'original':>12} | {'vetorizado':>12} | {'Ganho':>6}")
+    print("-" * 60)
+    for batch_size in TRAIN_BATCH_SIZES:
+        batch = random_batch(batch_size, rng)
+        legacy = _updates_per_second(legacy_train_step, QTrainer(DQN()), batch)
+        vectorized = _updates_per_second(QTrainer.train_step, QTrainer(DQN()), batch)
+        print(f"{batch_size:>6} | {legacy:>8.1f} up/s | {vectorized:>8.1f} up/s | {vectorized / legacy:>5.1f}x")
+
+def legacy_predict_action(agent, state):
+    """Ramo guloso original de Agent.get_action: tensor novo, autograd ligado, .item() (referência)"""
+    state0 = torch.tensor(state, dtype=torch.float)
+    prediction = agent.model(state0)
+    return torch.argmax(prediction).item()
+
+def _decision_latencies(predict, states):
+    """Latência de cada decisão, em microssegundos"""
+    latencies = np.empty(len(states))
+    for i, state in enumerate(states):
+        start = time.perf_counter()
+        predict(state)
+        latencies[i] = time.perf_counter() - start
+    return latencies * 1e6
+
+def benchmark_action_latency():
+    """Latência por decisão (p50/p99) do DQN 28→512→512→3 em Agent.get_action"""
+    print("\n🎮 Latência de decisão: caminho original vs inference_mode vs traçado")
+    print("=" * 60)
+
+    torch.set_num_threads(1)
+    rng = np.random.default_rng(0)
+    # Estados como os de GameState.get_state (float32, 28 features)
+    states = rng.random((DECISIONS_PER_MEASURE, STATE_SIZE), dtype=np.float32)
+
+    agent = Agent()
+    traced_agent = Agent()
+    traced_agent.model.load_state_dict(agent.model.state_dict())
+    traced_agent.use_traced_policy()
+    numpy_policy = NumpyDQN(agent.model.state_dict())
+
+    paths = [
+        ("original", lambda state: legacy_predict_action(agent, state)),
+        ("inference", agent.predict_action),
+        ("traçado", traced_agent.predict_action),
+        ("numpy", numpy_policy.predict_action),
+    ]
+    for _, predict in paths:
+        _decision_latencies(predict, states[:1000])  # aquecimento
+
+    print(f"{'Caminho':>10} | {'p50':>9} | {'p99':>9} | {'decisões/s':>10}")
+    print("-" * 60)
+    for name, predict in paths:
+        latencies = _decision_latencies(predict, states)
+        p50, p99 = np.percentile(latencies, [50, 99])
+        print(f"{name:>10} | {p50:>6.1f} µs | {p99:>6.1f} µs | {1e6 / latencies.mean():>10.0f}")
+
+# Processo novo: importa, carrega os pesos, decide uma ação e reporta tempo e pico de memória
+STARTUP_SCRIPT = """
+import time
+start = time.perf_counter()
+import numpy as np
+{load}
+state = np.zeros({state_size}, dtype=np.float32)
+action = {decide}
+# VmHWM (pico de RSS) deste processo; ru_maxrss herdaria o pico do processo pai no Linux
+peak = next(line.split()[1] for line in open('/proc/self/status') if line.startswith('VmHWM'))
+print(time.perf_counter() - start, peak)
+"""
+
+def _startup_cost(load, decide, repeats=3):
+    """Menor tempo de inicialização (s) e pico de RSS (MB) entre `repeats` processos"""
+    results = []
+    for _ in range(repeats):
+        code = STARTUP_SCRIPT.format(load=load, decide=decide, state_size=STATE_SIZE)
+        output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.split()
+        results.append((float(output[-2]), int(output[-1]) / 1024))
+    return min(results)
+
+def benchmark_policy_startup():
+    """Inicialização e memória de um processo que só joga: Agent (torch) vs NumpyAgent"""
+    print("\n🚀 Inicialização do modo de jogo: Agent (torch) vs NumpyAgent")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as directory:
+        model_path = os.path.join(directory, 'model.pth')
+        npz_path = os.path.join(directory, 'model.npz')
+        agent = Agent()
+        torch.save(agent.model.state_dict(), model_path)
+        agent.export_numpy(npz_path)
+
+        torch_time, torch_rss = _startup_cost(
+            f"from src.ai.agent import Agent\nagent = Agent()\nagent.load_model({model_path!r})",
+            "agent.get_action(state)")
+        numpy_time, numpy_rss = _startup_cost(
+            f"from src.ai.numpy_policy import NumpyAgent\nagent = NumpyAgent.load({npz_path!r})",
+            "agent.get_action(state)")
+
+    print(f"{'Agente':>12} | {'Inicialização':>13} | {'Pico RSS':>9}")
+    print("-" * 60)
+    print(f"{'Agent':>12} | {torch_time:>11.2f} s | {torch_rss:>6.0f} MB")
+    print(f"{'NumpyAgent':>12} | {numpy_time:>11.2f} s | {numpy_rss:>6.0f} MB")
+
+def _transition(rng):
+    """Transição no formato de Trainer.train: estados float32 de GameState e ação one-hot em lista"""
+    action = [0, 0, 0]
+    action[rng.integers(0, ACTION_SIZE)] = 1
+    return (rng.random(STATE_SIZE, dtype=np.float32), action, float(rng.choice([REWARD_DEATH, 0, REWARD_FOOD])),
+            rng.random(STATE_SIZE, dtype=np.float32), bool(rng.random() < 0.1))
+
+def _legacy_sample(memory):
+    """Agent.train_long_memory original: random.sample no deque + zip + np.array"""
+    states, actions, rewards, next_states, dones = zip(*random.sample(memory, BATCH_SIZE))
+    return np.array(states), np.array(actions), np.array(rewards), np.array(next_states), np.array(dones)
+
+def _samples_per_second(sample):
+    samples = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < TIME_PER_MEASURE / 2:
+        sample()
+        samples += 1
+    return samples / (time.perf_counter() - start)
+
+def benchmark_replay_memory():
+    """Bytes por transição e lotes amostrados por segundo: deque de tuplas vs ReplayBuffer"""
+    print("\n🧠 Memória de replay: deque de tuplas vs ReplayBuffer")
+    print("=" * 60)
+
+    rng = np.random.default_rng(0)
+    count = 20_000
+
+    tracemalloc.start()
+    memory = deque(maxlen=count)
+    for _ in range(count):
+        memory.append(_transition(rng))
+    legacy_bytes = tracemalloc.get_traced_memory()[0] / count
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    buffer = ReplayBuffer(count, STATE_SIZE)
+    buffer_bytes = tracemalloc.get_traced_memory()[0] / count
+    tracemalloc.stop()
+    print(f"Bytes por transição: deque {legacy_bytes:.0f} B | ReplayBuffer {buffer_bytes:.0f} B "
+          f"({legacy_bytes / buffer_bytes:.1f}x menor)")
+
+    print(f"\n{'Capacidade':>10} | {'deque':>14} | {'ReplayBuffer':>14} | {'Ganho':>7}")
+    print("-" * 60)
+    for capacity in MEMORY_CAPACITIES:
+        # Mesmas transições (reaproveitadas) nas duas memórias, para não medir a geração
+        transitions = [_transition(rng) for _ in range(1000)]
+        memory = deque((transitions[i % 1000] for i in range(capacity)), maxlen=capacity)
+        buffer = ReplayBuffer(capacity, STATE_SIZE)
+        for i in range(capacity):
+            buffer.push(*transitions[i % 1000])
+
+        legacy = _samples_per_second(lambda: _legacy_sample(memory))
+        vectorized = _samples_per_second(lambda: buffer.sample(BATCH_SIZE))
+        print(f"{capacity:>10} | {legacy:>8.0f} lot/s | {vectorized:>8.0f} lot/s | {vectorized / legacy:>6.1f}x")
+
+def train_to_score(seed, **trainer_options):
+    """
+    Treina (headless, sem salvar modelos) até a média dos últimos SCORE_WINDOW
+    jogos atingir SCORE_TARGET. Retorna (jogos, segundos, passos) ou None se
+    MAX_TRAIN_GAMES não bastar.
+    """
+    random.seed(seed)
+    np.random.seed(seed)
+    torch.manual_seed(seed)
+    trainer = Trainer(headless=True, seed=seed, **trainer_options)
+    agent = trainer.agent
+
+    steps = 0
+    start = time.perf_counter()
+    while agent.n_games < MAX_TRAIN_GAMES:
+        done, score = trainer.train_step()
+        steps += 1
+        if done:
+            trainer.end_game(score)
+            if agent.n_games >= SCORE_WINDOW and np.mean(agent.scores[-SCORE_WINDOW:]) >= SCORE_TARGET:
+                return agent.n_games, time.perf_counter() - start, steps
+    return None
+
+def compare_training_runs(title, configurations):
+    """Jogos, passos e tempo até SCORE_TARGET para cada configuração do Trainer, em TRAIN_SEEDS"""
+    print(f"\n🎯 {title}: até média {SCORE_TARGET} em {SCORE_WINDOW} jogos (máx. {MAX_TRAIN_GAMES} jogos)")
+    print("=" * 60)
+    torch.set_num_threads(1)
+
+    print(f"{'Configuração':>14} | {'Seed':>4} | {'Jogos':>6} | {'Passos':>7} | {'Tempo':>8}")
+    print("-" * 60)
+    for name, options in configurations:
+        for seed in TRAIN_SEEDS:
+            result = train_to_score(seed, **options)
+            if result is None:
+                print(f"{name:>14} | {seed:>4} | {'não atingiu':>26}")
+            else:
+                games, seconds, steps = result
+                print(f"{name:>14} | {seed:>4} | {games:>6} | {steps:>7} | {seconds:>7.1f}s")
+
+def benchmark_trainer_step():
+    """
+    Custo por passo de Trainer.train_step (headless): completo e sem a atualização
+    da rede (só jogo, features, modelagem de recompensa e memória)
+    """
+    print("\n🏃 Custo por passo do Trainer")
+    print("=" * 60)
+    torch.set_num_threads(1)
+
+    for name, skip_update in [("completo", False), ("sem atualizar a rede", True)]:
+        steps_per_second = _trainer_steps_per_second(skip_update)
+        print(f"{name:>22} | {1e6 / steps_per_second:>8.1f} µs/passo | {steps_per_second:>7.0f} passos/s")
+
+def _trainer_steps_per_second(skip_update, **trainer_options):
+    """Passos/s de Trainer.train_step (headless, seed 0) em TIME_PER_MEASURE * 2 segundos"""
+    steps_per_second, _ = _timed_trainer_run(skip_update, **trainer_options)
+    return steps_per_second
+
+def _timed_trainer_run(skip_update, **trainer_options):
+    """(passos/s, fração do tempo dentro de Agent.safe_actions) de um treino headless com seed 0"""
+    random.seed(0)
+    np.random.seed(0)
+    torch.manual_seed(0)
+    trainer = Trainer(headless=True, seed=0, **trainer_options)
+    if skip_update:
+        trainer.agent.train_short_memory = lambda *transition: None
+    shield_time = [0.0]
+    safe_actions = trainer.agent.safe_actions
+    def timed_safe_actions(game):
+        start = time.perf_counter()
+        allowed = safe_actions(game)
+        shield_time[0] += time.perf_counter() - start
+        return allowed
+    trainer.agent.safe_actions = timed_safe_actions
+
+    steps = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < TIME_PER_MEASURE * 2:
+        done, score = trainer.train_step()
+        if done:
+            trainer.end_game(score)
+        steps += 1
+    elapsed = time.perf_counter() - start
+    return steps / elapsed, shield_time[0] / elapsed
+
+def benchmark_safety_shield():
+    """
+    Custo do escudo de segurança no treino: fração do tempo do passo gasta em
+    safe_actions (limite: SHIELD_MAX_OVERHEAD) e jogos até SCORE_TARGET.
+    Os passos/s com e sem escudo vêm de partidas diferentes (o escudo muda as jogadas).
+    """
+    print(f"\n🛡️ Escudo de segurança: custo por passo (limite {SHIELD_MAX_OVERHEAD:.0%})")
+    print("=" * 60)
+    torch.set_num_threads(1)
+
+    print(f"{'Trainer':>22} | {'sem escudo':>12} | {'com escudo':>12} | {'no escudo':>9}")
+    print("-" * 66)
+    for name, skip_update in [("completo", False), ("sem atualizar a rede", True)]:
+        plain = _trainer_steps_per_second(skip_update)
+        shielded, share = _timed_trainer_run(skip_update, safety_shield=True)
+        overhead = share / (1 - share)
+        verdict = "ok" if overhead <= SHIELD_MAX_OVERHEAD else "acima do limite"
+        print(f"{name:>22} | {plain:>6.0f} pas/s | {shielded:>6.0f} pas/s | {overhead:>8.1%} {verdict}")
+
+    compare_training_runs("Sem escudo vs com escudo", [
+        ("sem escudo", {}),
+        ("escudo", {'safety_shield': True}),
+    ])
+
+def benchmark_prioritized_replay():
+    """Replay uniforme vs priorizado: jogos e tempo de relógio até SCORE_TARGET"""
+    compare_training_runs("Replay uniforme vs priorizado", [
+        ("uniforme", {'prioritized': False}),
+        ("priorizado", {'prioritized': True}),
+    ])
+
+def benchmark_target_network():
+    """Bootstrap da rede online vs rede alvo (cópia, Polyak) e Double-DQN"""
+    compare_training_runs("Rede alvo e Double-DQN", [
+        ("sem alvo", {}),
+        ("alvo cópia", {'target_network': True}),
+        ("alvo Polyak", {'target_network': True, 'target_tau': 0.005}),
+        ("Double-DQN", {'double_dqn': True}),
+    ])
+
+def _play_games(agent, choose, games):
+    """Partidas headless com seeds fixas; retorna (scores, segundos por jogada)"""
+    scores = []
+    moves = 0
+    elapsed = 0.0
+    for seed in range(games):
+        game = HeadlessSnakeGame(seed=seed)
+        done = False
+        while not done:
+            start = time.perf_counter()
+            action = choose(game, agent.get_state(game))
+            elapsed += time.perf_counter() - start
+            _, done, score = game.play_step(action)
+            moves += 1
+        scores.append(score)
+    return scores, elapsed / moves
+
+def benchmark_lookahead_planner():
+    """Modo play com o modelo salvo mais recente: ação gulosa vs busca com orçamento por jogada"""
+    print(f"\n🔭 Ação gulosa vs busca sobre o DQN ({PLANNER_GAMES} partidas)")
+    print("=" * 60)
+    torch.set_num_threads(1)
+
+    agent = Agent()
+    if not agent.auto_load_latest():
+        print("Sem modelo salvo: busca avaliada com pesos aleatórios")
+
+    print(f"{'Política':>16} | {'Média':>6} | {'Máx':>4} | {'Profund.':>8} | {'Tempo/jogada':>12}")
+    print("(busca d/t: até d camadas, no máximo t por jogada)")
+    print("-" * 60)
+    scores, seconds = _play_games(agent, lambda game, state: agent.predict_action(state), PLANNER_GAMES)
+    print(f"{'gulosa':>16} | {np.mean(scores):>6.1f} | {max(scores):>4} | {'-':>8} | {seconds * 1e3:>9.2f} ms")
+    for depth, budget in PLANNER_CONFIGS:
+        planner = LookaheadPlanner(agent, depth=depth, time_budget=budget)
+        depths = []
+        def choose(game, state):
+            action = planner.plan(game, state)
+            depths.append(planner.last_depth)
+            return action
+        scores, seconds = _play_games(agent, choose, PLANNER_GAMES)
+        name = f"busca {depth}/{budget * 1e3:g} ms"
+        print(f"{name:>16} | {np.mean(scores):>6.1f} | {max(scores):>4} | {np.mean(depths):>8.2f} | {seconds * 1e3:>9.2f} ms")
+
+def benchmark_actor_learner():
+    """Passos/s e atualizações/s: Trainer em série vs atores e aprendiz em threads"""
+    print(f"\n🧵 Treino em série vs ator/aprendiz ({os.cpu_count()} núcleos)")
+    print("=" * 60)
+    torch.set_num_threads(1)
+    seconds = TIME_PER_MEASURE * 3
+
+    print(f"{'Modo':>18} | {'passos/s':>9} | {'atualizações/s':>14} | {'partidas':>8}")
+    print("-" * 60)
+    random.seed(0)
+    np.random.seed(0)
+    torch.manual_seed(0)
+    trainer = Trainer(headless=True, seed=0)
+    steps = games = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        done, score = trainer.train_step()
+        steps += 1
+        if done:
+            trainer.end_game(score)
+            games += 1
+    elapsed = time.perf_counter() - start
+    # Série: uma atualização de memória curta por passo e uma de memória longa por partida
+    print(f"{'série':>18} | {steps / elapsed:>9.0f} | {trainer.agent.trainer.updates / elapsed:>14.1f} | {games:>8}")
+
+    for num_actors in ACTOR_COUNTS:
+        torch.manual_seed(0)
+        stats = ActorLearnerTrainer(num_actors=num_actors, seed=0).run(duration=seconds)
+        name = f"{num_actors} ator(es)"
+        print(f"{name:>18} | {stats['steps_per_second']:>9.0f} | {stats['updates_per_second']:>14.1f} | {stats['games']:>8}")
+
+def benchmark_parallel_actors():
+    """
+    Escala dos atores em processos: passos/s só dos workers (sem aprendiz) e com o
+    aprendiz treinando, para cada número de workers, e a aceleração sobre 1 worker
+    """
+    print(f"\n🧩 Atores em processos: escala com o número de workers ({os.cpu_count()} núcleos)")
+    print("=" * 60)
+    torch.set_num_threads(1)
+    seconds = TIME_PER_MEASURE * 2
+
+    print(f"{'Workers':>7} | {'só atores':>10} | {'aceleração':>10} | {'com aprendiz':>12} | {'atualizações/s':>14}")
+    print("-" * 66)
+    baseline = None
+    for num_workers in WORKER_COUNTS:
+        torch.manual_seed(0)
+        trainer = ParallelActorTrainer(num_workers=num_workers, seed=0)
+        try:
+            acting = trainer.run(duration=seconds, learn=False)
+            learning = trainer.run(duration=seconds)
+        finally:
+            trainer.close()
+        baseline = baseline or acting['steps_per_second']
+        print(f"{num_workers:>7} | {acting['steps_per_second']:>10.0f} | {acting['steps_per_second'] / baseline:>9.2f}x | "
+              f"{learning['steps_per_second']:>12.0f} | {learning['updates_per_second']:>14.1f}")
+
+def benchmark_distributed():
+    """
+    Treino distribuído com ranks locais (gloo por localhost): passos/s somando os
+    ranks, atualizações/s de cada réplica e a aceleração sobre 1 rank
+    """
+    print(f"\n🌐 Treino distribuído: escala com o número de ranks ({os.cpu_count()} núcleos)")
+    print("=" * 60)
+    seconds = TIME_PER_MEASURE * 2
+
+    print(f"{'Ranks':>5} | {'passos/s (soma)':>15} | {'aceleração':>10} | {'atualizações/s':>14} | {'pesos iguais':>12}")
+    print("-" * 70)
+    baseline = None
+    for world_size in RANK_COUNTS:
+        stats = run_local(world_size, {'seed': 0}, duration=seconds)
+        total = stats[0]['total_steps_per_second']
+        baseline = baseline or total
+        in_sync = len({rank['checksum'] for rank in stats}) == 1
+        print(f"{world_size:>5} | {total:>15.0f} | {total / baseline:>9.2f}x | "
+              f"{stats[0]['updates_per_second']:>14.1f} | {'sim' if in_sync else 'não':>12}")
+
+def benchmark_pbt_exploit():
+    """
+    Passo de exploit do treino populacional: checkpoint completo (rede, rede alvo e
+    Adam) de um agente para outro em bytes na memória, contra save_model + load_model
+    """
+    print("\n🧬 Treino populacional: cópia de checkpoint no exploit")
+    print("=" * 60)
+    source = Agent(target_network=True)
+    target = Agent(target_network=True)
+    for _ in range(BATCH_SIZE):
+        source.remember(np.random.rand(STATE_SIZE), [1, 0, 0], 1.0, np.random.rand(STATE_SIZE), False)
+    source.train_long_memory()  # Estado do Adam preenchido
+    repeats = 20
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        data = checkpoint_to_bytes(source.checkpoint())
+        target.load_checkpoint(checkpoint_from_bytes(data), statistics=False)
+    in_memory = (time.perf_counter() - start) / repeats
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'model.pth')
+        # Sem as mensagens de save_model/load_model a cada repetição
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            for _ in range(repeats):
+                source.save_model(path)
+                target.load_model(path)
+            on_disk = (time.perf_counter() - start) / repeats
+
+    print(f"Checkpoint: {len(data) / 1e6:.1f} MB")
+    print(f"Em memória (bytes):      {in_memory * 1000:>7.1f} ms")
+    print(f"Disco (save + load):     {on_disk * 1000:>7.1f} ms ({on_disk / in_memory:.1f}x)")
+
+def main():
+    """Executa todos os benchmarks do treinamento"""
+    print("🚀 Benchmarks do Treinamento")
+    print("=" * 60)
+
+    benchmarks = [
+        benchmark_train_step,
+        benchmark_replay_memory,
+        benchmark_action_latency,
+        benchmark_policy_startup,
+        benchmark_trainer_step,
+        benchmark_prioritized_replay,
+        benchmark_target_network,
+        benchmark_safety_shield,
+        benchmark_actor_learner,
+        benchmark_parallel_actors,
+        benchmark_distributed,
+        benchmark_pbt_exploit,
+        benchmark_lookahead_planner,
+    ]
+
+    for benchmark in benchmarks:
+        benchmark()
+
+if __name__ == "__main__":
+    main()
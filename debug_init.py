@@ -55,8 +55,9 @@ def debug_initialization():
         print(f"ERRO: Head Y fora dos limites! Y={head.y}, max={game.grid_height-1}")
     
     # Verificar se a cabeça está na snake
-    if head in game.snake[1:]:
-        print(f"ERRO: Head colidindo com corpo! Head={head}, Body={game.snake[1:]}")
+    body = list(game.snake)[1:]
+    if head in body:
+        print(f"ERRO: Head colidindo com corpo! Head={head}, Body={body}")
 
 if __name__ == "__main__":
     debug_initialization()
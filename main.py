@@ -27,11 +27,31 @@ def main():
     
     # Configurar argumentos da linha de comando
     parser = argparse.ArgumentParser(description='Snake AI - Jogo da Cobrinha com IA')
-    parser.add_argument('--mode', choices=['play', 'train', 'train-interface'], 
+    parser.add_argument('--mode', choices=['play', 'train', 'train-interface', 'sweep'], 
                        default='play', help='Modo de execução')
     parser.add_argument('--model', type=str, help='Caminho para modelo pré-treinado')
     parser.add_argument('--games', type=int, default=1000, help='Número de jogos para treinamento')
     parser.add_argument('--speed', type=int, default=10, help='Velocidade do jogo')
+    parser.add_argument('--headless', action='store_true', help='Treinar sem pygame e sem gráficos (servidores sem display)')
+    parser.add_argument('--prioritized', action='store_true', help='Usar replay priorizado no treinamento')
+    parser.add_argument('--target-network', action='store_true', help='Usar rede alvo congelada no treinamento')
+    parser.add_argument('--double-dqn', action='store_true', help='Usar alvo Double-DQN (implica rede alvo)')
+    parser.add_argument('--tau', type=float, default=None, help='Sincronização suave da rede alvo (ex.: 0.005)')
+    parser.add_argument('--actor-learner', action='store_true', help='Treinar com atores e aprendiz em threads separadas (headless)')
+    parser.add_argument('--actors', type=int, default=None, help='Número de atores no treino ator/aprendiz')
+    parser.add_argument('--workers', type=int, default=None, help='Treinar com N processos de atores (pesos em memória compartilhada, headless)')
+    parser.add_argument('--distributed', action='store_true', help='Treino data-parallel com torch.distributed (gloo); sob torchrun, um rank por processo')
+    parser.add_argument('--ranks', type=int, default=None, help='Número de ranks locais no treino distribuído (fora do torchrun)')
+    parser.add_argument('--population', type=int, default=None, help='Treino populacional (PBT) com N agentes em processos (headless)')
+    parser.add_argument('--space', type=str, help='Modo sweep: JSON com {constante: valores} a variar')
+    parser.add_argument('--search', choices=['grid', 'random'], default='grid', help='Modo sweep: busca em grade ou aleatória')
+    parser.add_argument('--samples', type=int, default=8, help='Modo sweep: jobs sorteados na busca aleatória')
+    parser.add_argument('--sweep-workers', type=int, default=None, help='Modo sweep: jobs treinando ao mesmo tempo')
+    parser.add_argument('--job-games', type=int, default=None, help='Modo sweep: partidas de treino por job')
+    parser.add_argument('--shield', action='store_true', help='Descartar jogadas que entram em bolsões menores que a cobra')
+    parser.add_argument('--numpy-model', type=str, help='Jogar (modo play) com pesos .npz, sem carregar o torch')
+    parser.add_argument('--lookahead', action='store_true', help='No modo play, escolher jogadas com busca sobre o DQN')
+    parser.add_argument('--export-numpy', type=str, help='Exportar os pesos do modelo (--model ou o mais recente) para .npz')
     parser.add_argument('--check-deps', action='store_true', help='Verificar dependências')
     parser.add_argument('--system-info', action='store_true', help='Mostrar informações do sistema')
     
@@ -56,11 +76,18 @@ def main():
     
     # Configurar diretórios
     setup_directories()
+
+    if args.export_numpy:
+        export_numpy_model(args)
+        return
     
-    # Verificar dependências críticas
+    # Verificar dependências críticas (o modo headless não precisa do pygame)
     try:
-        import pygame
-        import torch
+        headless_training = args.mode == 'train' and (args.headless or args.actor_learner or args.workers or args.distributed or args.population)
+        if not (headless_training or args.mode == 'sweep'):
+            import pygame
+        if not (args.mode == 'play' and args.numpy_model):
+            import torch
         import numpy as np
     except ImportError as e:
         print(f"Erro: Dependência faltando - {e}")
@@ -76,6 +103,8 @@ def main():
             run_training(args)
         elif args.mode == 'train-interface':
             run_training_interface(args)
+        elif args.mode == 'sweep':
+            run_sweep_mode(args)
     
     except KeyboardInterrupt:
         print("\nPrograma interrompido pelo usuário.")
@@ -94,9 +123,19 @@ def run_game_interface(args):
     print("Iniciando interface do jogo...")
     
     from src.interface.game_interface import GameInterface
+    # --lookahead liga a busca; sem ele vale LOOKAHEAD_PLANNER (constants.py)
+    options = {'lookahead': True} if args.lookahead else {}
+
+    if args.numpy_model:
+        # Inferência só com NumPy: o torch não é importado
+        from src.ai.numpy_policy import NumpyAgent
+        interface = GameInterface(agent=NumpyAgent.load(args.numpy_model), **options)
+        print(f"Pesos NumPy carregados: {args.numpy_model}")
+        interface.run()
+        return
     
     # Criar e executar interface
-    interface = GameInterface()
+    interface = GameInterface(**options)
     
     # Carregar modelo se especificado
     if args.model:
@@ -108,20 +147,134 @@ def run_game_interface(args):
     
     interface.run()
 
+def export_numpy_model(args):
+    """Exporta os pesos de um modelo .pth para .npz (NumpyAgent)"""
+    from src.ai.agent import Agent
+
+    agent = Agent()
+    loaded = agent.load_model(args.model) if args.model else agent.auto_load_latest()
+    if not loaded:
+        print("Nenhum modelo carregado; nada a exportar.")
+        return
+    agent.export_numpy(args.export_numpy)
+
 def run_training(args):
     """Executa treinamento via linha de comando"""
     print("Iniciando treinamento...")
     print(f"Número de jogos: {args.games}")
     
+    if args.actor_learner:
+        run_actor_learner_training(args)
+        return
+    if args.workers:
+        run_parallel_training(args)
+        return
+    if args.distributed:
+        run_distributed_training(args)
+        return
+    if args.population:
+        run_pbt_training(args)
+        return
+
     from src.ai.training import train_agent
+    # --shield liga o escudo de segurança; sem ele vale SAFETY_SHIELD (constants.py)
+    options = {'safety_shield': True} if args.shield else {}
     
     # Treinar agente
-    agent = train_agent(max_games=args.games)
+    agent = train_agent(max_games=args.games, headless=args.headless, prioritized=args.prioritized,
+                        target_network=args.target_network or args.tau is not None,
+                        double_dqn=args.double_dqn, target_tau=args.tau, **options)
     
     print("Treinamento concluído!")
     print(f"Record alcançado: {agent.record}")
     print(f"Jogos completados: {agent.n_games}")
 
+def run_actor_learner_training(args):
+    """Treino ator/aprendiz: atores headless em threads e um aprendiz treinando sem parar"""
+    from src.ai.actor_learner import train_actor_learner
+    options = {'num_actors': args.actors} if args.actors else {}
+    if args.shield:
+        options['safety_shield'] = True
+
+    agent = train_actor_learner(max_games=args.games, prioritized=args.prioritized,
+                                target_network=args.target_network or args.tau is not None,
+                                double_dqn=args.double_dqn, target_tau=args.tau, **options)
+
+    print("Treinamento concluído!")
+    print(f"Record alcançado: {agent.record}")
+    print(f"Jogos completados: {agent.n_games}")
+
+def run_parallel_training(args):
+    """Treino com atores em processos: workers headless com NumPy e o aprendiz neste processo"""
+    from src.ai.parallel_actors import train_parallel
+    options = {'safety_shield': True} if args.shield else {}
+
+    agent = train_parallel(max_games=args.games, num_workers=args.workers, prioritized=args.prioritized,
+                           target_network=args.target_network or args.tau is not None,
+                           double_dqn=args.double_dqn, target_tau=args.tau, **options)
+
+    print("Treinamento concluído!")
+    print(f"Record alcançado: {agent.record}")
+    print(f"Jogos completados: {agent.n_games}")
+
+def run_distributed_training(args):
+    """Treino distribuído: réplicas headless com média dos gradientes (ranks locais ou torchrun)"""
+    from src.ai.distributed import train_distributed
+    options = {'world_size': args.ranks} if args.ranks else {}
+    if args.shield:
+        options['safety_shield'] = True
+
+    train_distributed(max_games=args.games, prioritized=args.prioritized,
+                      target_network=args.target_network or args.tau is not None,
+                      double_dqn=args.double_dqn, target_tau=args.tau, **options)
+
+    print("Treinamento concluído!")
+
+def run_pbt_training(args):
+    """Treino populacional: agentes em processos; os piores copiam os melhores e perturbam os hiperparâmetros"""
+    from src.ai.pbt import train_pbt
+    options = {'safety_shield': True} if args.shield else {}
+
+    best = train_pbt(max_games=args.games, population=args.population, prioritized=args.prioritized,
+                     target_network=args.target_network or args.tau is not None,
+                     double_dqn=args.double_dqn, target_tau=args.tau, **options)
+
+    print("Treinamento concluído!")
+    print(f"Melhor membro: {best['member']} (média {best['score']:.2f}, record {best['record']})")
+    print(f"Hiperparâmetros: {best['hyperparameters']}")
+
+def run_sweep_mode(args):
+    """Varredura de hiperparâmetros: jobs de treino headless em paralelo e o ranking no fim"""
+    import json
+    from src.ai.sweep import grid_space, random_space, run_sweep, format_summary
+
+    if not args.space:
+        print("Informe o espaço de busca com --space (ex.: {\"LEARNING_RATE\": [0.001, 0.0005]})")
+        return
+    with open(args.space) as file:
+        space = json.load(file)
+    jobs = grid_space(space) if args.search == 'grid' else random_space(space, args.samples)
+    options = {}
+    if args.sweep_workers:
+        options['workers'] = args.sweep_workers
+    if args.job_games:
+        options['max_games'] = args.job_games
+    if args.shield:
+        options['safety_shield'] = True
+    print(f"Varredura ({args.search}): {len(jobs)} jobs")
+
+    def on_result(result):
+        status = result.get('error') or f"média {result['mean_score']:.2f}, {result['steps_per_second']:.0f} passos/s"
+        print(f"Job {result['job']} concluído em {result['seconds']:.1f}s: {status}")
+
+    results = run_sweep(jobs, on_result=on_result, prioritized=args.prioritized,
+                        target_network=args.target_network or args.tau is not None,
+                        double_dqn=args.double_dqn, target_tau=args.tau, **options)
+    print()
+    print(format_summary(results))
+    if results:
+        print(f"\nSaídas em {os.path.dirname(results[0]['output_dir'])}")
+
 def run_training_interface(args):
     """Executa interface dedicada ao treinamento"""
     print("Iniciando interface de treinamento...")
@@ -0,0 +1,248 @@
+import queue
+import random
+import threading
+import time
+import numpy as np
+import torch
+from .agent import Agent
+from .neural_network import DQN
+from .rewards import shape_reward
+from ..game.headless_game import HeadlessSnakeGame
+from ..game.flood_fill import safe_actions
+from ..game.incremental_state import IncrementalGameState
+from ..game.constants import *
+
+class Actor:
+    """
+    Uma partida headless jogada com uma cópia local do DQN (epsilon-greedy).
+    A cópia só muda em load_weights, com um snapshot publicado pelo aprendiz.
+    safety_shield: restringe as jogadas a flood_fill.safe_actions, como no Agent.
+    """
+    def __init__(self, seed=None, safety_shield=SAFETY_SHIELD):
+        self.game = HeadlessSnakeGame(seed=seed)
+        self.game_state = IncrementalGameState(self.game)
+        self.model = DQN(STATE_SIZE, HIDDEN_SIZE, ACTION_SIZE)
+        self.model.requires_grad_(False)
+        self.version = -1  # Versão dos pesos carregados
+        self.rng = random.Random(seed)
+        self.steps = 0
+        self.safety_shield = safety_shield
+        self.shielded = 0  # Passos em que o escudo descartou alguma jogada
+        # Entrada pré-alocada, como em Agent.predict_action
+        self._state_input = np.zeros(STATE_SIZE, dtype=np.float32)
+        self._state_tensor = torch.from_numpy(self._state_input)
+
+    def load_weights(self, weights, version):
+        self.model.load_state_dict(weights)
+        self.version = version
+
+    def act(self, state, epsilon):
+        """Índice da ação (0, 1 ou 2)"""
+        allowed = safe_actions(self.game, self.game_state.reachable) if self.safety_shield else None
+        if allowed is not None:
+            self.shielded += 1
+        if self.rng.random() < epsilon:
+            return self.rng.randint(0, 2) if allowed is None else self.rng.choice(allowed)
+        self._state_input[:] = state
+        with torch.inference_mode():
+            prediction = self.model(self._state_tensor)
+        if allowed is None:
+            return int(torch.argmax(prediction))
+        return max(allowed, key=lambda action: float(prediction[action]))
+
+    def step(self, epsilon):
+        """Um passo com recompensa modelada; retorna ((s, a, r, s', done), done, score)"""
+        state_old = self.game_state.get_state()
+        distance_old = self.game_state.get_distance_to_food()
+        action = self.act(state_old, epsilon)
+        reward, done, score = self.game.play_step(action)
+        state_new = self.game_state.get_state()
+        if not done:
+            reward = shape_reward(self.game, self.game_state, reward, distance_old)
+        self.steps += 1
+        if done:
+            self.game.reset()
+        return (state_old, action, reward, state_new, done), done, score
+
+class ActorLearnerTrainer:
+    """
+    Treino ator/aprendiz: os atores jogam em threads próprias e enviam as transições
+    por uma fila, em blocos de ACTOR_FLUSH; a thread do aprendiz as grava na memória
+    de replay e treina lotes (train_long_memory) sem parar, sem esperar o jogo.
+
+    - A cada WEIGHT_SYNC_UPDATES atualizações o aprendiz publica uma cópia dos pesos;
+      os atores carregam a versão nova antes do próximo passo.
+    - A fila é limitada: atores mais rápidos que o aprendiz esperam (contrapressão).
+    - Sem memória curta por transição: todas as atualizações são lotes da memória.
+    Estatísticas das partidas (scores, record, n_games) ficam no agente, como no Trainer.
+    """
+    def __init__(self, num_actors=ACTORS, seed=None, sync_every=WEIGHT_SYNC_UPDATES,
+                 flush_every=ACTOR_FLUSH, queue_size=TRANSITION_QUEUE_SIZE, **agent_options):
+        self.agent = Agent(**agent_options)
+        self.actors = [Actor(None if seed is None else seed + i, self.agent.safety_shield) for i in range(num_actors)]
+        self.sync_every = sync_every
+        self.flush_every = flush_every
+        self.transitions = queue.Queue(maxsize=queue_size)
+        self.results = queue.Queue()  # Score de cada partida encerrada
+        self.stop_event = threading.Event()
+        # Treino e salvamento do modelo não se sobrepõem
+        self.model_lock = threading.Lock()
+        self._update_epsilon()
+        self.updates = 0
+        self._threads = []
+        self._version = -1
+        self._publish_weights()
+
+    def _publish_weights(self):
+        """Cópia dos pesos atuais com versão nova (a tupla é trocada de uma vez)"""
+        weights = {name: tensor.detach().clone() for name, tensor in self.agent.model.state_dict().items()}
+        self._version += 1
+        self.weights = (self._version, weights)
+
+    def _update_epsilon(self):
+        """Mesmo decaimento de Agent.get_action; os atores leem agent.epsilon"""
+        agent = self.agent
+        agent.epsilon = EPSILON_END + (EPSILON_START - EPSILON_END) * np.exp(-1. * agent.n_games / agent.epsilon_games)
+
+    @property
+    def steps(self):
+        return sum(actor.steps for actor in self.actors)
+
+    def _actor_loop(self, actor):
+        block = []
+        while not self.stop_event.is_set():
+            version, weights = self.weights
+            if version != actor.version:
+                actor.load_weights(weights, version)
+            transition, done, score = actor.step(self.agent.epsilon)
+            block.append(transition)
+            if done:
+                self.results.put(score)
+            if done or len(block) >= self.flush_every:
+                while not self.stop_event.is_set():
+                    try:
+                        self.transitions.put(block, timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+                block = []
+
+    def _drain(self, timeout):
+        """Grava na memória os blocos da fila; espera até timeout pelo primeiro"""
+        memory = self.agent.memory
+        try:
+            block = self.transitions.get(timeout=timeout) if timeout else self.transitions.get_nowait()
+        except queue.Empty:
+            return
+        while True:
+            for transition in block:
+                memory.push(*transition)
+            try:
+                block = self.transitions.get_nowait()
+            except queue.Empty:
+                return
+
+    def _learner_loop(self):
+        while not self.stop_event.is_set():
+            ready = len(self.agent.memory) >= BATCH_SIZE
+            # Com a memória pronta, só recolhe o que já chegou e volta a treinar
+            self._drain(timeout=None if ready else 0.1)
+            if not ready:
+                continue
+            with self.model_lock:
+                self.agent.train_long_memory()
+            self.updates += 1
+            if self.updates % self.sync_every == 0:
+                self._publish_weights()
+
+    def run(self, max_games=None, duration=None, on_game_end=None):
+        """
+        Joga e treina até max_games partidas novas ou duration segundos.
+        on_game_end(score) roda na thread chamadora a cada partida encerrada.
+        Retorna passos, atualizações e partidas, com as taxas por segundo.
+        """
+        self.stop_event.clear()
+        target_games = None if max_games is None else self.agent.n_games + max_games
+        start_steps, start_updates, start_games = self.steps, self.updates, self.agent.n_games
+        self._threads = [threading.Thread(target=self._learner_loop, name="learner", daemon=True)]
+        self._threads += [threading.Thread(target=self._actor_loop, args=(actor,), name=f"actor-{i}", daemon=True)
+                          for i, actor in enumerate(self.actors)]
+        start = time.perf_counter()
+        for thread in self._threads:
+            thread.start()
+        try:
+            while True:
+                if duration is not None and time.perf_counter() - start >= duration:
+                    break
+                if target_games is not None and self.agent.n_games >= target_games:
+                    break
+                try:
+                    score = self.results.get(timeout=0.05)
+                except queue.Empty:
+                    continue
+                self._end_game(score)
+                if on_game_end is not None:
+                    on_game_end(score)
+        finally:
+            self.stop()
+        elapsed = time.perf_counter() - start
+
+        steps = self.steps - start_steps
+        updates = self.updates - start_updates
+        return {
+            'steps': steps,
+            'updates': updates,
+            'games': self.agent.n_games - start_games,
+            'seconds': elapsed,
+            'steps_per_second': steps / elapsed,
+            'updates_per_second': updates / elapsed,
+        }
+
+    def stop(self):
+        """Para e aguarda as threads"""
+        self.stop_event.set()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def _end_game(self, score):
+        """Estatísticas de fim de partida, como Trainer.end_game (o treino segue na thread do aprendiz)"""
+        agent = self.agent
+        agent.n_games += 1
+        self._update_epsilon()
+        if score > agent.record:
+            agent.record = score
+        agent.scores.append(score)
+        agent.total_score += score
+        agent.mean_scores.append(agent.total_score / agent.n_games)
+
+    def save_model(self, file_path=None):
+        with self.model_lock:
+            return self.agent.save_model(file_path)
+
+    def train(self, max_games=1000, save_every=100):
+        """Treino completo: carrega o último modelo, salva checkpoints e o modelo final"""
+        print("Iniciando treinamento ator/aprendiz...")
+        print(f"Máximo de jogos: {max_games}, atores: {len(self.actors)}")
+
+        if self.agent.n_games == 0 and self.agent.auto_load_latest():
+            self._update_epsilon()
+            self._publish_weights()
+
+        def on_game_end(score):
+            agent = self.agent
+            print(f'Jogo {agent.n_games}, Score: {score}, Record: {agent.record}, Atualizações: {self.updates}')
+            if agent.n_games % save_every == 0:
+                self.save_model(f'models/model_checkpoint_{agent.n_games}.pth')
+
+        stats = self.run(max_games=max_games, on_game_end=on_game_end)
+        print(f"{stats['steps_per_second']:.0f} passos/s, {stats['updates_per_second']:.0f} atualizações/s")
+
+        self.save_model('models/model_final.pth')
+        print(f"Treinamento concluído! Modelo salvo. Record: {self.agent.record}")
+        return self.agent
+
+def train_actor_learner(max_games=1000, num_actors=ACTORS, **agent_options):
+    """Função conveniente para o treino ator/aprendiz"""
+    trainer = ActorLearnerTrainer(num_actors=num_actors, **agent_options)
+    return trainer.train(max_games=max_games)
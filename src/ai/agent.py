@@ -1,21 +1,46 @@
 import torch
 import random
 import numpy as np
-from collections import deque
-from ..game.snake_game import SnakeGame, Direction, Point
+from ..game.headless_game import Direction, Point
+from ..game.flood_fill import safe_actions
 from ..game.game_state import GameState
+from ..game.incremental_state import IncrementalGameState
 from ..game.constants import *
 from .neural_network import LinearQNet, DQN, QTrainer
+from .replay_buffer import ReplayBuffer, PrioritizedReplayBuffer
 
 class Agent:
-    def __init__(self):
+    def __init__(self, prioritized=PRIORITIZED_REPLAY, target_network=TARGET_NETWORK,
+                 double_dqn=DOUBLE_DQN, target_tau=TARGET_TAU, traced_policy=TRACED_POLICY,
+                 safety_shield=SAFETY_SHIELD):
         self.n_games = 0
         self.epsilon = EPSILON_START  # randomness
+        self.epsilon_games = EPSILON_DECAY_GAMES  # Partidas para o epsilon cair por um fator e
         self.gamma = GAMMA  # discount rate
-        self.memory = deque(maxlen=MEMORY_SIZE)  # popleft()
+        # Buffer circular: sobrescreve as mais antigas
+        self.prioritized = prioritized
+        if prioritized:
+            self.memory = PrioritizedReplayBuffer(MEMORY_SIZE, STATE_SIZE)
+        else:
+            self.memory = ReplayBuffer(MEMORY_SIZE, STATE_SIZE)
         # Usar DQN mais robusta para o estado expandido
         self.model = DQN(STATE_SIZE, HIDDEN_SIZE, ACTION_SIZE)
-        self.trainer = QTrainer(self.model, lr=LEARNING_RATE, gamma=self.gamma)
+        self.trainer = QTrainer(self.model, lr=LEARNING_RATE, gamma=self.gamma,
+                                target_network=target_network, tau=target_tau, double_dqn=double_dqn)
+
+        # Caminho de inferência: entrada pré-alocada (o array NumPy e o tensor dividem a memória)
+        self._state_input = np.zeros(STATE_SIZE, dtype=np.float32)
+        self._state_tensor = torch.from_numpy(self._state_input)
+        self.policy = self.model
+        if traced_policy:
+            self.use_traced_policy()
+
+        # Extrator de features do último jogo visto (reaproveitado entre passos)
+        self._state_engine = None
+
+        # Escudo de segurança: get_action descarta jogadas que entram num bolsão menor que a cobra
+        self.safety_shield = safety_shield
+        self.shielded = 0  # Decisões em que o escudo descartou alguma jogada
         
         # Para estatísticas
         self.scores = []
@@ -24,40 +49,101 @@ class Agent:
         self.record = 0
 
     def get_state(self, game):
-        game_state = GameState(game)
-        return game_state.get_state()
+        return self.get_state_engine(game).get_state()
+
+    def get_state_engine(self, game):
+        """IncrementalGameState ligado ao jogo (criado na primeira chamada e reaproveitado)"""
+        if self._state_engine is None or self._state_engine.game is not game:
+            self._state_engine = IncrementalGameState(game)
+        return self._state_engine
 
     def remember(self, state, action, reward, next_state, done):
-        self.memory.append((state, action, reward, next_state, done))  # popleft se MAX_MEMORY for atingido
+        self.memory.push(state, action, reward, next_state, done)  # sobrescreve a mais antiga se MEMORY_SIZE for atingido
 
     def train_long_memory(self):
-        if len(self.memory) > BATCH_SIZE:
-            mini_sample = random.sample(self.memory, BATCH_SIZE)  # lista de tuplas
-        else:
-            mini_sample = self.memory
+        if self.prioritized:
+            batch, indices, weights = self.memory.sample(BATCH_SIZE)
+            td_errors = self.trainer.train_step(*batch, weights=weights)
+            self.memory.update_priorities(indices, td_errors)
+            return
 
-        states, actions, rewards, next_states, dones = zip(*mini_sample)
+        # Lote já em arrays contíguos (toda a memória se ainda houver menos de BATCH_SIZE transições)
+        states, actions, rewards, next_states, dones = self.memory.sample(BATCH_SIZE)
         self.trainer.train_step(states, actions, rewards, next_states, dones)
 
     def train_short_memory(self, state, action, reward, next_state, done):
         self.trainer.train_step(state, action, reward, next_state, done)
 
-    def get_action(self, state):
+    def get_action(self, state, game=None):
+        """
+        game: jogo do estado; com o escudo de segurança ligado, a escolha aleatória
+        e a gulosa ficam restritas a safe_actions(game)
+        """
         # movimentos aleatórios: tradeoff exploration / exploitation
-        self.epsilon = EPSILON_END + (EPSILON_START - EPSILON_END) * np.exp(-1. * self.n_games / 1000)
+        self.epsilon = EPSILON_END + (EPSILON_START - EPSILON_END) * np.exp(-1. * self.n_games / self.epsilon_games)
         final_move = [0, 0, 0]
+        allowed = self.safe_actions(game) if self.safety_shield and game is not None else None
         
         if random.uniform(0, 1) < self.epsilon:
-            move = random.randint(0, 2)
+            move = random.randint(0, 2) if allowed is None else random.choice(allowed)
             final_move[move] = 1
         else:
-            state0 = torch.tensor(state, dtype=torch.float)
-            prediction = self.model(state0)
-            move = torch.argmax(prediction).item()
+            move = self.predict_action(state, allowed)
             final_move[move] = 1
 
         return final_move
-    
+
+    def safe_actions(self, game):
+        """
+        Jogadas permitidas pelo escudo (flood_fill.safe_actions, com o ReachableArea do
+        extrator de features e seu cache por passo); None quando não há o que descartar.
+        """
+        allowed = safe_actions(game, self.get_state_engine(game).reachable)
+        if allowed is not None:
+            self.shielded += 1
+        return allowed
+
+    def predict_action(self, state, allowed=None):
+        """
+        Ação gulosa (0, 1 ou 2) para um estado: sem autograd e sem alocar o tensor de entrada.
+        allowed: restringe o argmax a essas ações (escudo de segurança)
+        """
+        self._state_input[:] = state
+        with torch.inference_mode():
+            prediction = self.policy(self._state_tensor)
+        if allowed is None:
+            return int(torch.argmax(prediction))
+        return max(allowed, key=lambda action: float(prediction[action]))
+
+    def q_values(self, states):
+        """Q-values (N, 3) de um lote de estados float32 (N, 28), sem autograd"""
+        with torch.inference_mode():
+            return self.policy(torch.from_numpy(states)).numpy()
+
+    def use_traced_policy(self):
+        """
+        Troca a política por um módulo TorchScript (torch.jit.trace) do DQN.
+        O módulo traçado usa os mesmos parâmetros, então treino e load_model continuam valendo.
+        """
+        import warnings
+        with warnings.catch_warnings(), torch.no_grad():
+            # Versões recentes do torch marcam jit.trace como obsoleto; ele segue funcionando
+            warnings.simplefilter("ignore", FutureWarning)
+            self.policy = torch.jit.trace(self.model, self._state_tensor)
+        return self.policy
+
+    def get_actions(self, states):
+        """Versão em lote de get_action para o BatchSnakeEnv: um índice de ação (0, 1 ou 2) por linha de states"""
+        self.epsilon = EPSILON_END + (EPSILON_START - EPSILON_END) * np.exp(-1. * self.n_games / self.epsilon_games)
+
+        with torch.inference_mode():
+            moves = self.policy(torch.as_tensor(states, dtype=torch.float)).argmax(dim=1).numpy()
+
+        # Exploração por partida
+        explore = np.random.random(len(moves)) < self.epsilon
+        moves[explore] = np.random.randint(0, 3, size=int(explore.sum()))
+        return moves
+
     def load_model(self, file_path):
         """Carrega um modelo pré-treinado (compatível com LinearQNet e DQN)"""
         try:
@@ -81,19 +167,14 @@ class Agent:
                 # Modelo novo (DQN)
                 if 'fc1.weight' in checkpoint:
                     self.model.load_state_dict(checkpoint)
+                    self.trainer.sync_target()
                     print(f"Modelo DQN carregado de {file_path}")
                     self.model.eval()
                     return True
                 
                 # Checkpoint completo novo
                 elif 'model_state_dict' in checkpoint and 'fc1.weight' in checkpoint['model_state_dict']:
-                    self.model.load_state_dict(checkpoint['model_state_dict'])
-                    self.n_games = checkpoint.get('n_games', 0)
-                    self.epsilon = checkpoint.get('epsilon', EPSILON_END)
-                    self.record = checkpoint.get('record', 0)
-                    self.scores = checkpoint.get('scores', [])
-                    self.mean_scores = checkpoint.get('mean_scores', [])
-                    self.total_score = checkpoint.get('total_score', 0)
+                    self.load_checkpoint(checkpoint)
                     print(f"Checkpoint DQN carregado de {file_path}")
                     print(f"  Jogos: {self.n_games}, Record: {self.record}, Epsilon: {self.epsilon:.3f}")
                     self.model.eval()
@@ -146,18 +227,7 @@ class Agent:
         try:
             if save_training_data:
                 # Salvar checkpoint completo
-                checkpoint = {
-                    'model_state_dict': self.model.state_dict(),
-                    'n_games': self.n_games,
-                    'epsilon': self.epsilon,
-                    'record': self.record,
-                    'scores': self.scores,
-                    'mean_scores': self.mean_scores,
-                    'total_score': self.total_score,
-                    'gamma': self.gamma,
-                    'learning_rate': LEARNING_RATE
-                }
-                torch.save(checkpoint, file_path)
+                torch.save(self.checkpoint(), file_path)
                 print(f"Checkpoint completo salvo em {file_path}")
             else:
                 # Salvar apenas o modelo
@@ -168,6 +238,52 @@ class Agent:
             print(f"Erro ao salvar modelo: {e}")
             return False
     
+    def checkpoint(self):
+        """Checkpoint completo em memória (o que save_model grava): rede, rede alvo, otimizador e estatísticas"""
+        checkpoint = {
+            'model_state_dict': self.model.state_dict(),
+            'optimizer_state_dict': self.trainer.optimizer.state_dict(),
+            'n_games': self.n_games,
+            'epsilon': self.epsilon,
+            'record': self.record,
+            'scores': self.scores,
+            'mean_scores': self.mean_scores,
+            'total_score': self.total_score,
+            'gamma': self.gamma,
+            'learning_rate': self.trainer.lr
+        }
+        if self.trainer.target_model is not None:
+            checkpoint['target_model_state_dict'] = self.trainer.target_model.state_dict()
+        return checkpoint
+
+    def load_checkpoint(self, checkpoint, statistics=True):
+        """
+        Carrega um checkpoint completo (de checkpoint() ou de um arquivo de save_model).
+        statistics=False carrega só a rede, a rede alvo e o estado do otimizador.
+        A taxa de aprendizado continua a do agente (trainer.lr).
+        """
+        self.model.load_state_dict(checkpoint['model_state_dict'])
+        if 'target_model_state_dict' in checkpoint and self.trainer.target_model is not None:
+            self.trainer.target_model.load_state_dict(checkpoint['target_model_state_dict'])
+        else:
+            self.trainer.sync_target()
+        if 'optimizer_state_dict' in checkpoint:
+            self.trainer.optimizer.load_state_dict(checkpoint['optimizer_state_dict'])
+            self.trainer.set_learning_rate(self.trainer.lr)
+        if statistics:
+            self.n_games = checkpoint.get('n_games', 0)
+            self.epsilon = checkpoint.get('epsilon', EPSILON_END)
+            self.record = checkpoint.get('record', 0)
+            self.scores = checkpoint.get('scores', [])
+            self.mean_scores = checkpoint.get('mean_scores', [])
+            self.total_score = checkpoint.get('total_score', 0)
+
+    def export_numpy(self, file_path):
+        """Exporta os pesos para .npz, para jogar com NumpyAgent sem carregar o torch"""
+        from .numpy_policy import export_weights
+        export_weights(self.model.state_dict(), file_path, n_games=self.n_games, record=self.record)
+        print(f"Pesos exportados para {file_path}")
+
     def find_latest_model(self):
         """Encontra o modelo mais recente"""
         import os
@@ -0,0 +1,207 @@
+import os
+import socket
+import time
+import torch
+import torch.distributed as dist
+import torch.multiprocessing as mp
+from .training import Trainer
+from ..game.constants import *
+
+# Treino distribuído com réplicas do aprendiz (data-parallel): cada rank joga suas
+# partidas, guarda as transições na própria memória de replay e treina lotes dela;
+# os gradientes passam por all-reduce (média) antes do passo do otimizador, então
+# todas as réplicas mantêm os mesmos pesos. Backend gloo: roda em CPU, num host só
+# (ranks locais por localhost) ou em vários nós lançados com torchrun.
+
+def average_gradients(model):
+    """Gradiente médio entre os ranks: um all-reduce sobre um vetor com todos os gradientes"""
+    params = [param for param in model.parameters() if param.grad is not None]
+    flat = torch.cat([param.grad.reshape(-1) for param in params])
+    dist.all_reduce(flat)
+    flat /= dist.get_world_size()
+    offset = 0
+    for param in params:
+        count = param.grad.numel()
+        param.grad.copy_(flat[offset:offset + count].view_as(param.grad))
+        offset += count
+
+class DistributedTrainer:
+    """
+    Uma réplica do treino distribuído (um por rank, com o grupo já iniciado).
+
+    - Os ranks andam em passo fixo: a cada `steps_per_update` passos de jogo todos
+      fazem uma atualização (train_long_memory) com a média dos gradientes, então as
+      chamadas coletivas nunca se desencontram (partidas acabam em momentos diferentes
+      em cada rank; o fim de partida só atualiza as estatísticas).
+    - Sem memória curta por transição, como no treino ator/aprendiz.
+    - Pesos iniciais e n_games vêm do rank 0 (broadcast); o estado do otimizador
+      recomeça igual em todas as réplicas.
+    Estatísticas das partidas ficam no agente de cada rank, como no Trainer.
+    """
+    def __init__(self, seed=None, steps_per_update=DIST_STEPS_PER_UPDATE, **trainer_options):
+        self.rank = dist.get_rank()
+        self.world_size = dist.get_world_size()
+        self.trainer = Trainer(headless=True, seed=None if seed is None else seed + self.rank,
+                               short_memory=False, **trainer_options)
+        self.agent = self.trainer.agent
+        self.agent.trainer.gradient_hook = average_gradients
+        self.steps_per_update = steps_per_update
+        self.steps = 0
+        self.updates = 0
+        self.broadcast_model()
+
+    def broadcast_model(self):
+        """Copia pesos e n_games do rank 0 para as outras réplicas"""
+        agent = self.agent
+        for tensor in agent.model.state_dict().values():
+            dist.broadcast(tensor, src=0)
+        agent.trainer.sync_target()
+        agent.trainer.optimizer.state.clear()
+        games = torch.tensor([agent.n_games], dtype=torch.int64)
+        dist.broadcast(games, src=0)
+        agent.n_games = int(games[0])
+
+    def run(self, max_games=None, duration=None, max_steps=None, on_game_end=None):
+        """
+        Joga e treina até max_games partidas novas somando todos os ranks, duration
+        segundos ou max_steps passos por rank; todos os ranks param juntos.
+        Retorna as estatísticas do rank e as agregadas (soma dos ranks), com as taxas.
+        """
+        agent = self.agent
+        start_steps, start_updates, start_games = self.steps, self.updates, agent.n_games
+        # [votos para parar, partidas novas]: somados entre os ranks a cada atualização
+        sync = torch.zeros(2, dtype=torch.int64)
+        start = time.perf_counter()
+        while True:
+            done, score = self.trainer.train_step()
+            self.steps += 1
+            if done:
+                self.trainer.end_game(score, long_memory=False)
+                if on_game_end is not None:
+                    on_game_end(score)
+            if self.steps % self.steps_per_update:
+                continue
+
+            # Todos os ranks têm o mesmo número de transições: decidem juntos se treinam
+            if len(agent.memory) >= BATCH_SIZE:
+                agent.train_long_memory()
+                self.updates += 1
+
+            stop = ((duration is not None and time.perf_counter() - start >= duration)
+                    or (max_steps is not None and self.steps - start_steps >= max_steps))
+            sync[0] = int(stop)
+            sync[1] = agent.n_games - start_games
+            dist.all_reduce(sync)
+            if sync[0] > 0 or (max_games is not None and sync[1] >= max_games):
+                break
+        elapsed = time.perf_counter() - start
+
+        steps = self.steps - start_steps
+        updates = self.updates - start_updates
+        games = agent.n_games - start_games
+        totals = torch.tensor([steps, games], dtype=torch.int64)
+        dist.all_reduce(totals)
+        slowest = torch.tensor([elapsed], dtype=torch.float64)
+        dist.all_reduce(slowest, op=dist.ReduceOp.MAX)
+        total_steps, total_games = (int(value) for value in totals)
+        seconds = float(slowest[0])
+        return {
+            'rank': self.rank,
+            'world_size': self.world_size,
+            'steps': steps,
+            'updates': updates,
+            'games': games,
+            'seconds': elapsed,
+            'steps_per_second': steps / elapsed,
+            'updates_per_second': updates / elapsed,
+            'total_steps': total_steps,
+            'total_games': total_games,
+            'total_seconds': seconds,
+            'total_steps_per_second': total_steps / seconds,
+        }
+
+    def train(self, max_games=1000, save_every=100):
+        """Treino completo: o rank 0 carrega o último modelo, imprime e salva checkpoints e o modelo final"""
+        agent = self.agent
+        main_rank = self.rank == 0
+        if main_rank:
+            print("Iniciando treinamento distribuído...")
+            print(f"Máximo de jogos (todos os ranks): {max_games}, ranks: {self.world_size}")
+            if agent.n_games == 0:
+                agent.auto_load_latest()
+        self.broadcast_model()
+
+        def on_game_end(score):
+            if not main_rank:
+                return
+            print(f'Jogo {agent.n_games} (rank 0), Score: {score}, Record: {agent.record}, Atualizações: {self.updates}')
+            if agent.n_games % save_every == 0:
+                agent.save_model(f'models/model_checkpoint_{agent.n_games}.pth')
+
+        stats = self.run(max_games=max_games, on_game_end=on_game_end)
+        if main_rank:
+            print(f"{stats['total_steps_per_second']:.0f} passos/s somando {self.world_size} ranks, "
+                  f"{stats['updates_per_second']:.0f} atualizações/s")
+            agent.save_model('models/model_final.pth')
+            print(f"Treinamento concluído! Modelo salvo. Record (rank 0): {agent.record}")
+        return agent
+
+def parameters_checksum(model):
+    """Soma de todos os pesos em float64: réplicas sincronizadas dão o mesmo valor"""
+    return sum(float(param.detach().double().sum()) for param in model.parameters())
+
+def _free_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def _spawned_rank(rank, world_size, port, target, args):
+    """Processo de um rank local: entra no grupo por localhost e chama target(*args)"""
+    os.environ['MASTER_ADDR'] = '127.0.0.1'
+    os.environ['MASTER_PORT'] = str(port)
+    # Núcleos divididos entre os ranks do host
+    torch.set_num_threads(max(1, (os.cpu_count() or 1) // world_size))
+    dist.init_process_group('gloo', rank=rank, world_size=world_size)
+    try:
+        target(*args)
+    finally:
+        dist.destroy_process_group()
+
+def launch_local(world_size, target, *args):
+    """Roda target(*args) em world_size processos deste host, um rank cada (gloo por localhost)"""
+    mp.start_processes(_spawned_rank, args=(world_size, _free_port(), target, args),
+                       nprocs=world_size, join=True, start_method='spawn')
+
+def _run_rank(results, trainer_options, run_options):
+    trainer = DistributedTrainer(**trainer_options)
+    stats = trainer.run(**run_options)
+    stats['checksum'] = parameters_checksum(trainer.agent.model)
+    results.put(stats)
+
+def run_local(world_size=DIST_RANKS, trainer_options=None, **run_options):
+    """
+    DistributedTrainer.run em world_size ranks locais; retorna as estatísticas de
+    cada rank (com o checksum dos pesos finais), ordenadas pelo rank.
+    """
+    results = mp.get_context('spawn').SimpleQueue()
+    launch_local(world_size, _run_rank, results, trainer_options or {}, run_options)
+    stats = [results.get() for _ in range(world_size)]
+    return sorted(stats, key=lambda item: item['rank'])
+
+def _train_rank(max_games, trainer_options):
+    DistributedTrainer(**trainer_options).train(max_games=max_games)
+
+def train_distributed(max_games=1000, world_size=DIST_RANKS, **trainer_options):
+    """
+    Função conveniente para o treino distribuído. Lançado por torchrun (variáveis
+    RANK/WORLD_SIZE/MASTER_ADDR definidas, inclusive em vários nós), este processo é
+    um dos ranks; senão inicia world_size ranks locais.
+    """
+    if 'WORLD_SIZE' in os.environ:
+        dist.init_process_group('gloo', init_method='env://')
+        try:
+            _train_rank(max_games, trainer_options)
+        finally:
+            dist.destroy_process_group()
+    else:
+        launch_local(world_size, _train_rank, max_games, trainer_options)
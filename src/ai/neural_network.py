@@ -3,6 +3,7 @@ import torch.nn as nn
 import torch.optim as optim
 import torch.nn.functional as F
 import numpy as np
+import copy
 from ..game.constants import *
 
 class DQN(nn.Module):
@@ -19,18 +20,79 @@ class DQN(nn.Module):
         return x
 
 class QTrainer:
-    def __init__(self, model, lr=LEARNING_RATE, gamma=GAMMA):
+    def __init__(self, model, lr=LEARNING_RATE, gamma=GAMMA, target_network=False,
+                 target_update=TARGET_UPDATE, tau=None, double_dqn=False):
+        """
+        target_network: bootstrap de uma cópia congelada da rede, sincronizada a cada
+        `target_update` atualizações (ou suavemente a cada atualização se `tau` for dado).
+        double_dqn: a rede online escolhe a próxima ação e a rede alvo a avalia.
+        """
         self.model = model
         self.lr = lr
         self.gamma = gamma
         self.optimizer = optim.Adam(model.parameters(), lr=self.lr)
         self.criterion = nn.MSELoss()
 
-    def train_step(self, state, action, reward, next_state, done):
-        state = torch.tensor(np.array(state), dtype=torch.float)
-        next_state = torch.tensor(np.array(next_state), dtype=torch.float)
-        action = torch.tensor(action, dtype=torch.long)
-        reward = torch.tensor(reward, dtype=torch.float)
+        self.target_update = target_update
+        self.tau = tau
+        self.double_dqn = double_dqn
+        self.updates = 0
+        # gradient_hook(model): chamado entre o backward e o passo do otimizador
+        # (o treino distribuído faz a média dos gradientes entre os ranks)
+        self.gradient_hook = None
+        self.target_model = None
+        if target_network or double_dqn:
+            self.target_model = copy.deepcopy(model)
+            for param in self.target_model.parameters():
+                param.requires_grad_(False)
+
+    def sync_target(self):
+        """Copia os pesos da rede online para a rede alvo"""
+        if self.target_model is not None:
+            self.target_model.load_state_dict(self.model.state_dict())
+
+    def set_learning_rate(self, lr):
+        """Troca a taxa de aprendizado sem perder o estado do Adam"""
+        self.lr = lr
+        for group in self.optimizer.param_groups:
+            group['lr'] = lr
+
+    def _soft_update(self):
+        """Média de Polyak: alvo = tau * online + (1 - tau) * alvo"""
+        with torch.no_grad():
+            for target_param, param in zip(self.target_model.parameters(), self.model.parameters()):
+                target_param.lerp_(param, self.tau)
+
+    def _next_q_values(self, next_state):
+        """max_a Q(s', a) usado no alvo de Bellman"""
+        if self.target_model is None:
+            # Sem rede alvo: a própria rede online (mantém o grafo, como no laço original)
+            return torch.max(self.model(next_state), dim=1)[0]
+
+        with torch.no_grad():
+            target_q = self.target_model(next_state)
+            if self.double_dqn:
+                next_action = torch.argmax(self.model(next_state), dim=1)
+                return target_q[torch.arange(len(next_action)), next_action]
+            return torch.max(target_q, dim=1)[0]
+
+    def _apply_gradients(self):
+        """Passo do otimizador com os gradientes já calculados (depois do gradient_hook)"""
+        if self.gradient_hook is not None:
+            self.gradient_hook(self.model)
+        self.optimizer.step()
+
+    def train_step(self, state, action, reward, next_state, done, weights=None):
+        """
+        Uma atualização da rede. `weights` (um por amostra) pondera a perda,
+        usado pelo replay priorizado. Retorna o erro TD de cada amostra.
+        """
+        # np.asarray não copia os lotes que já vêm em arrays (ReplayBuffer.sample)
+        state = torch.as_tensor(np.asarray(state), dtype=torch.float)
+        next_state = torch.as_tensor(np.asarray(next_state), dtype=torch.float)
+        action = torch.as_tensor(np.asarray(action), dtype=torch.long)
+        reward = torch.as_tensor(np.asarray(reward), dtype=torch.float)
+        done = torch.as_tensor(np.asarray(done), dtype=torch.bool)
 
         if len(state.shape) == 1:
             # Formato: (1, x)
@@ -38,27 +100,42 @@ class QTrainer:
             next_state = torch.unsqueeze(next_state, 0)
             action = torch.unsqueeze(action, 0)
             reward = torch.unsqueeze(reward, 0)
-            done = (done, )
+            done = torch.unsqueeze(done, 0)
+
+        # Ação em one-hot (B, 3) ou já como índice (B,)
+        if len(action.shape) == 2:
+            action = torch.argmax(action, dim=1)
 
         # 1. Predizer Q values com o estado atual
         pred = self.model(state)
 
+        # 2. Q_new = r + y * max(next_predicted Q value) -> só se não for done
+        # Um único forward para todos os próximos estados
+        next_q = self._next_q_values(next_state)
+        Q_new = torch.where(done, reward, reward + self.gamma * next_q)
+
         target = pred.clone()
-        for idx in range(len(done)):
-            Q_new = reward[idx]
-            if not done[idx]:
-                Q_new = reward[idx] + self.gamma * torch.max(self.model(next_state[idx]))
+        target[torch.arange(len(action)), action] = Q_new
 
-            target[idx][torch.argmax(action[idx]).item()] = Q_new
-    
-        # 2. Q_new = r + y * max(next_predicted Q value) -> só se não for done
-        # pred.clone()
-        # preds[argmax(action)] = Q_new
         self.optimizer.zero_grad()
-        loss = self.criterion(target, pred)
+        if weights is None:
+            loss = self.criterion(target, pred)
+        else:
+            # MSE com peso de importance sampling por amostra
+            weights = torch.as_tensor(np.asarray(weights), dtype=torch.float).reshape(-1, 1)
+            loss = (weights * (target - pred) ** 2).mean()
         loss.backward()
 
-        self.optimizer.step()
+        self._apply_gradients()
+
+        self.updates += 1
+        if self.target_model is not None:
+            if self.tau is not None:
+                self._soft_update()
+            elif self.updates % self.target_update == 0:
+                self.sync_target()
+
+        return (Q_new - pred[torch.arange(len(action)), action]).detach().numpy()
 
 class LinearQNet(nn.Module):
     """Versão simplificada da rede neural para casos mais simples"""
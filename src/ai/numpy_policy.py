@@ -0,0 +1,102 @@
+import numpy as np
+from ..game.game_state import GameState
+from ..game.constants import *
+
+# Camadas do DQN (neural_network.py), na ordem do forward
+LAYER_NAMES = ('fc1', 'fc2', 'fc3')
+
+def export_weights(state_dict, file_path, n_games=0, record=0):
+    """
+    Salva os pesos de um state_dict do DQN em .npz, legível sem torch.
+    n_games e record vão junto só para exibição no painel do jogo.
+    """
+    arrays = {}
+    for name in LAYER_NAMES:
+        for kind in ('weight', 'bias'):
+            tensor = state_dict[f'{name}.{kind}']
+            arrays[f'{name}.{kind}'] = tensor.detach().cpu().numpy().astype(np.float32)
+    np.savez(file_path, n_games=n_games, record=record, **arrays)
+
+class NumpyDQN:
+    """
+    Forward do DQN (Linear -> ReLU -> Linear -> ReLU -> Linear) só com NumPy.
+    Aceita um estado (28,) ou um lote (N, 28); não importa o torch.
+    """
+    def __init__(self, weights):
+        # Pesos transpostos para (entrada, saída): x @ W, como o nn.Linear faz com x @ weight.T
+        self.layers = []
+        for name in LAYER_NAMES:
+            weight = np.ascontiguousarray(np.asarray(weights[f'{name}.weight'], dtype=np.float32).T)
+            bias = np.asarray(weights[f'{name}.bias'], dtype=np.float32)
+            self.layers.append((weight, bias))
+
+    @classmethod
+    def load(cls, file_path):
+        """Carrega um .npz gerado por export_weights"""
+        with np.load(file_path) as data:
+            return cls({key: data[key] for key in data.files})
+
+    def forward(self, x):
+        x = np.asarray(x, dtype=np.float32)
+        last = len(self.layers) - 1
+        for i, (weight, bias) in enumerate(self.layers):
+            x = x @ weight + bias
+            if i < last:
+                np.maximum(x, 0, out=x)
+        return x
+
+    __call__ = forward
+
+    def predict_action(self, state):
+        """Ação gulosa (0, 1 ou 2) para um estado"""
+        return int(np.argmax(self.forward(state)))
+
+    def predict_actions(self, states):
+        """Ações gulosas para um lote de estados"""
+        return np.argmax(self.forward(states), axis=1)
+
+class NumpyAgent:
+    """
+    Agente só de inferência sobre um NumpyDQN, com a parte da interface do Agent
+    que o modo AI_PLAY usa. Sempre guloso (sem exploração) e sem treino.
+    """
+    def __init__(self, policy, n_games=0, record=0):
+        self.policy = policy
+        self.n_games = n_games
+        self.record = record
+        self.epsilon = 0.0
+        self.scores = []
+
+    @classmethod
+    def load(cls, file_path):
+        """Carrega pesos e metadados de um .npz gerado por export_weights"""
+        with np.load(file_path) as data:
+            weights = {key: data[key] for key in data.files}
+        return cls(NumpyDQN(weights), n_games=int(weights.get('n_games', 0)), record=int(weights.get('record', 0)))
+
+    def get_state(self, game):
+        game_state = GameState(game)
+        return game_state.get_state()
+
+    def get_action(self, state, game=None):
+        # game: mesma assinatura de Agent.get_action (sem escudo de segurança aqui)
+        final_move = [0, 0, 0]
+        final_move[self.policy.predict_action(state)] = 1
+        return final_move
+
+    def get_actions(self, states):
+        return self.policy.predict_actions(states)
+
+    def q_values(self, states):
+        return self.policy.forward(states)
+
+    def get_stats(self):
+        """Mesmas chaves de Agent.get_stats"""
+        return {
+            'games_played': self.n_games,
+            'epsilon': self.epsilon,
+            'record_score': self.record,
+            'mean_score': np.mean(self.scores[-100:]) if self.scores else 0,
+            'recent_scores': self.scores[-10:],
+            'total_score': sum(self.scores)
+        }
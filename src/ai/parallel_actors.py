@@ -0,0 +1,328 @@
+import multiprocessing
+import queue
+import random
+import time
+import numpy as np
+from multiprocessing import shared_memory
+from .numpy_policy import NumpyDQN, LAYER_NAMES
+from .rewards import shape_reward
+from ..game.headless_game import HeadlessSnakeGame
+from ..game.flood_fill import safe_actions
+from ..game.incremental_state import IncrementalGameState
+from ..game.constants import *
+
+# Atores em processos: cada worker joga suas partidas com um NumpyDQN (sem torch)
+# e lê os pesos de um bloco de memória compartilhada que o aprendiz reescreve.
+
+def weight_layout(state_size=STATE_SIZE, hidden_size=HIDDEN_SIZE, action_size=ACTION_SIZE):
+    """[(nome, formato, início)] dos parâmetros do DQN num vetor float32 contínuo"""
+    sizes = [(state_size, hidden_size), (hidden_size, hidden_size), (hidden_size, action_size)]
+    layout = []
+    offset = 0
+    for name, (fan_in, fan_out) in zip(LAYER_NAMES, sizes):
+        for kind, shape in (('weight', (fan_out, fan_in)), ('bias', (fan_out,))):
+            layout.append((f'{name}.{kind}', shape, offset))
+            offset += int(np.prod(shape))
+    return layout
+
+class SharedWeights:
+    """
+    Pesos do DQN em memória compartilhada: um contador de versão int64 seguido
+    dos parâmetros em float32. O contador fica ímpar durante a escrita, então um
+    leitor descarta cópias feitas no meio de uma atualização (seqlock).
+    """
+    def __init__(self, layout, name=None):
+        self.layout = layout
+        _, shape, offset = layout[-1]
+        self.count = offset + int(np.prod(shape))
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=8 + 4 * self.count)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.name = self.shm.name
+        self._version = np.ndarray((1,), dtype=np.int64, buffer=self.shm.buf)
+        self._flat = np.ndarray((self.count,), dtype=np.float32, buffer=self.shm.buf, offset=8)
+
+    @property
+    def version(self):
+        return int(self._version[0])
+
+    def write(self, state_dict):
+        """Copia um state_dict (tensores ou arrays) para o bloco e publica uma versão nova"""
+        self._version[0] += 1
+        for name, shape, offset in self.layout:
+            value = state_dict[name]
+            if hasattr(value, 'detach'):
+                value = value.detach().cpu().numpy()
+            self._flat[offset:offset + value.size] = value.ravel()
+        self._version[0] += 1
+
+    def read(self, known_version):
+        """(versão, {nome: array}) se houver versão nova completa; senão None"""
+        version = self.version
+        if version == known_version or version % 2:
+            return None
+        flat = self._flat.copy()
+        if self.version != version:
+            return None
+        return version, {name: flat[offset:offset + int(np.prod(shape))].reshape(shape)
+                         for name, shape, offset in self.layout}
+
+    def close(self):
+        # As views numpy precisam sair antes de fechar o mmap
+        self._version = self._flat = None
+        self.shm.close()
+
+    def unlink(self):
+        self.shm.unlink()
+
+def _choose_action(game, game_state, policy, state, rng, epsilon, safety_shield):
+    """Epsilon-greedy do worker; com o escudo, as duas escolhas ficam em safe_actions"""
+    allowed = safe_actions(game, game_state.reachable) if safety_shield else None
+    if rng.random() < epsilon:
+        return rng.randint(0, 2) if allowed is None else rng.choice(allowed)
+    if allowed is None:
+        return policy.predict_action(state)
+    prediction = policy(state)
+    return max(allowed, key=lambda action: prediction[action])
+
+def _worker_loop(seed, weights_name, layout, transitions, stop_event, ready, epsilon, flush_every, safety_shield):
+    """Processo ator: joga e envia blocos (states, actions, rewards, next_states, dones, scores)"""
+    ready.release()  # Pronto: com spawn, o import do processo não entra no tempo do treino
+    shared = SharedWeights(layout, name=weights_name)
+    game = HeadlessSnakeGame(seed=seed)
+    game_state = IncrementalGameState(game)
+    rng = random.Random(seed)
+    policy = None
+    version = -1
+
+    states = np.zeros((flush_every, STATE_SIZE), dtype=np.float32)
+    next_states = np.zeros((flush_every, STATE_SIZE), dtype=np.float32)
+    actions = np.zeros(flush_every, dtype=np.int8)
+    rewards = np.zeros(flush_every, dtype=np.float32)
+    dones = np.zeros(flush_every, dtype=bool)
+    count = 0
+    scores = []
+    try:
+        while not stop_event.is_set():
+            update = shared.read(version)
+            if update is not None:
+                version, weights = update
+                policy = NumpyDQN(weights)
+            if policy is None:
+                time.sleep(0.01)
+                continue
+
+            state_old = game_state.get_state()
+            distance_old = game_state.get_distance_to_food()
+            action = _choose_action(game, game_state, policy, state_old, rng, epsilon.value, safety_shield)
+            reward, done, score = game.play_step(action)
+            state_new = game_state.get_state()
+            if not done:
+                reward = shape_reward(game, game_state, reward, distance_old)
+
+            states[count] = state_old
+            actions[count] = action
+            rewards[count] = reward
+            next_states[count] = state_new
+            dones[count] = done
+            count += 1
+            if done:
+                scores.append(score)
+                game.reset()
+
+            if count == flush_every:
+                block = (states.copy(), actions.copy(), rewards.copy(), next_states.copy(), dones.copy(), scores)
+                while not stop_event.is_set():
+                    try:
+                        transitions.put(block, timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+                count = 0
+                scores = []
+    finally:
+        # Sem esperar o aprendiz consumir a fila ao sair
+        transitions.cancel_join_thread()
+        shared.close()
+
+class ParallelActorTrainer:
+    """
+    Treino com atores em processos: K workers jogam partidas headless com
+    epsilon-greedy sobre um NumpyDQN e enviam as transições em blocos de
+    WORKER_FLUSH (arrays NumPy) por uma fila. O aprendiz, no processo principal,
+    grava os blocos com ReplayBuffer.extend, treina lotes sem parar e, a cada
+    WEIGHT_SYNC_UPDATES atualizações, reescreve os pesos na memória compartilhada.
+    Mesma interface de ActorLearnerTrainer (run, train, estatísticas no agente).
+    """
+    def __init__(self, num_workers=PARALLEL_WORKERS, seed=None, sync_every=WEIGHT_SYNC_UPDATES,
+                 flush_every=WORKER_FLUSH, queue_size=TRANSITION_QUEUE_SIZE, **agent_options):
+        # Import local: os workers importam este módulo e não precisam do torch
+        from .agent import Agent
+        self.agent = Agent(**agent_options)
+        self.num_workers = num_workers
+        self.seed = seed
+        self.sync_every = sync_every
+        self.flush_every = flush_every
+        self.queue_size = queue_size
+        self.layout = weight_layout()
+        self.shared = SharedWeights(self.layout)
+        self.shared.write(self.agent.model.state_dict())
+        # spawn: o processo principal já tem threads (torch), um fork herdaria locks travados
+        self.context = multiprocessing.get_context('spawn')
+        self.epsilon = self.context.Value('d', 0.0, lock=False)
+        self._update_epsilon()
+        self.steps = 0
+        self.updates = 0
+        self._processes = []
+
+    def _update_epsilon(self):
+        """Mesmo decaimento de Agent.get_action; os workers leem o valor compartilhado"""
+        agent = self.agent
+        agent.epsilon = EPSILON_END + (EPSILON_START - EPSILON_END) * np.exp(-1. * agent.n_games / agent.epsilon_games)
+        self.epsilon.value = agent.epsilon
+
+    def _drain(self, transitions, timeout, on_game_end):
+        """Grava na memória os blocos da fila; espera até timeout pelo primeiro"""
+        memory = self.agent.memory
+        try:
+            block = transitions.get(timeout=timeout) if timeout else transitions.get_nowait()
+        except queue.Empty:
+            return
+        while True:
+            states, actions, rewards, next_states, dones, scores = block
+            memory.extend(states, actions, rewards, next_states, dones)
+            self.steps += len(states)
+            for score in scores:
+                self._end_game(score)
+                if on_game_end is not None:
+                    on_game_end(score)
+            try:
+                block = transitions.get_nowait()
+            except queue.Empty:
+                return
+
+    def run(self, max_games=None, duration=None, on_game_end=None, learn=True):
+        """
+        Inicia os workers e treina até max_games partidas novas ou duration segundos.
+        learn=False só recolhe as transições (vazão dos atores, para benchmarks).
+        Retorna passos, atualizações e partidas, com as taxas por segundo.
+        """
+        context = self.context
+        transitions = context.Queue(maxsize=self.queue_size)
+        stop_event = context.Event()
+        ready = context.Semaphore(0)
+        target_games = None if max_games is None else self.agent.n_games + max_games
+        start_steps, start_updates, start_games = self.steps, self.updates, self.agent.n_games
+
+        self._processes = [
+            context.Process(target=_worker_loop, daemon=True,
+                            args=(None if self.seed is None else self.seed + i, self.shared.name, self.layout,
+                                  transitions, stop_event, ready, self.epsilon, self.flush_every,
+                                  self.agent.safety_shield))
+            for i in range(self.num_workers)]
+        for process in self._processes:
+            process.start()
+        self._wait_ready(ready)
+        # Tempo a partir daqui: a criação dos processos não entra nas taxas
+        start = time.perf_counter()
+        try:
+            while True:
+                if duration is not None and time.perf_counter() - start >= duration:
+                    break
+                if target_games is not None and self.agent.n_games >= target_games:
+                    break
+                ready = learn and len(self.agent.memory) >= BATCH_SIZE
+                self._drain(transitions, None if ready else 0.05, on_game_end)
+                if not ready:
+                    continue
+                self.agent.train_long_memory()
+                self.updates += 1
+                if self.updates % self.sync_every == 0:
+                    self.shared.write(self.agent.model.state_dict())
+        finally:
+            elapsed = time.perf_counter() - start
+            self._stop(transitions, stop_event)
+
+        steps = self.steps - start_steps
+        updates = self.updates - start_updates
+        return {
+            'steps': steps,
+            'updates': updates,
+            'games': self.agent.n_games - start_games,
+            'seconds': elapsed,
+            'steps_per_second': steps / elapsed,
+            'updates_per_second': updates / elapsed,
+        }
+
+    def _wait_ready(self, ready):
+        """Espera todos os workers iniciarem; erro se algum morrer antes"""
+        for _ in self._processes:
+            while not ready.acquire(timeout=0.1):
+                if any(process.exitcode is not None for process in self._processes):
+                    for process in self._processes:
+                        process.terminate()
+                        process.join()
+                    self._processes = []
+                    raise RuntimeError("Worker encerrou antes de iniciar")
+
+    def _stop(self, transitions, stop_event):
+        """Para os workers, descartando os blocos ainda na fila"""
+        stop_event.set()
+        for process in self._processes:
+            while process.is_alive():
+                try:
+                    transitions.get(timeout=0.05)
+                except queue.Empty:
+                    pass
+            process.join()
+        self._processes = []
+        transitions.close()
+
+    def close(self):
+        """Libera o bloco de memória compartilhada"""
+        if self.shared is not None:
+            self.shared.close()
+            self.shared.unlink()
+            self.shared = None
+
+    def _end_game(self, score):
+        """Estatísticas de fim de partida, como Trainer.end_game (o treino segue no laço do aprendiz)"""
+        agent = self.agent
+        agent.n_games += 1
+        self._update_epsilon()
+        if score > agent.record:
+            agent.record = score
+        agent.scores.append(score)
+        agent.total_score += score
+        agent.mean_scores.append(agent.total_score / agent.n_games)
+
+    def train(self, max_games=1000, save_every=100):
+        """Treino completo: carrega o último modelo, salva checkpoints e o modelo final"""
+        print("Iniciando treinamento com atores em processos...")
+        print(f"Máximo de jogos: {max_games}, workers: {self.num_workers}")
+
+        if self.agent.n_games == 0 and self.agent.auto_load_latest():
+            self._update_epsilon()
+            self.shared.write(self.agent.model.state_dict())
+
+        def on_game_end(score):
+            agent = self.agent
+            print(f'Jogo {agent.n_games}, Score: {score}, Record: {agent.record}, Atualizações: {self.updates}')
+            if agent.n_games % save_every == 0:
+                agent.save_model(f'models/model_checkpoint_{agent.n_games}.pth')
+
+        try:
+            stats = self.run(max_games=max_games, on_game_end=on_game_end)
+        finally:
+            self.close()
+        print(f"{stats['steps_per_second']:.0f} passos/s, {stats['updates_per_second']:.0f} atualizações/s")
+
+        self.agent.save_model('models/model_final.pth')
+        print(f"Treinamento concluído! Modelo salvo. Record: {self.agent.record}")
+        return self.agent
+
+def train_parallel(max_games=1000, num_workers=PARALLEL_WORKERS, **agent_options):
+    """Função conveniente para o treino com atores em processos"""
+    trainer = ParallelActorTrainer(num_workers=num_workers, **agent_options)
+    return trainer.train(max_games=max_games)
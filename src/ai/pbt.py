@@ -0,0 +1,256 @@
+import io
+import multiprocessing
+import os
+import random
+import time
+import traceback
+import numpy as np
+import torch
+from .training import Trainer
+from ..game.constants import *
+
+# Treino populacional (PBT): cada membro é um Trainer headless num processo próprio,
+# com hiperparâmetros próprios (taxa de aprendizado, gamma, decaimento do epsilon e
+# pesos das recompensas). A cada rodada todos treinam PBT_INTERVAL partidas em
+# paralelo; depois os piores copiam rede, rede alvo e estado do otimizador de um dos
+# melhores (Agent.checkpoint, serializado em memória e enviado pelo pipe, sem disco)
+# e seguem com os hiperparâmetros dele perturbados.
+
+def default_hyperparameters():
+    """Hiperparâmetros de constants.py, no formato dos membros"""
+    return {
+        'lr': LEARNING_RATE,
+        'gamma': GAMMA,
+        'epsilon_games': EPSILON_DECAY_GAMES,
+        'reward_weights': {'food': 1.0, 'death': 1.0, 'shaping': 1.0},
+    }
+
+def perturb(hyperparameters, rng, factors=PBT_PERTURB_FACTORS):
+    """Cópia com cada hiperparâmetro multiplicado por um dos fatores, sorteado (explore)"""
+    return {
+        'lr': hyperparameters['lr'] * rng.choice(factors),
+        # gamma perto de 1: o fator vale para o horizonte 1 / (1 - gamma)
+        'gamma': min(1 - (1 - hyperparameters['gamma']) * rng.choice(factors), 0.999),
+        'epsilon_games': max(1, round(hyperparameters['epsilon_games'] * rng.choice(factors))),
+        'reward_weights': {name: weight * rng.choice(factors)
+                           for name, weight in hyperparameters['reward_weights'].items()},
+    }
+
+def apply_hyperparameters(trainer, hyperparameters):
+    """Aplica os hiperparâmetros de um membro ao Trainer e ao agente dele"""
+    agent = trainer.agent
+    agent.trainer.set_learning_rate(hyperparameters['lr'])
+    agent.gamma = agent.trainer.gamma = hyperparameters['gamma']
+    agent.epsilon_games = hyperparameters['epsilon_games']
+    trainer.reward_weights = dict(hyperparameters['reward_weights'])
+
+def checkpoint_to_bytes(checkpoint):
+    """Checkpoint em bytes (o mesmo formato de um .pth de save_model)"""
+    buffer = io.BytesIO()
+    torch.save(checkpoint, buffer)
+    return buffer.getvalue()
+
+def checkpoint_from_bytes(data):
+    return torch.load(io.BytesIO(data), weights_only=False)
+
+def _train_games(trainer, games):
+    """Treina `games` partidas; retorna os scores delas, passos e tempo"""
+    agent = trainer.agent
+    target_games = agent.n_games + games
+    steps = 0
+    start = time.perf_counter()
+    while agent.n_games < target_games:
+        done, score = trainer.train_step()
+        steps += 1
+        if done:
+            trainer.end_game(score)
+    return {
+        'scores': agent.scores[-games:],
+        'steps': steps,
+        'seconds': time.perf_counter() - start,
+        'record': agent.record,
+    }
+
+def _member_loop(connection, seed, hyperparameters, trainer_options, threads):
+    """Processo de um membro: atende aos comandos do PopulationTrainer pelo pipe"""
+    torch.set_num_threads(threads)
+    if seed is not None:
+        random.seed(seed)
+        torch.manual_seed(seed)
+    trainer = Trainer(headless=True, seed=seed, **trainer_options)
+    apply_hyperparameters(trainer, hyperparameters)
+    agent = trainer.agent
+    connection.send(True)  # Pronto: a importação e a criação do agente não entram no tempo das rodadas
+    while True:
+        command, *args = connection.recv()
+        if command == 'stop':
+            break
+        try:
+            if command == 'train':
+                reply = _train_games(trainer, *args)
+            elif command == 'checkpoint':
+                reply = checkpoint_to_bytes(agent.checkpoint())
+            elif command == 'exploit':
+                data, hyperparameters = args
+                # Só rede, rede alvo e otimizador: as estatísticas do membro continuam dele
+                agent.load_checkpoint(checkpoint_from_bytes(data), statistics=False)
+                apply_hyperparameters(trainer, hyperparameters)
+                reply = True
+            else:
+                raise ValueError(f"Comando desconhecido: {command}")
+        except Exception:
+            reply = RuntimeError(traceback.format_exc())
+        connection.send(reply)
+    connection.close()
+
+class PopulationTrainer:
+    """
+    Treino populacional com `population` membros em processos.
+
+    - Membro 0 começa com os valores de constants.py; os outros com perturbações deles.
+    - run_round: todos treinam `interval` partidas ao mesmo tempo; o desempenho de um
+      membro é a média dos scores dessas partidas.
+    - Exploit: a fração `exploit_fraction` (até 0.5) pior copia o checkpoint (rede, rede alvo e
+      Adam) de um membro sorteado entre a mesma fração melhor. Explore: recebe os
+      hiperparâmetros do doador multiplicados por fatores de `perturb_factors`.
+    A memória de replay de cada membro fica com ele.
+    """
+    def __init__(self, population=PBT_POPULATION, interval=PBT_INTERVAL, exploit_fraction=PBT_EXPLOIT_FRACTION,
+                 perturb_factors=PBT_PERTURB_FACTORS, seed=None, **trainer_options):
+        if not 0 < exploit_fraction <= 0.5:
+            raise ValueError(f"exploit_fraction deve estar em (0, 0.5]: {exploit_fraction}")
+        self.population = population
+        self.interval = interval
+        self.exploit_fraction = exploit_fraction
+        self.perturb_factors = perturb_factors
+        self.seed = seed
+        self.trainer_options = trainer_options
+        self.rng = random.Random(seed)
+        base = default_hyperparameters()
+        self.hyperparameters = [base] + [perturb(base, self.rng, perturb_factors) for _ in range(population - 1)]
+        self.scores = [0.0] * population  # Média da última rodada de cada membro
+        self.records = [0] * population
+        self.history = []
+        self.steps = 0
+        self.exploits = 0
+        self._members = []
+
+    def start(self):
+        """Inicia os processos dos membros (run_round chama se preciso)"""
+        if self._members:
+            return
+        context = multiprocessing.get_context('spawn')
+        threads = max(1, (os.cpu_count() or 1) // self.population)  # Núcleos divididos entre os membros
+        for index, hyperparameters in enumerate(self.hyperparameters):
+            connection, child = context.Pipe()
+            seed = None if self.seed is None else self.seed + index
+            process = context.Process(target=_member_loop, daemon=True,
+                                      args=(child, seed, hyperparameters, self.trainer_options, threads))
+            process.start()
+            child.close()
+            self._members.append((process, connection))
+        for index in range(self.population):
+            self._receive(index)
+
+    def _receive(self, index):
+        reply = self._members[index][1].recv()
+        if isinstance(reply, Exception):
+            raise RuntimeError(f"Membro {index} falhou:\n{reply}")
+        return reply
+
+    def _request(self, index, *command):
+        self._members[index][1].send(command)
+        return self._receive(index)
+
+    def run_round(self):
+        """Uma rodada: treino em paralelo, depois exploit/explore. Retorna o registro da rodada"""
+        self.start()
+        start = time.perf_counter()
+        for _, connection in self._members:
+            connection.send(('train', self.interval))
+        results = [self._receive(index) for index in range(self.population)]
+        elapsed = time.perf_counter() - start
+
+        self.scores = [float(np.mean(result['scores'])) for result in results]
+        self.records = [result['record'] for result in results]
+        steps = sum(result['steps'] for result in results)
+        self.steps += steps
+        best = self.best_member()
+        exploited = self._exploit_and_explore()
+        record = {
+            'round': len(self.history) + 1,
+            'scores': self.scores,
+            'best': best,
+            'exploited': exploited,
+            'seconds': elapsed,
+            'steps_per_second': steps / elapsed,
+        }
+        self.history.append(record)
+        return record
+
+    def _exploit_and_explore(self):
+        """Piores copiam um dos melhores e perturbam os hiperparâmetros; retorna [(membro, doador)]"""
+        if self.population < 2:
+            return []
+        # Nunca mais que metade: um membro não pode estar entre os piores e os melhores
+        count = max(1, min(int(self.population * self.exploit_fraction), self.population // 2))
+        order = sorted(range(self.population), key=lambda index: self.scores[index], reverse=True)
+        top, bottom = order[:count], order[-count:]
+        exploited = []
+        for member in bottom:
+            donor = self.rng.choice(top)
+            data = self._request(donor, 'checkpoint')
+            hyperparameters = perturb(self.hyperparameters[donor], self.rng, self.perturb_factors)
+            self._request(member, 'exploit', data, hyperparameters)
+            self.hyperparameters[member] = hyperparameters
+            exploited.append((member, donor))
+        self.exploits += len(exploited)
+        return exploited
+
+    def best_member(self):
+        return max(range(self.population), key=lambda index: self.scores[index])
+
+    def save_best(self, file_path):
+        """Grava o checkpoint do melhor membro da última rodada (os bytes já são um .pth)"""
+        data = self._request(self.best_member(), 'checkpoint')
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        with open(file_path, 'wb') as file:
+            file.write(data)
+
+    def close(self):
+        """Para os processos dos membros"""
+        for process, connection in self._members:
+            connection.send(('stop',))
+            connection.close()
+            process.join()
+        self._members = []
+
+    def train(self, max_games=1000):
+        """Treino completo: max_games partidas por membro em rodadas de `interval`; salva o melhor"""
+        rounds = max(1, max_games // self.interval)
+        print("Iniciando treinamento populacional...")
+        print(f"Membros: {self.population}, rodadas: {rounds} de {self.interval} partidas por membro")
+        try:
+            for _ in range(rounds):
+                record = self.run_round()
+                best = record['best']
+                hyperparameters = self.hyperparameters[best]
+                scores = ', '.join(f"{score:.1f}" for score in record['scores'])
+                print(f"Rodada {record['round']}: médias [{scores}], melhor membro {best} "
+                      f"(lr {hyperparameters['lr']:.2g}, gamma {hyperparameters['gamma']:.3f}), "
+                      f"{record['steps_per_second']:.0f} passos/s")
+                for member, donor in record['exploited']:
+                    print(f"  Membro {member} copiou o membro {donor} e perturbou os hiperparâmetros")
+            self.save_best('models/model_final.pth')
+        finally:
+            self.close()
+
+        best = self.best_member()
+        print(f"Treinamento concluído! Melhor membro {best} salvo. Record: {self.records[best]}")
+        return {'member': best, 'score': self.scores[best], 'record': self.records[best],
+                'hyperparameters': self.hyperparameters[best]}
+
+def train_pbt(max_games=1000, population=PBT_POPULATION, **trainer_options):
+    """Função conveniente para o treino populacional"""
+    trainer = PopulationTrainer(population=population, **trainer_options)
+    return trainer.train(max_games=max_games)
@@ -0,0 +1,123 @@
+import time
+import numpy as np
+from ..game.headless_game import HeadlessSnakeGame
+from ..game.incremental_state import IncrementalGameState
+from ..game.constants import *
+
+class LookaheadPlanner:
+    """
+    Política de jogo com busca: expande as 3 jogadas relativas por várias camadas
+    (busca em feixe) numa cópia headless do jogo e avalia as folhas com o DQN.
+
+    - Cópia rápida: o jogo real vira um snapshot() e cada nó é restaurado na cópia
+      (o jogo real e o gerador global de números aleatórios não são tocados).
+    - Valor de um nó: recompensas do jogo descontadas por gamma até ele, mais
+      gamma^d * max Q(folha); nós em que a cobra morre ficam só com as recompensas.
+    - Avaliação em lote: os estados de todos os filhos de uma camada passam pela
+      rede numa chamada só (agent.q_values).
+    - Aprofundamento iterativo com orçamento de tempo: cada camada completa atualiza
+      a decisão; se o tempo acaba no meio de uma camada, vale a camada anterior e,
+      sem nenhuma camada completa, a jogada gulosa do DQN.
+
+    agent: qualquer agente com q_values(states) -> (N, 3), como Agent ou NumpyAgent.
+    """
+    def __init__(self, agent, depth=PLANNER_DEPTH, beam_width=PLANNER_BEAM_WIDTH,
+                 time_budget=PLANNER_TIME_BUDGET, gamma=GAMMA):
+        self.agent = agent
+        self.depth = depth
+        self.beam_width = beam_width
+        self.time_budget = time_budget
+        self.gamma = gamma
+        self._simulator = None
+        self._state_engine = None
+        # Estados dos filhos de uma camada (no máximo beam_width * 3), sem realocar por busca
+        self._states = np.zeros((beam_width * ACTION_SIZE, STATE_SIZE), dtype=np.float32)
+
+        # Estatísticas da última busca e acumuladas
+        self.last_depth = 0
+        self.searches = 0
+        self.greedy_fallbacks = 0
+
+    def get_action(self, game, state=None):
+        """Jogada em one-hot ([frente, direita, esquerda]), como Agent.get_action"""
+        final_move = [0, 0, 0]
+        final_move[self.plan(game, state)] = 1
+        return final_move
+
+    def plan(self, game, state=None):
+        """Índice da jogada (0, 1 ou 2) escolhida pela busca dentro do orçamento de tempo"""
+        deadline = time.perf_counter() + self.time_budget
+        simulator = self._get_simulator(game)
+        root = game.snapshot()
+        if state is None:
+            simulator.restore(root)
+            state = self._state_engine.get_state()
+
+        # Decisão de reserva: a jogada gulosa do DQN
+        self._states[0] = state
+        decision = int(np.argmax(self.agent.q_values(self._states[:1])[0]))
+        self.searches += 1
+        self.last_depth = 0
+
+        # Nó do feixe: (valor estimado, retorno acumulado, desconto, primeira jogada, snapshot)
+        beam = [(0.0, 0.0, 1.0, None, root)]
+        # Melhor valor final de cada primeira jogada entre os nós em que a cobra morreu
+        finished = {}
+        for depth in range(1, self.depth + 1):
+            children = self._expand(beam, finished, deadline)
+            if children is None:
+                break  # Tempo esgotado no meio da camada
+
+            self.last_depth = depth
+            candidates = dict(finished)
+            for score, _, _, first_action, _ in children:
+                if score > candidates.get(first_action, -np.inf):
+                    candidates[first_action] = score
+            decision = max(candidates, key=candidates.get)
+
+            if not children:
+                break  # Todas as linhas terminam em morte
+            children.sort(key=lambda node: node[0], reverse=True)
+            beam = children[:self.beam_width]
+
+        if self.last_depth == 0:
+            self.greedy_fallbacks += 1
+        return decision
+
+    def _expand(self, beam, finished, deadline):
+        """Filhos de todos os nós do feixe, com valores das folhas em um lote; None se o tempo acabar"""
+        simulator = self._simulator
+        state_engine = self._state_engine
+        states = self._states
+        gamma = self.gamma
+        children = []
+        for _, ret, discount, first_action, snapshot in beam:
+            for action in range(ACTION_SIZE):
+                if time.perf_counter() > deadline:
+                    return None
+                simulator.restore(snapshot)
+                reward, done, _ = simulator.play_step(action)
+                child_ret = ret + discount * reward
+                child_first = action if first_action is None else first_action
+                if done:
+                    if child_ret > finished.get(child_first, -np.inf):
+                        finished[child_first] = child_ret
+                    continue
+                states[len(children)] = state_engine.get_state()
+                children.append((0.0, child_ret, discount * gamma, child_first, simulator.snapshot()))
+
+        if children:
+            values = self.agent.q_values(states[:len(children)]).max(axis=1)
+            children = [(ret + discount * float(value), ret, discount, first_action, snapshot)
+                        for (_, ret, discount, first_action, snapshot), value in zip(children, values)]
+        return children
+
+    def _get_simulator(self, game):
+        """Cópia headless do tabuleiro do jogo (recriada só se o tamanho mudar)"""
+        simulator = self._simulator
+        if simulator is None or (simulator.width, simulator.height) != (game.width, game.height):
+            # Gerador próprio: restore() copia o estado do gerador do jogo real para ele
+            simulator = HeadlessSnakeGame(game.width, game.height, seed=0)
+            self._simulator = simulator
+            self._state_engine = IncrementalGameState(simulator)
+        return simulator
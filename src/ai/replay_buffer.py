@@ -0,0 +1,161 @@
+import numpy as np
+from ..game.constants import *
+
+class ReplayBuffer:
+    """
+    Memória de replay em arrays NumPy pré-alocados (buffer circular).
+    Inserção O(1), amostragem vetorizada por índices e lotes prontos para
+    torch.from_numpy, sem tuplas nem listas por transição.
+    """
+    def __init__(self, capacity=MEMORY_SIZE, state_size=STATE_SIZE, seed=None):
+        self.capacity = capacity
+        self.states = np.zeros((capacity, state_size), dtype=np.float32)
+        self.next_states = np.zeros((capacity, state_size), dtype=np.float32)
+        self.actions = np.zeros(capacity, dtype=np.int8)  # índice da ação (0, 1 ou 2)
+        self.rewards = np.zeros(capacity, dtype=np.float32)
+        self.dones = np.zeros(capacity, dtype=bool)
+
+        self.position = 0  # Próximo slot a ser escrito
+        self.size = 0
+        if seed is None:
+            # Sem seed: deriva do gerador global, então np.random.seed() torna o treino reproduzível
+            seed = np.random.randint(2 ** 32)
+        self.rng = np.random.default_rng(seed)
+
+    @property
+    def maxlen(self):
+        """Capacidade máxima (mesmo nome do deque usado antes)"""
+        return self.capacity
+
+    def __len__(self):
+        return self.size
+
+    def push(self, state, action, reward, next_state, done):
+        """Insere uma transição; a ação pode vir em one-hot ([0, 1, 0]) ou como índice"""
+        if not np.isscalar(action):
+            action = int(np.argmax(action))
+        i = self.position
+        self.states[i] = state
+        self.actions[i] = action
+        self.rewards[i] = reward
+        self.next_states[i] = next_state
+        self.dones[i] = done
+
+        self.position = (i + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+        return i
+
+    def extend(self, states, actions, rewards, next_states, dones):
+        """Insere um lote de transições (ex.: um passo do BatchSnakeEnv); ações como índices"""
+        count = len(states)
+        idx = (self.position + np.arange(count)) % self.capacity
+        self.states[idx] = states
+        self.actions[idx] = actions
+        self.rewards[idx] = rewards
+        self.next_states[idx] = next_states
+        self.dones[idx] = dones
+
+        self.position = int((self.position + count) % self.capacity)
+        self.size = min(self.size + count, self.capacity)
+        return idx
+
+    def sample(self, batch_size=BATCH_SIZE):
+        """
+        Sorteia um lote (com reposição) e retorna (states, actions, rewards, next_states, dones).
+        Com menos transições que batch_size, retorna toda a memória como views, sem cópia.
+        """
+        if self.size <= batch_size:
+            idx = slice(0, self.size)
+        else:
+            idx = self.rng.integers(0, self.size, size=batch_size)
+        return self._batch(idx)
+
+    def _batch(self, idx):
+        return (self.states[idx], self.actions[idx], self.rewards[idx],
+                self.next_states[idx], self.dones[idx])
+
+class SumTree:
+    """
+    Árvore de somas em array (heap): folhas guardam prioridades e cada nó
+    interno a soma dos filhos. Amostragem proporcional e atualização em O(log n),
+    vetorizadas sobre o lote.
+    """
+    def __init__(self, capacity):
+        self.capacity = capacity
+        # Nº de folhas arredondado para potência de 2: todas as folhas na mesma profundidade
+        self.leaf_count = 1
+        while self.leaf_count < capacity:
+            self.leaf_count *= 2
+        self.depth = self.leaf_count.bit_length() - 1
+        self.tree = np.zeros(2 * self.leaf_count, dtype=np.float64)  # raiz no índice 1
+
+    @property
+    def total(self):
+        return self.tree[1]
+
+    def update(self, indices, priorities):
+        """Define a prioridade das folhas `indices` e recalcula os ancestrais"""
+        nodes = np.asarray(indices) + self.leaf_count
+        self.tree[nodes] = priorities
+        for _ in range(self.depth):
+            nodes = np.unique(nodes // 2)
+            self.tree[nodes] = self.tree[2 * nodes] + self.tree[2 * nodes + 1]
+
+    def find(self, values):
+        """Índice da folha onde cada valor cai na soma acumulada das prioridades"""
+        values = np.array(values, dtype=np.float64)
+        nodes = np.ones(len(values), dtype=np.int64)
+        for _ in range(self.depth):
+            left = 2 * nodes
+            go_right = values >= self.tree[left]
+            values -= np.where(go_right, self.tree[left], 0.0)
+            nodes = left + go_right
+        # Arredondamento no limite superior pode cair numa folha vazia à direita
+        return np.minimum(nodes - self.leaf_count, self.capacity - 1)
+
+class PrioritizedReplayBuffer(ReplayBuffer):
+    """
+    Replay priorizado (Schaul et al.): transições com maior erro TD são
+    sorteadas mais vezes, com pesos de importance sampling para corrigir o viés.
+    """
+    def __init__(self, capacity=MEMORY_SIZE, state_size=STATE_SIZE, alpha=PER_ALPHA,
+                 beta=PER_BETA_START, beta_increment=PER_BETA_INCREMENT, seed=None):
+        super().__init__(capacity, state_size, seed)
+        self.tree = SumTree(capacity)
+        self.alpha = alpha
+        self.beta = beta
+        self.beta_increment = beta_increment
+        self.max_priority = 1.0  # Transições novas entram com a maior prioridade vista
+
+    def push(self, state, action, reward, next_state, done):
+        i = super().push(state, action, reward, next_state, done)
+        self.tree.update([i], self.max_priority ** self.alpha)
+        return i
+
+    def extend(self, states, actions, rewards, next_states, dones):
+        idx = super().extend(states, actions, rewards, next_states, dones)
+        self.tree.update(idx, self.max_priority ** self.alpha)
+        return idx
+
+    def sample(self, batch_size=BATCH_SIZE):
+        """
+        Sorteio estratificado proporcional à prioridade.
+        Retorna (lote, índices, pesos); os índices voltam em update_priorities.
+        """
+        segment = self.tree.total / batch_size
+        values = (np.arange(batch_size) + self.rng.random(batch_size)) * segment
+        idx = np.minimum(self.tree.find(values), self.size - 1)
+
+        # Pesos de importance sampling, normalizados pelo maior do lote
+        probabilities = self.tree.tree[idx + self.tree.leaf_count] / self.tree.total
+        weights = (self.size * probabilities) ** (-self.beta)
+        weights = (weights / weights.max()).astype(np.float32)
+        self.beta = min(1.0, self.beta + self.beta_increment)
+
+        return self._batch(idx), idx, weights
+
+    def update_priorities(self, indices, td_errors):
+        """Atualiza as prioridades com os novos erros TD das transições amostradas"""
+        priorities = np.abs(td_errors) + PER_EPSILON
+        self.max_priority = max(self.max_priority, float(priorities.max()))
+        self.tree.update(indices, priorities ** self.alpha)
@@ -0,0 +1,59 @@
+from ..game.constants import *
+
+def shape_reward(game, game_state, reward, distance_old, enclosed_penalty=ENCLOSED_PENALTY):
+    """
+    Recompensa modelada de um passo que não terminou a partida: distância até a
+    comida e features do estado expandido (game_state com o cache do passo atual).
+    Usada pelo Trainer e pelos atores (threads e processos), sem depender do torch.
+    enclosed_penalty: soma PENALTY_ENCLOSED quando a cobra entra num bolsão (flood fill).
+    """
+    # Recompensa baseada na distância
+    distance_new = game_state.get_distance_to_food()
+    if distance_new < distance_old:
+        reward += REWARD_CLOSER_TO_FOOD
+    elif distance_new > distance_old:
+        reward += REWARD_FARTHER_FROM_FOOD
+    
+    # Recompensas adicionais baseadas no estado expandido
+    game_info = game_state.get_game_info()
+    
+    # Penalizar alta densidade corporal (evitar armadilhas)
+    if game_info['body_density'] > 0.7:
+        reward += PENALTY_HIGH_DENSITY
+    
+    # Recompensar boa eficiência de espaço livre
+    if game_info['free_space_ratio'] > 0.5:
+        reward += REWARD_EFFICIENT_SPACE
+    
+    # Penalizar fortemente detecção de armadilhas
+    if game_info['trap_risk']:
+        reward += PENALTY_TRAP_RISK
+    
+    # Penalizar bloqueio da cauda
+    if game_info['tail_blocking']:
+        reward += PENALTY_TAIL_BLOCKING
+
+    # Penalizar entrar num bolsão: nenhuma jogada alcança células para a cobra inteira
+    if enclosed_penalty and game_state.get_reachable_info()['enclosed']:
+        reward += PENALTY_ENCLOSED
+    
+    # Recompensa proporcional ao tamanho da cobra (incentiva crescimento)
+    size_bonus = len(game.snake) * REWARD_SIZE_BONUS
+    reward += size_bonus
+    return reward
+
+def weighted_reward(reward, shaped, done, weights):
+    """
+    Recompensa com pesos por componente (treino populacional): weights['food'] e
+    weights['death'] multiplicam a recompensa do jogo ao comer e ao morrer, e
+    weights['shaping'] a parte modelada (shaped - reward). Com pesos 1, igual a shaped.
+    O componente vem do sinal da recompensa: a vitória (tabuleiro cheio) encerra a
+    partida com REWARD_FOOD e conta como comida, não como morte.
+    """
+    if reward > REWARD_MOVE:
+        base = reward * weights['food']
+    elif done and reward < 0:
+        base = reward * weights['death']
+    else:
+        base = reward
+    return base + weights['shaping'] * (shaped - reward)
@@ -0,0 +1,186 @@
+import contextlib
+import itertools
+import json
+import math
+import multiprocessing
+import os
+import random
+import sys
+import time
+from ..game import constants
+
+# Varredura de hiperparâmetros: cada job treina num processo novo do pool (spawn, um
+# job por processo) com as constantes sobrescritas antes de importar o jogo e o
+# treino, que copiam as constantes no import (`from constants import *`). Nada é
+# compartilhado entre jobs: cada um tem seu processo e seu diretório de saída.
+# Por isso este módulo só importa constants; o treino é importado dentro do job.
+
+def grid_space(space):
+    """Todas as combinações de {constante: [valores]}"""
+    for name, values in space.items():
+        if not isinstance(values, list):
+            raise ValueError(f"Busca em grade precisa de uma lista de valores para {name}")
+    names = list(space)
+    return [dict(zip(names, values)) for values in itertools.product(*(space[name] for name in names))]
+
+def random_space(space, samples, seed=None):
+    """
+    `samples` sorteios de {constante: especificação}. Uma lista sorteia um dos valores;
+    {'min': a, 'max': b} sorteia no intervalo (inteiros se a e b forem inteiros) e
+    com 'log': true sorteia em escala logarítmica (ex.: taxa de aprendizado).
+    """
+    rng = random.Random(seed)
+    return [{name: _sample(rng, name, spec) for name, spec in space.items()} for _ in range(samples)]
+
+def _sample(rng, name, spec):
+    if isinstance(spec, list):
+        return rng.choice(spec)
+    if isinstance(spec, dict) and 'min' in spec and 'max' in spec:
+        low, high = spec['min'], spec['max']
+        if spec.get('log'):
+            return math.exp(rng.uniform(math.log(low), math.log(high)))
+        if isinstance(low, int) and isinstance(high, int):
+            return rng.randint(low, high)
+        return rng.uniform(low, high)
+    raise ValueError(f"Especificação inválida para {name}: {spec!r}")
+
+def apply_overrides(overrides):
+    """
+    Sobrescreve constantes neste processo. Precisa vir antes de importar os módulos
+    do jogo e do treino: um módulo já importado ficaria com os valores antigos.
+    """
+    unknown = [name for name in overrides if not hasattr(constants, name)]
+    if unknown:
+        raise ValueError(f"Constantes desconhecidas: {', '.join(unknown)}")
+    package = constants.__name__.split('.')[0] + '.'
+    stale = sorted(name for name, module in list(sys.modules.items())
+                   if name.startswith(package) and module is not None and module is not constants
+                   and any(hasattr(module, key) for key in overrides))
+    if stale:
+        raise RuntimeError(f"Módulos importados antes das sobrescritas: {', '.join(stale)}")
+    for name, value in overrides.items():
+        setattr(constants, name, value)
+
+def run_job(job):
+    """
+    Um job (num processo do pool): entra no próprio diretório, aplica as sobrescritas,
+    treina e grava result.json; a saída do treino vai para train.log.
+    Erros viram o campo 'error' do resultado, sem derrubar a varredura.
+    """
+    output_dir = job['output_dir']
+    os.makedirs(output_dir, exist_ok=True)
+    result = {'job': job['index'], 'overrides': job['overrides'], 'output_dir': output_dir}
+    start = time.perf_counter()
+    with open(os.path.join(output_dir, 'train.log'), 'w') as log, contextlib.redirect_stdout(log):
+        try:
+            # Caminhos relativos do agente (models/...) ficam dentro do job
+            os.chdir(output_dir)
+            apply_overrides(job['overrides'])
+            result.update(_train_job(job))
+        except Exception as e:
+            result['error'] = f"{type(e).__name__}: {e}"
+    result['seconds'] = time.perf_counter() - start
+    with open(os.path.join(output_dir, 'result.json'), 'w') as file:
+        json.dump(result, file, indent=2)
+    return result
+
+def _train_job(job):
+    """Treino headless de max_games partidas (ou duration segundos) com as constantes do job"""
+    import numpy as np
+    import torch
+    from .training import Trainer
+
+    torch.set_num_threads(job['threads'])
+    seed = job['seed']
+    if seed is not None:
+        random.seed(seed)
+        torch.manual_seed(seed)
+    trainer = Trainer(headless=True, seed=seed, **job['trainer_options'])
+    agent = trainer.agent
+
+    steps = 0
+    start = time.perf_counter()
+    while agent.n_games < job['max_games']:
+        if job['duration'] is not None and time.perf_counter() - start >= job['duration']:
+            break
+        done, score = trainer.train_step()
+        steps += 1
+        if done:
+            trainer.end_game(score)
+    elapsed = time.perf_counter() - start
+
+    agent.save_model('models/model_final.pth')
+    window = agent.scores[-job['score_window']:]
+    return {
+        'games': agent.n_games,
+        'steps': steps,
+        'train_seconds': elapsed,
+        'steps_per_second': steps / elapsed if elapsed else 0.0,
+        'mean_score': float(np.mean(window)) if window else 0.0,
+        'record': agent.record,
+    }
+
+def rank_results(results):
+    """Melhor média das últimas partidas primeiro (desempate: record, tempo); jobs com erro no fim"""
+    finished = [result for result in results if 'error' not in result]
+    failed = [result for result in results if 'error' in result]
+    finished.sort(key=lambda result: (-result['mean_score'], -result['record'], result['seconds']))
+    failed.sort(key=lambda result: result['job'])
+    return finished + failed
+
+def format_summary(results):
+    """Tabela do ranking: média, record, partidas, tempo total e passos/s de cada job"""
+    lines = [f"{'Pos':>3} | {'Job':>3} | {'média':>6} | {'record':>6} | {'jogos':>5} | "
+             f"{'tempo (s)':>9} | {'passos/s':>8} | sobrescritas"]
+    lines.append("-" * 90)
+    for position, result in enumerate(results, 1):
+        overrides = ', '.join(f"{name}={value:.3g}" if isinstance(value, float) else f"{name}={value}"
+                              for name, value in result['overrides'].items())
+        if 'error' in result:
+            lines.append(f"{'-':>3} | {result['job']:>3} | erro: {result['error']} | {overrides}")
+            continue
+        lines.append(f"{position:>3} | {result['job']:>3} | {result['mean_score']:>6.2f} | {result['record']:>6} | "
+                     f"{result['games']:>5} | {result['seconds']:>9.1f} | {result['steps_per_second']:>8.0f} | {overrides}")
+    return '\n'.join(lines)
+
+def run_sweep(jobs, workers=constants.SWEEP_WORKERS, max_games=constants.SWEEP_GAMES, duration=None,
+              seed=0, output_dir=None, score_window=constants.SWEEP_SCORE_WINDOW, on_result=None,
+              **trainer_options):
+    """
+    Roda os jobs (lista de {constante: valor}, ex. de grid_space ou random_space) em
+    um pool de `workers` processos, cada job em output_dir/job_NNN. Todos usam a mesma
+    seed, para comparar só as constantes. on_result(result) é chamado a cada job
+    concluído. Grava summary.json e retorna os resultados em ordem de ranking.
+    """
+    if output_dir is None:
+        output_dir = os.path.join(constants.SWEEP_DIR, time.strftime('sweep_%Y%m%d_%H%M%S'))
+    output_dir = os.path.abspath(output_dir)
+    os.makedirs(output_dir, exist_ok=True)
+    workers = max(1, min(workers, len(jobs)))
+    threads = max(1, (os.cpu_count() or 1) // workers)  # Núcleos divididos entre os jobs simultâneos
+    specs = [{
+        'index': index,
+        'overrides': overrides,
+        'output_dir': os.path.join(output_dir, f'job_{index:03d}'),
+        'max_games': max_games,
+        'duration': duration,
+        'seed': seed,
+        'score_window': score_window,
+        'threads': threads,
+        'trainer_options': trainer_options,
+    } for index, overrides in enumerate(jobs)]
+
+    results = []
+    start = time.perf_counter()
+    # Um processo novo por job: as constantes sobrescritas morrem com ele
+    with multiprocessing.get_context('spawn').Pool(processes=workers, maxtasksperchild=1) as pool:
+        for result in pool.imap_unordered(run_job, specs):
+            results.append(result)
+            if on_result is not None:
+                on_result(result)
+    elapsed = time.perf_counter() - start
+
+    ranked = rank_results(results)
+    with open(os.path.join(output_dir, 'summary.json'), 'w') as file:
+        json.dump({'seconds': elapsed, 'workers': workers, 'results': ranked}, file, indent=2)
+    return ranked
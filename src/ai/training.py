@@ -1,19 +1,37 @@
 import matplotlib.pyplot as plt
 import numpy as np
 from .agent import Agent
-from ..game.snake_game import SnakeGame
-from ..game.game_state import GameState
+from .rewards import shape_reward, weighted_reward
+from ..game.headless_game import HeadlessSnakeGame
 from ..game.constants import *
 
 class Trainer:
-    def __init__(self):
-        self.agent = Agent()
-        self.game = SnakeGame()
-        self.game_state = GameState(self.game)
+    def __init__(self, headless=False, prioritized=PRIORITIZED_REPLAY, seed=None,
+                 target_network=TARGET_NETWORK, double_dqn=DOUBLE_DQN, target_tau=TARGET_TAU,
+                 safety_shield=SAFETY_SHIELD, short_memory=True, reward_weights=None,
+                 enclosed_penalty=ENCLOSED_PENALTY):
+        # headless=True: motor sem pygame e sem gráficos (servidores sem display)
+        # short_memory=False: sem atualização por transição, só lotes da memória (treino distribuído)
+        self.headless = headless
+        self.short_memory = short_memory
+        # reward_weights: {'food', 'death', 'shaping'} multiplicando cada componente (treino populacional)
+        self.reward_weights = reward_weights
+        # enclosed_penalty: PENALTY_ENCLOSED na recompensa modelada (flood fill a cada passo)
+        self.enclosed_penalty = enclosed_penalty
+        self.agent = Agent(prioritized=prioritized, target_network=target_network,
+                           double_dqn=double_dqn, target_tau=target_tau, safety_shield=safety_shield)
+        if headless:
+            self.game = HeadlessSnakeGame(seed=seed)
+        else:
+            from ..game.snake_game import SnakeGame
+            self.game = SnakeGame(seed=seed)
+        # Mesmo extrator do agente: estado, get_game_info e recompensas compartilham o cache por passo
+        self.game_state = self.agent.get_state_engine(self.game)
         
         # Para plotar gráficos
-        plt.ion()
-        self.fig, (self.ax1, self.ax2) = plt.subplots(1, 2, figsize=(12, 5))
+        if not headless:
+            plt.ion()
+            self.fig, (self.ax1, self.ax2) = plt.subplots(1, 2, figsize=(12, 5))
         
     def plot_training_progress(self, scores, mean_scores):
         """Plota o progresso do treinamento"""
@@ -43,6 +61,54 @@ class Trainer:
         plt.draw()
         plt.pause(0.1)
 
+    def train_step(self):
+        """Um passo de jogo com recompensa modelada, memória curta e armazenamento da transição"""
+        # Estado atual (vem do cache: é o state_new do passo anterior)
+        state_old = self.agent.get_state(self.game)
+        distance_old = self.game_state.get_distance_to_food()
+
+        # Obter movimento
+        final_move = self.agent.get_action(state_old, self.game)
+
+        # Executar movimento e obter novo estado
+        reward, done, score = self.game.play_step(final_move)
+        state_new = self.agent.get_state(self.game)
+        
+        # Sistema de recompensas expandido
+        shaped = reward if done else shape_reward(self.game, self.game_state, reward, distance_old,
+                                                       self.enclosed_penalty)
+        if self.reward_weights is None:
+            reward = shaped
+        else:
+            reward = weighted_reward(reward, shaped, done, self.reward_weights)
+
+        # Treinar memória curta
+        if self.short_memory:
+            self.agent.train_short_memory(state_old, final_move, reward, state_new, done)
+
+        # Lembrar
+        self.agent.remember(state_old, final_move, reward, state_new, done)
+
+        return done, score
+
+    def end_game(self, score, long_memory=True):
+        """
+        Fim de partida: reinicia o jogo, treina a memória longa e atualiza as estatísticas.
+        long_memory=False deixa as atualizações por conta de quem chama (treino distribuído).
+        """
+        self.game.reset()
+        self.agent.n_games += 1
+        if long_memory:
+            self.agent.train_long_memory()
+
+        if score > self.agent.record:
+            self.agent.record = score
+
+        self.agent.scores.append(score)
+        self.agent.total_score += score
+        mean_score = self.agent.total_score / self.agent.n_games
+        self.agent.mean_scores.append(mean_score)
+
     def train(self, max_games=1000, save_every=100, plot_every=10):
         """Função principal de treinamento"""
         print("Iniciando treinamento...")
@@ -59,73 +125,15 @@ class Trainer:
         print(f"Continuando do jogo {start_games} até {target_games}")
         
         while self.agent.n_games < target_games:
-            # Estado atual
-            state_old = self.agent.get_state(self.game)
-            distance_old = self.game_state.get_distance_to_food()
-
-            # Obter movimento
-            final_move = self.agent.get_action(state_old)
-
-            # Executar movimento e obter novo estado
-            reward, done, score = self.game.play_step(final_move)
-            state_new = self.agent.get_state(self.game)
-            
-            # Sistema de recompensas expandido
-            if not done:
-                # Recompensa baseada na distância
-                distance_new = self.game_state.get_distance_to_food()
-                if distance_new < distance_old:
-                    reward += REWARD_CLOSER_TO_FOOD
-                elif distance_new > distance_old:
-                    reward += REWARD_FARTHER_FROM_FOOD
-                
-                # Recompensas adicionais baseadas no estado expandido
-                game_info = self.game_state.get_game_info()
-                
-                # Penalizar alta densidade corporal (evitar armadilhas)
-                if game_info['body_density'] > 0.7:
-                    reward += PENALTY_HIGH_DENSITY
-                
-                # Recompensar boa eficiência de espaço livre
-                if game_info['free_space_ratio'] > 0.5:
-                    reward += REWARD_EFFICIENT_SPACE
-                
-                # Penalizar fortemente detecção de armadilhas
-                if game_info['trap_risk']:
-                    reward += PENALTY_TRAP_RISK
-                
-                # Penalizar bloqueio da cauda
-                if game_info['tail_blocking']:
-                    reward += PENALTY_TAIL_BLOCKING
-                
-                # Recompensa proporcional ao tamanho da cobra (incentiva crescimento)
-                size_bonus = len(self.game.snake) * REWARD_SIZE_BONUS
-                reward += size_bonus
-
-            # Treinar memória curta
-            self.agent.train_short_memory(state_old, final_move, reward, state_new, done)
-
-            # Lembrar
-            self.agent.remember(state_old, final_move, reward, state_new, done)
+            done, score = self.train_step()
 
             if done:
                 # Treinar memória longa, plotar resultado
-                self.game.reset()
-                self.agent.n_games += 1
-                self.agent.train_long_memory()
-
-                if score > self.agent.record:
-                    self.agent.record = score
-
+                self.end_game(score)
                 print(f'Jogo {self.agent.n_games}, Score: {score}, Record: {self.agent.record}, Epsilon: {self.agent.epsilon:.3f}')
 
-                self.agent.scores.append(score)
-                self.agent.total_score += score
-                mean_score = self.agent.total_score / self.agent.n_games
-                self.agent.mean_scores.append(mean_score)
-                
                 # Plotar a cada X jogos
-                if self.agent.n_games % plot_every == 0:
+                if not self.headless and self.agent.n_games % plot_every == 0:
                     self.plot_training_progress(self.agent.scores, self.agent.mean_scores)
                 
                 # Salvar modelo a cada X jogos
@@ -138,7 +146,11 @@ class Trainer:
         
         return self.agent
 
-def train_agent(max_games=1000):
+def train_agent(max_games=1000, headless=False, prioritized=PRIORITIZED_REPLAY,
+                target_network=TARGET_NETWORK, double_dqn=DOUBLE_DQN, target_tau=TARGET_TAU,
+                safety_shield=SAFETY_SHIELD, enclosed_penalty=ENCLOSED_PENALTY):
     """Função conveniente para iniciar o treinamento"""
-    trainer = Trainer()
+    trainer = Trainer(headless=headless, prioritized=prioritized, target_network=target_network,
+                      double_dqn=double_dqn, target_tau=target_tau, safety_shield=safety_shield,
+                      enclosed_penalty=enclosed_penalty)
     return trainer.train(max_games=max_games)
@@ -0,0 +1,255 @@
+import numpy as np
+from .headless_game import Direction, Point
+from .features import PAD, padded_grid, directional_features
+from .constants import *
+
+# Direções no sentido horário: índice 0 = RIGHT, 1 = DOWN, 2 = LEFT, 3 = UP
+CLOCK_WISE = [Direction.RIGHT, Direction.DOWN, Direction.LEFT, Direction.UP]
+DIRECTION_DX = np.array([1, 0, -1, 0], dtype=np.int32)
+DIRECTION_DY = np.array([0, 1, 0, -1], dtype=np.int32)
+# Ação relativa [frente, direita, esquerda] -> giro no sentido horário
+ACTION_TURN = np.array([0, 1, 3], dtype=np.int32)
+
+class BatchSnakeEnv:
+    """
+    N partidas da cobrinha avançando juntas em arrays NumPy.
+    Mesmas regras do HeadlessSnakeGame: step() aplica um vetor de ações
+    (0: frente, 1: direita, 2: esquerda) a todas as partidas de uma vez e
+    reinicia automaticamente as que terminaram.
+    """
+    def __init__(self, num_envs, width=GAME_WIDTH, height=GAME_HEIGHT, seed=None):
+        self.num_envs = num_envs
+        self.width = width
+        self.height = height
+        self.grid_width = width // GRID_SIZE
+        self.grid_height = height // GRID_SIZE
+        self.num_cells = self.grid_width * self.grid_height
+        self.rng = np.random.default_rng(seed)
+
+        # Corpo em buffer circular de células (y*W+x); +1 para a cabeça inserida antes do game over
+        self.capacity = self.num_cells + 1
+        self.body = np.zeros((num_envs, self.capacity), dtype=np.int32)
+        self.head_ptr = np.zeros(num_envs, dtype=np.int32)
+        self.lengths = np.zeros(num_envs, dtype=np.int32)
+
+        # Planos de ocupação: quantos segmentos da cobra estão em cada célula.
+        # occupancy é uma view do interior de uma grade com moldura de parede (features.py),
+        # usada pelos raios de get_state sem testar limites
+        self._grid = padded_grid(num_envs, self.grid_width, self.grid_height)
+        self.occupancy = self._grid[:, PAD:-PAD, PAD:-PAD]
+
+        self.heads = np.zeros((num_envs, 2), dtype=np.int32)  # (x, y)
+        self.previous_heads = np.zeros((num_envs, 2), dtype=np.int32)
+        self.has_previous = np.zeros(num_envs, dtype=bool)
+        self.directions = np.zeros(num_envs, dtype=np.int32)  # índice em CLOCK_WISE
+        self.food = np.zeros((num_envs, 2), dtype=np.int32)
+        self.scores = np.zeros(num_envs, dtype=np.int32)
+        self.frame_iteration = np.zeros(num_envs, dtype=np.int32)
+
+        self._env_ids = np.arange(num_envs)
+        self.reset()
+
+    def reset(self, mask=None):
+        """Reinicia todas as partidas, ou apenas as marcadas em mask"""
+        if mask is None:
+            mask = np.ones(self.num_envs, dtype=bool)
+        ids = np.flatnonzero(mask)
+        if len(ids) == 0:
+            return
+
+        hx, hy = self.grid_width // 2, self.grid_height // 2
+        self.heads[ids] = (hx, hy)
+        self.directions[ids] = 0  # RIGHT
+        self.has_previous[ids] = False
+        self.scores[ids] = 0
+        self.frame_iteration[ids] = 0
+
+        # Corpo inicial: cauda em 0, cabeça em 2
+        self.occupancy[ids] = 0
+        self.body[ids, 0] = hy * self.grid_width + hx - 2
+        self.body[ids, 1] = hy * self.grid_width + hx - 1
+        self.body[ids, 2] = hy * self.grid_width + hx
+        self.head_ptr[ids] = 2
+        self.lengths[ids] = 3
+        self.occupancy[ids, hy, hx - 2:hx + 1] = 1
+
+        self._place_food(ids)
+
+    def _place_food(self, ids):
+        """Sorteia a comida entre as células livres de cada partida; retorna quais tabuleiros estão cheios"""
+        free = self.occupancy[ids].reshape(len(ids), -1) == 0
+        scores = self.rng.random(free.shape)
+        scores[~free] = -1.0
+        cells = scores.argmax(axis=1)
+        full = ~free.any(axis=1)
+        placed = ids[~full]
+        self.food[placed, 0] = cells[~full] % self.grid_width
+        self.food[placed, 1] = cells[~full] // self.grid_width
+        return full
+
+    def step(self, actions):
+        """
+        Avança todas as partidas um passo.
+        actions: vetor (N,) de ações relativas ou matriz one-hot (N, 3).
+        Retorna (rewards, dones, scores); scores são os finais das partidas que terminaram.
+        """
+        actions = np.asarray(actions)
+        if actions.ndim == 2:
+            actions = actions.argmax(axis=1)
+        ids = self._env_ids
+
+        self.frame_iteration += 1
+        self.directions = (self.directions + ACTION_TURN[actions]) % 4
+        self.previous_heads[:] = self.heads
+        self.has_previous[:] = True
+
+        # 1. Mover a cabeça e inseri-la no buffer circular
+        nx = self.heads[:, 0] + DIRECTION_DX[self.directions]
+        ny = self.heads[:, 1] + DIRECTION_DY[self.directions]
+        out_of_bounds = (nx < 0) | (nx >= self.grid_width) | (ny < 0) | (ny >= self.grid_height)
+        cx = np.clip(nx, 0, self.grid_width - 1)
+        cy = np.clip(ny, 0, self.grid_height - 1)
+        cells = cy * self.grid_width + cx
+
+        self.heads[:, 0] = nx
+        self.heads[:, 1] = ny
+        self.head_ptr = (self.head_ptr + 1) % self.capacity
+        self.body[ids, self.head_ptr] = cells
+        self.lengths += 1
+        inside = ~out_of_bounds
+        self.occupancy[ids[inside], cy[inside], cx[inside]] += 1
+
+        # 2. Verificar se o jogo acabou
+        collision = out_of_bounds | (self.occupancy[ids, cy, cx] > 1)
+        dead = collision | (self.frame_iteration > 100 * self.lengths)
+
+        # 3. Colocar nova comida ou apenas mover
+        ate = ~dead & (nx == self.food[:, 0]) & (ny == self.food[:, 1])
+        rewards = np.where(dead, REWARD_DEATH, np.where(ate, REWARD_FOOD, 0)).astype(np.float32)
+        self.scores += ate
+
+        moved = ids[~dead & ~ate]
+        tail_ptr = (self.head_ptr[moved] - self.lengths[moved] + 1) % self.capacity
+        tail_cells = self.body[moved, tail_ptr]
+        self.occupancy[moved, tail_cells // self.grid_width, tail_cells % self.grid_width] -= 1
+        self.lengths[moved] -= 1
+
+        dones = dead.copy()
+        eaten = ids[ate]
+        if len(eaten):
+            # Tabuleiro cheio: não há onde colocar comida, a partida termina
+            dones[eaten] |= self._place_food(eaten)
+
+        # 4. Reiniciar automaticamente as partidas encerradas
+        final_scores = self.scores.copy()
+        self.reset(dones)
+        return rewards, dones, final_scores
+
+    def tail_cells(self):
+        """Célula da cauda (y*W+x) de cada partida"""
+        tail_ptr = (self.head_ptr - self.lengths + 1) % self.capacity
+        return self.body[self._env_ids, tail_ptr]
+
+    def get_snake(self, env_id):
+        """Corpo da partida env_id como lista de Points (cabeça primeiro)"""
+        ptrs = (self.head_ptr[env_id] - np.arange(self.lengths[env_id])) % self.capacity
+        cells = self.body[env_id, ptrs]
+        head = Point(int(self.heads[env_id, 0]), int(self.heads[env_id, 1]))
+        return [head] + [Point(int(c % self.grid_width), int(c // self.grid_width)) for c in cells[1:]]
+
+    def get_state(self):
+        """
+        Versão em lote de GameState.get_state: matriz (N, 28) float32
+        com as mesmas características, na mesma ordem.
+        """
+        hx, hy = self.heads[:, 0], self.heads[:, 1]
+        fx, fy = self.food[:, 0], self.food[:, 1]
+        directions = self.directions
+
+        # Raios nas 4 direções (esquerda, direita, cima, baixo) sobre a grade com moldura
+        densities, free_counts, blocked = directional_features(self._grid, self.heads)
+
+        # === PERIGOS IMEDIATOS (3) ===
+        # Colisão nas 4 vizinhas, reordenadas no sentido horário [R, D, L, U]
+        collisions = blocked[:, [1, 3, 0, 2]]
+        ids = self._env_ids
+        danger_straight = collisions[ids, directions]
+        danger_right = collisions[ids, (directions + 1) % 4]
+        danger_left = collisions[ids, (directions + 3) % 4]
+
+        # === TAMANHO DA COBRA NORMALIZADO (1) ===
+        snake_length_normalized = self.lengths / (GRID_WIDTH * GRID_HEIGHT)
+
+        # === DENSIDADE CORPORAL LOCAL (4) e ESPAÇOS LIVRES (4) ===
+        # Ordem: esquerda, direita, cima, baixo
+        max_possible = max(GRID_WIDTH, GRID_HEIGHT)
+        free_spaces = free_counts / max_possible
+
+        # === DETECÇÃO DE ARMADILHAS (2) ===
+        tail = self.tail_cells()
+        tx, ty = tail % self.grid_width, tail // self.grid_width
+        tail_blocking_escape = ((self.lengths >= 4) &
+                                (np.abs(hx - tx) + np.abs(hy - ty) <= 3) &
+                                (((hx <= tx) & (tx <= fx)) | ((fx <= tx) & (tx <= hx))) &
+                                (((hy <= ty) & (ty <= fy)) | ((fy <= ty) & (ty <= hy))))
+
+        free_adjacent = 4 - collisions.sum(axis=1)
+        total_free_space = np.zeros(self.num_envs)
+        for free in free_spaces.T:
+            total_free_space = total_free_space + free * 10
+        potential_trap = (free_adjacent <= 1) | ((free_adjacent == 2) & (total_free_space < self.lengths * 0.5))
+
+        # === INFORMAÇÕES DE MOVIMENTO (2) ===
+        current_distance = np.abs(hx - fx) + np.abs(hy - fy)
+        distance_to_food = current_distance / (GRID_WIDTH + GRID_HEIGHT)
+
+        px, py = self.previous_heads[:, 0], self.previous_heads[:, 1]
+        previous_distance = np.abs(px - fx) + np.abs(py - fy)
+        movement_efficiency = np.where(current_distance < previous_distance, 1.0,
+                              np.where(current_distance > previous_distance, 0.0, 0.5))
+        movement_efficiency = np.where(previous_distance == 0, 1.0, movement_efficiency)
+        movement_efficiency = np.where(self.has_previous, movement_efficiency, 0.5)
+
+        state = np.stack([
+            # Perigos imediatos (3)
+            danger_straight,
+            danger_right,
+            danger_left,
+
+            # Direção atual (4): esquerda, direita, cima, baixo
+            directions == 2,
+            directions == 0,
+            directions == 3,
+            directions == 1,
+
+            # Localização da comida (4)
+            fx < hx,
+            fx > hx,
+            fy < hy,
+            fy > hy,
+
+            # Tamanho da cobra (1)
+            snake_length_normalized,
+
+            # Densidade corporal local (4)
+            *densities.T,
+
+            # Distâncias até bordas (4)
+            hx / GRID_WIDTH,
+            (GRID_WIDTH - 1 - hx) / GRID_WIDTH,
+            hy / GRID_HEIGHT,
+            (GRID_HEIGHT - 1 - hy) / GRID_HEIGHT,
+
+            # Espaços livres (4)
+            *free_spaces.T,
+
+            # Detecção de armadilhas (2)
+            tail_blocking_escape,
+            potential_trap,
+
+            # Informações de movimento (2)
+            distance_to_food,
+            movement_efficiency
+        ], axis=1)
+
+        return state.astype(np.float32)
@@ -1,5 +1,4 @@
-# Constantes do jogo
-import pygame
+# Constantes do jogo (sem dependência do pygame, para o modo headless)
 
 # Configurações da tela
 WINDOW_WIDTH = 1400
@@ -64,12 +63,70 @@ GAMMA = 0.9  # Fator de desconto
 EPSILON_START = 1.0
 EPSILON_END = 0.01
 EPSILON_DECAY = 0.995
+EPSILON_DECAY_GAMES = 1000  # Agent.get_action: epsilon decai com exp(-n_games / EPSILON_DECAY_GAMES)
 MEMORY_SIZE = 10000
 BATCH_SIZE = 32
-TARGET_UPDATE = 100
+TARGET_UPDATE = 100  # Atualizações do QTrainer entre sincronizações da rede alvo
 
-# Configurações de fonte
-pygame.font.init()
+# Rede alvo (QTrainer): desligada = bootstrap da própria rede online, como antes
+TARGET_NETWORK = False
+TARGET_TAU = None  # None: cópia a cada TARGET_UPDATE; ex. 0.005: média de Polyak a cada atualização
+DOUBLE_DQN = False  # Rede online escolhe a ação, rede alvo avalia (implica rede alvo)
+
+# Inferência (Agent.get_action): DQN traçado com torch.jit.trace em vez do módulo Python
+TRACED_POLICY = False
+
+# Treino ator/aprendiz (actor_learner.py): threads de atores, atualizações do aprendiz
+# entre publicações dos pesos, transições por bloco enviado e blocos na fila
+ACTORS = 2
+WEIGHT_SYNC_UPDATES = 50
+ACTOR_FLUSH = 16
+TRANSITION_QUEUE_SIZE = 256
+
+# Atores em processos (parallel_actors.py): workers e transições por bloco enviado
+# (os pesos vão por memória compartilhada a cada WEIGHT_SYNC_UPDATES atualizações)
+PARALLEL_WORKERS = 2
+WORKER_FLUSH = 64
+
+# Treino distribuído (distributed.py, torch.distributed com gloo): réplicas locais por
+# padrão e passos de jogo de cada rank entre duas atualizações com média dos gradientes
+DIST_RANKS = 2
+DIST_STEPS_PER_UPDATE = 4
+
+# Varredura de hiperparâmetros (sweep.py): processos simultâneos, partidas por job,
+# partidas finais que definem a média do ranking e diretório das saídas
+SWEEP_WORKERS = 2
+SWEEP_GAMES = 200
+SWEEP_SCORE_WINDOW = 25
+SWEEP_DIR = 'sweeps'
+
+# Treino populacional (pbt.py): agentes em processos, partidas de cada um entre duas
+# rodadas de exploit/explore, fração da população copiada dos melhores (exploit) e
+# fatores sorteados para perturbar os hiperparâmetros copiados (explore)
+PBT_POPULATION = 4
+PBT_INTERVAL = 25
+PBT_EXPLOIT_FRACTION = 0.25
+PBT_PERTURB_FACTORS = (0.8, 1.2)
+
+# Escudo de segurança (Agent.get_action): descarta jogadas cuja área alcançável
+# (flood fill) é menor que a cobra, antes do argmax e da escolha aleatória
+SAFETY_SHIELD = False
+
+# Busca com o DQN no modo AI_PLAY (planner.py): camadas, nós mantidos por camada e
+# tempo máximo por jogada (segundos); sem tempo, joga a ação gulosa do DQN
+LOOKAHEAD_PLANNER = False
+PLANNER_DEPTH = 2  # Mais camadas custam mais e, com o modelo salvo, não melhoraram o score (benchmark_training.py)
+PLANNER_BEAM_WIDTH = 8
+PLANNER_TIME_BUDGET = 0.015
+
+# Replay priorizado (PrioritizedReplayBuffer)
+PRIORITIZED_REPLAY = False  # False: amostragem uniforme
+PER_ALPHA = 0.6  # 0 = uniforme, 1 = totalmente proporcional ao erro TD
+PER_BETA_START = 0.4  # Correção de importance sampling inicial (cresce até 1)
+PER_BETA_INCREMENT = 0.001  # Por lote amostrado
+PER_EPSILON = 0.01  # Prioridade mínima, para nenhuma transição sumir
+
+# Configurações de fonte (o pygame.init() da interface inicializa o módulo de fontes)
 FONT_SIZE_SMALL = 16
 FONT_SIZE_MEDIUM = 20
 FONT_SIZE_LARGE = 24
@@ -89,3 +146,10 @@ REWARD_SIZE_BONUS = 0.5
 PENALTY_HIGH_DENSITY = -3
 PENALTY_TRAP_RISK = -8
 PENALTY_TAIL_BLOCKING = -4
+PENALTY_ENCLOSED = -10  # Nenhuma jogada alcança tantas células quanto o tamanho da cobra (flood fill)
+ENCLOSED_PENALTY = False  # Liga PENALTY_ENCLOSED na recompensa modelada; desligada = recompensas de antes
+
+# Flood fill da área alcançável (flood_fill.py): células além do tamanho da cobra
+# que cada flood conta antes de parar; a sobra permite reaproveitar o resultado nos
+# passos seguintes sem novo flood
+FLOOD_FILL_MARGIN = 8
@@ -0,0 +1,65 @@
+import numpy as np
+
+# Características direcionais (densidade corporal e espaços livres) em arrays NumPy.
+# O tabuleiro fica dentro de uma grade com PAD células de parede em volta: assim um
+# raio nunca sai da grade, e "borda" e "corpo" viram o mesmo teste (célula != 0).
+
+PAD = 3           # >= alcance da densidade corporal (3 células)
+WALL = 255        # valor das células de parede; corpo usa a contagem de segmentos (1, 2, ...)
+DENSITY_DISTANCE = 3
+
+# Ordem das features do estado: esquerda, direita, cima, baixo
+RAY_DX = np.array([-1, 1, 0, 0], dtype=np.int32)
+RAY_DY = np.array([0, 0, -1, 1], dtype=np.int32)
+
+def padded_grid(num_boards, grid_width, grid_height, pad=PAD):
+    """Grade (N, H + 2*pad, W + 2*pad) com o interior vazio e a moldura de parede"""
+    grid = np.full((num_boards, grid_height + 2 * pad, grid_width + 2 * pad), WALL, dtype=np.uint8)
+    grid[:, pad:-pad, pad:-pad] = 0
+    return grid
+
+def game_grid(game, pad=PAD):
+    """Grade com moldura de um jogo (HeadlessSnakeGame/SnakeGame), montada a partir do corpo"""
+    width, height = game.grid_width, game.grid_height
+    grid = padded_grid(1, width, height, pad)
+    body = np.array(game.snake, dtype=np.int64).reshape(-1, 2)
+    inside = ((body[:, 0] >= 0) & (body[:, 0] < width) &
+              (body[:, 1] >= 0) & (body[:, 1] < height))
+    np.add.at(grid[0], (body[inside, 1] + pad, body[inside, 0] + pad), 1)
+    return grid
+
+def cast_rays(grid, heads, pad=PAD):
+    """
+    Conteúdo das células em linha reta a partir de cada cabeça, nas 4 direções.
+    grid: (N, Hp, Wp) com moldura; heads: (N, 2) com (x, y) do tabuleiro.
+    Retorna (N, 4, L): raio k começa na célula vizinha da cabeça; posições além
+    da grade repetem a parede da moldura.
+    """
+    num_boards, padded_height, padded_width = grid.shape
+    length = max(padded_width, padded_height) - 2 * pad + 1
+    steps = np.arange(1, length + 1, dtype=np.int32)
+
+    xs = heads[:, 0, None, None] + pad + RAY_DX[None, :, None] * steps
+    ys = heads[:, 1, None, None] + pad + RAY_DY[None, :, None] * steps
+    np.clip(xs, 0, padded_width - 1, out=xs)
+    np.clip(ys, 0, padded_height - 1, out=ys)
+    boards = np.arange(num_boards)[:, None, None]
+    return grid[boards, ys, xs]
+
+def directional_features(grid, heads, pad=PAD, max_distance=DENSITY_DISTANCE):
+    """
+    Densidades corporais e espaços livres nas 4 direções para N tabuleiros.
+    Mesmos valores de GameState._count_body_segments_in_direction(head, d, 3) e
+    GameState._count_free_spaces_in_direction(head, d), na ordem [esq, dir, cima, baixo].
+    Retorna (densities, free_counts, blocked):
+    - densities: (N, 4) segmentos nas max_distance células seguintes / max_distance
+    - free_counts: (N, 4) células livres até o primeiro obstáculo (sem normalizar)
+    - blocked: (N, 4) célula vizinha ocupada ou fora do tabuleiro
+    """
+    rays = cast_rays(grid, heads, pad)
+    obstacle = rays != 0
+    # Sempre há parede dentro do raio, então argmax acha o primeiro obstáculo
+    free_counts = obstacle.argmax(axis=2)
+    near = rays[:, :, :max_distance]
+    densities = ((near != 0) & (near != WALL)).sum(axis=2) / max_distance
+    return densities, free_counts, obstacle[:, :, 0]
@@ -0,0 +1,188 @@
+from .headless_game import CLOCK_WISE, CLOCK_WISE_DELTAS, Point
+from .constants import FLOOD_FILL_MARGIN
+
+# Área alcançável (flood fill) em bitsets: o tabuleiro inteiro é um int do Python,
+# bit y*stride + x, com stride = largura + 1. A coluna extra (x = largura) nunca
+# está livre, então os deslocamentos de 1 bit não passam de uma linha para a outra.
+
+# Giro na ordem horária de cada ação relativa ([frente, direita, esquerda])
+ACTION_TURNS = (0, 1, 3)
+
+def _ring_components(ring):
+    """Componentes 4-conexas do anel 3x3 (bits N, NE, E, SE, S, SW, W, NW) que tocam o centro"""
+    if ring == 0xFF:
+        return 1
+    components = 0
+    for i in range(8):
+        # Início de uma sequência de células livres consecutivas no anel
+        if ring >> i & 1 and not ring >> ((i - 1) % 8) & 1:
+            j = i
+            touches_center = False
+            while ring >> (j % 8) & 1:
+                touches_center |= (j % 2 == 0)  # N, E, S, W são vizinhas 4-conexas do centro
+                j += 1
+            components += touches_center
+    return components
+
+# Ponto simples: remover a célula não separa a região livre em duas (T4 == 1)
+SIMPLE_POINT = [_ring_components(ring) == 1 for ring in range(256)]
+
+def free_mask(game):
+    """
+    Bitset das células livres do tabuleiro, com a cauda livre: ela sai do lugar no
+    próximo passo, então vale para células alcançadas depois da primeira jogada.
+    A primeira jogada para a cauda é colisão (play_step põe a cabeça antes de tirar a cauda).
+    """
+    stride = game.grid_width + 1
+    full_row = (1 << game.grid_width) - 1
+    free = 0
+    for y, row in enumerate(game.row_bits):
+        free |= (full_row & ~row) << (y * stride)
+    tail = game.snake[-1]
+    if 0 <= tail.x < game.grid_width and 0 <= tail.y < game.grid_height:
+        free |= 1 << (tail.y * stride + tail.x)
+    return free
+
+def flood_fill(free, start, stride, limit):
+    """
+    Região 4-conexa de células livres a partir do bit start, crescendo uma camada por iteração.
+    Para assim que a área chega a limit. Retorna (área, bitset alcançado): a área é exata
+    se for menor que limit; senão é só um limite inferior.
+    """
+    reach = 1 << start
+    area = 1
+    while area < limit:
+        grown = (reach | reach << 1 | reach >> 1 | reach << stride | reach >> stride) & free
+        if grown == reach:
+            break
+        reach = grown
+        area = reach.bit_count()
+    return area, reach
+
+def is_simple_point(free, cell, stride):
+    """Se remover a célula livre `cell` preserva a conectividade da região (teste local no anel 3x3)"""
+    ring = 0
+    for i, offset in enumerate((-stride, -stride + 1, 1, stride + 1, stride, stride - 1, -1, -stride - 1)):
+        neighbor = cell + offset
+        if neighbor >= 0 and free >> neighbor & 1:
+            ring |= 1 << i
+    return SIMPLE_POINT[ring]
+
+class ReachableArea:
+    """
+    Área alcançável para cada uma das 3 jogadas ([frente, direita, esquerda]),
+    limitada ao tamanho da cobra: uma jogada com área menor que a cobra entra num bolsão.
+
+    Custo limitado e reaproveitado:
+    - cada flood fill para ao passar de len(snake) + FLOOD_FILL_MARGIN células;
+    - jogadas que caem na região de um flood já feito no passo herdam o resultado;
+    - no passo seguinte, se a cobra não comeu e a cabeça entrou num ponto simples,
+      as regiões não se partem: as novas jogadas herdam a área da anterior menos 1
+      sem novo flood, enquanto a margem cobrir o tamanho da cobra.
+    Cache por passo com a chave (game.epoch, game.steps), como o IncrementalGameState.
+    """
+    def __init__(self, game, margin=FLOOD_FILL_MARGIN):
+        self.game = game
+        self.margin = margin
+        self._key = None
+        self._areas = None
+        # Passo anterior: (chave, bitset livre, tamanho da cobra, {célula: limite inferior da área})
+        self._previous = None
+        # Contadores para testes e benchmarks
+        self.floods = 0
+        self.reused = 0
+
+    def invalidate(self):
+        """Descarta o cache e o passo anterior (jogo alterado por fora de play_step/reset/set_snake)"""
+        self._key = None
+        self._previous = None
+
+    def get_areas(self):
+        """(frente, direita, esquerda): células alcançáveis após cada jogada, no máximo len(snake)"""
+        game = self.game
+        key = (game.epoch, game.steps)
+        if key != self._key:
+            self._areas = self._compute(key)
+            self._key = key
+        return self._areas
+
+    def _compute(self, key):
+        game = self.game
+        width, height = game.grid_width, game.grid_height
+        stride = width + 1
+        free = free_mask(game)
+        length = len(game.snake)
+        head = game.head
+        head_cell = head.y * stride + head.x
+        tail = game.snake[-1]
+        tail_cell = tail.y * stride + tail.x
+
+        # Limite inferior herdado do passo anterior (ver docstring da classe)
+        inherited = None
+        previous = self._previous
+        if previous is not None:
+            previous_key, previous_free, previous_length, bounds = previous
+            if (previous_key == (key[0], key[1] - 1) and previous_length == length and
+                    head_cell in bounds and bounds[head_cell] - 1 >= length and
+                    is_simple_point(previous_free, head_cell, stride)):
+                inherited = bounds[head_cell] - 1
+
+        idx = CLOCK_WISE.index(game.direction)
+        areas = []
+        bounds = {}
+        regions = []
+        for turn in ACTION_TURNS:
+            dx, dy = CLOCK_WISE_DELTAS[(idx + turn) % 4]
+            x, y = head.x + dx, head.y + dy
+            cell = y * stride + x
+            if not (0 <= x < width and 0 <= y < height) or not free >> cell & 1 or cell == tail_cell:
+                # Parede, corpo ou a cauda (colisão nesta jogada, livre só a partir da próxima)
+                areas.append(0)
+                continue
+
+            if inherited is not None and previous_free >> cell & 1:
+                # Livre nos dois passos e vizinha da cabeça: mesma região da jogada anterior
+                bound = inherited
+                self.reused += 1
+            else:
+                for reach, region_bound in regions:
+                    if reach >> cell & 1:
+                        bound = region_bound
+                        self.reused += 1
+                        break
+                else:
+                    bound, reach = flood_fill(free, cell, stride, length + self.margin)
+                    regions.append((reach, bound))
+                    self.floods += 1
+            bounds[cell] = bound
+            areas.append(min(bound, length))
+
+        self._previous = (key, free, length, bounds)
+        return tuple(areas)
+
+def safe_actions(game, reachable):
+    """
+    Escudo de segurança: jogadas ([frente, direita, esquerda]) que alcançam ao menos
+    len(snake) células (reachable: ReachableArea do jogo). Jogadas em que a próxima
+    cabeça bate (game.is_collision) nunca entram. Sem nenhuma segura, ficam as de
+    maior área entre as que não batem; None quando não há o que descartar.
+    """
+    idx = CLOCK_WISE.index(game.direction)
+    head = game.head
+    alive = []
+    for action, turn in enumerate(ACTION_TURNS):
+        dx, dy = CLOCK_WISE_DELTAS[(idx + turn) % 4]
+        if not game.is_collision(Point(head.x + dx, head.y + dy)):
+            alive.append(action)
+    if not alive:
+        return None  # Todas as jogadas morrem no próximo passo
+
+    areas = reachable.get_areas()
+    length = len(game.snake)
+    allowed = [action for action in alive if areas[action] >= length]
+    if not allowed:
+        best = max(areas[action] for action in alive)
+        allowed = [action for action in alive if areas[action] == best]
+    if len(allowed) == len(ACTION_TURNS):
+        return None
+    return allowed
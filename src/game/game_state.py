@@ -1,11 +1,20 @@
 import numpy as np
 from collections import namedtuple
-from .snake_game import SnakeGame, Direction, Point
+from .headless_game import Direction, Point, CLOCK_WISE, CLOCK_WISE_DELTAS
+from .flood_fill import ReachableArea
 from .constants import GRID_WIDTH, GRID_HEIGHT
 
+# (dx, dy) -> índice da direção nas tabelas do motor ([R, D, L, U])
+DELTA_INDEX = {delta: i for i, delta in enumerate(CLOCK_WISE_DELTAS)}
+
 class GameState:
     def __init__(self, game):
         self.game = game
+        # Tabelas de vizinhos e raios do motor, quando o tabuleiro é o configurado (GRID_WIDTH x GRID_HEIGHT)
+        tables = getattr(game, 'tables', None)
+        self._tables = tables if tables is not None and (tables.width, tables.height) == (GRID_WIDTH, GRID_HEIGHT) else None
+        # Área alcançável por jogada (flood fill com custo limitado e cache entre passos)
+        self.reachable = ReachableArea(game)
         
     def get_state(self):
         """
@@ -22,12 +31,6 @@ class GameState:
         - Informações de movimento (2)
         """
         head = self.game.head
-        
-        # Pontos adjacentes
-        point_l = Point(head.x - 1, head.y)
-        point_r = Point(head.x + 1, head.y)
-        point_u = Point(head.x, head.y - 1)
-        point_d = Point(head.x, head.y + 1)
 
         # Direções atuais
         dir_l = self.game.direction == Direction.LEFT
@@ -36,20 +39,12 @@ class GameState:
         dir_d = self.game.direction == Direction.DOWN
 
         # === PERIGOS IMEDIATOS (3) ===
-        danger_straight = (dir_r and self.game.is_collision(point_r)) or \
-                         (dir_l and self.game.is_collision(point_l)) or \
-                         (dir_u and self.game.is_collision(point_u)) or \
-                         (dir_d and self.game.is_collision(point_d))
-
-        danger_right = (dir_u and self.game.is_collision(point_r)) or \
-                      (dir_d and self.game.is_collision(point_l)) or \
-                      (dir_l and self.game.is_collision(point_u)) or \
-                      (dir_r and self.game.is_collision(point_d))
-
-        danger_left = (dir_d and self.game.is_collision(point_r)) or \
-                     (dir_u and self.game.is_collision(point_l)) or \
-                     (dir_r and self.game.is_collision(point_u)) or \
-                     (dir_l and self.game.is_collision(point_d))
+        # Colisão nas 4 vizinhas [R, D, L, U], relativas à direção atual
+        collisions = self._neighbor_collisions(head)
+        idx = CLOCK_WISE.index(self.game.direction)
+        danger_straight = collisions[idx]
+        danger_right = collisions[(idx + 1) % 4]
+        danger_left = collisions[(idx - 1) % 4]
 
         # === DIREÇÃO ATUAL (4) ===
         direction_left = dir_l
@@ -149,8 +144,34 @@ class GameState:
 
         return np.array(state, dtype=np.float32)
     
+    def _cell(self, point):
+        """Célula (y*W+x) do ponto para usar as tabelas do motor, ou None (outro tabuleiro ou fora dele)"""
+        if self._tables is not None and 0 <= point.x < GRID_WIDTH and 0 <= point.y < GRID_HEIGHT:
+            return point.y * GRID_WIDTH + point.x
+        return None
+
+    def _neighbor_collisions(self, point):
+        """is_collision nas 4 vizinhas do ponto, na ordem horária [R, D, L, U]"""
+        cell = self._cell(point)
+        if cell is None:
+            return [self.game.is_collision(Point(point.x + dx, point.y + dy)) for dx, dy in CLOCK_WISE_DELTAS]
+        occupancy = self.game._occupancy
+        head_cell = self.game.head_cell
+        # A cabeça só colide se dividir a célula com outro segmento (mesma regra de is_collision)
+        return [neighbor < 0 or occupancy[neighbor] > (neighbor == head_cell)
+                for neighbor in self._tables.neighbors[cell]]
+
     def _count_body_segments_in_direction(self, start_point, direction, max_distance):
         """Conta quantos segmentos do corpo estão em uma direção específica"""
+        cell = self._cell(start_point)
+        if cell is not None:
+            # Raio pré-calculado até a borda: só as max_distance primeiras células
+            occupancy = self.game._occupancy
+            head_cell = self.game.head_cell
+            ray = self._tables.rays[cell][DELTA_INDEX[direction]]
+            count = sum(1 for c in ray[:max_distance] if occupancy[c] > (c == head_cell))
+            return count / max_distance
+
         count = 0
         dx, dy = direction
         
@@ -159,8 +180,8 @@ class GameState:
             
             # Verificar se está dentro dos limites
             if (0 <= check_point.x < GRID_WIDTH and 0 <= check_point.y < GRID_HEIGHT):
-                # Verificar se há um segmento do corpo nesta posição
-                if check_point in self.game.snake[1:]:  # Excluir a cabeça
+                # Verificar se há um segmento do corpo nesta posição (grade de ocupação, exclui a cabeça)
+                if self.game.is_collision(check_point):
                     count += 1
             else:
                 break
@@ -170,15 +191,24 @@ class GameState:
     def _count_free_spaces_in_direction(self, start_point, direction):
         """Conta quantos espaços livres existem em uma direção até encontrar um obstáculo"""
         count = 0
-        dx, dy = direction
-        
-        current_point = Point(start_point.x + dx, start_point.y + dy)
-        
-        while (0 <= current_point.x < GRID_WIDTH and 
-               0 <= current_point.y < GRID_HEIGHT and
-               not self.game.is_collision(current_point)):
-            count += 1
-            current_point = Point(current_point.x + dx, current_point.y + dy)
+        cell = self._cell(start_point)
+        if cell is not None:
+            # Raio pré-calculado até a borda: conta até a primeira célula ocupada
+            occupancy = self.game._occupancy
+            head_cell = self.game.head_cell
+            for c in self._tables.rays[cell][DELTA_INDEX[direction]]:
+                if occupancy[c] > (c == head_cell):
+                    break
+                count += 1
+        else:
+            dx, dy = direction
+            current_point = Point(start_point.x + dx, start_point.y + dy)
+
+            while (0 <= current_point.x < GRID_WIDTH and
+                   0 <= current_point.y < GRID_HEIGHT and
+                   not self.game.is_collision(current_point)):
+                count += 1
+                current_point = Point(current_point.x + dx, current_point.y + dy)
         
         # Normalizar pelo tamanho máximo possível na direção
         max_possible = max(GRID_WIDTH, GRID_HEIGHT)
@@ -212,19 +242,16 @@ class GameState:
         head = self.game.head
         
         # Contar espaços livres ao redor da cabeça
-        free_adjacent = 0
-        adjacent_points = [
-            Point(head.x - 1, head.y),
-            Point(head.x + 1, head.y),
-            Point(head.x, head.y - 1),
-            Point(head.x, head.y + 1)
-        ]
-        
-        for point in adjacent_points:
-            if (0 <= point.x < GRID_WIDTH and 
-                0 <= point.y < GRID_HEIGHT and
-                not self.game.is_collision(point)):
-                free_adjacent += 1
+        if self._cell(head) is not None:
+            free_adjacent = 4 - sum(self._neighbor_collisions(head))
+        else:
+            free_adjacent = 0
+            for dx, dy in CLOCK_WISE_DELTAS:
+                point = Point(head.x + dx, head.y + dy)
+                if (0 <= point.x < GRID_WIDTH and
+                    0 <= point.y < GRID_HEIGHT and
+                    not self.game.is_collision(point)):
+                    free_adjacent += 1
         
         # Se há apenas 1 ou 0 espaços livres, é uma armadilha
         if free_adjacent <= 1:
@@ -278,9 +305,12 @@ class GameState:
         """Verifica se a cobrinha está se movendo em direção à comida"""
         return new_distance < old_distance
     
-    def get_game_info(self):
-        """Retorna informações úteis sobre o estado do jogo"""
-        return {
+    def get_game_info(self, reachable=False):
+        """
+        Retorna informações úteis sobre o estado do jogo.
+        reachable=True inclui get_reachable_info() (áreas por jogada e bolsão, com flood fill).
+        """
+        info = {
             'score': self.game.score,
             'snake_length': len(self.game.snake),
             'food_position': self.game.food,
@@ -302,5 +332,16 @@ class GameState:
                 self._count_free_spaces_in_direction(self.game.head, (0, 1))
             ]) / 4,
             'trap_risk': self._detect_potential_trap(),
-            'tail_blocking': self._is_tail_blocking_escape()
+            'tail_blocking': self._is_tail_blocking_escape(),
+        }
+        if reachable:
+            info.update(self.get_reachable_info())
+        return info
+
+    def get_reachable_info(self):
+        """Áreas alcançáveis de [frente, direita, esquerda] e se todas são menores que a cobra"""
+        areas = self.reachable.get_areas()
+        return {
+            'reachable_areas': areas,
+            'enclosed': max(areas) < len(self.game.snake)
         }
@@ -0,0 +1,93 @@
+import numpy as np
+from itertools import chain
+from .constants import GRID_WIDTH, GRID_HEIGHT
+
+# Canais da imagem do tabuleiro (C, H, W)
+BODY_CHANNEL = 0   # 1 onde há segmento do corpo (sem a cabeça)
+HEAD_CHANNEL = 1   # 1 na cabeça
+FOOD_CHANNEL = 2   # 1 na comida
+AGE_CHANNEL = 3    # opcional: 1.0 na cabeça caindo até 1/len na cauda (quanto falta para a célula liberar)
+
+# Até este tamanho o canal de idade é preenchido num laço Python (mais barato que montar arrays)
+SHORT_SNAKE = 32
+
+class GridEncoder:
+    """
+    Estado em imagem (C, H, W) para políticas convolucionais: corpo, cabeça,
+    comida e, opcionalmente, a idade de cada segmento.
+
+    Escreve sempre no mesmo buffer pré-alocado (num_boards, C, H, W) float32,
+    lido direto da grade de ocupação do jogo, sem montar listas por passo.
+    torch.from_numpy(encoder.buffer) compartilha a memória: basta criar o
+    tensor uma vez e ele enxerga cada nova codificação sem cópia.
+    """
+    def __init__(self, grid_width=GRID_WIDTH, grid_height=GRID_HEIGHT, num_boards=1, age_channel=False):
+        self.grid_width = grid_width
+        self.grid_height = grid_height
+        self.num_boards = num_boards
+        self.age_channel = age_channel
+        self.channels = 4 if age_channel else 3
+        self.buffer = np.zeros((num_boards, self.channels, grid_height, grid_width), dtype=np.float32)
+        self._board_ids = np.arange(num_boards)
+
+    def encode(self, game, index=0):
+        """Codifica um HeadlessSnakeGame/SnakeGame na posição index do buffer e retorna a view (C, H, W)"""
+        planes = self.buffer[index]
+        # View sem cópia da grade de ocupação do jogo (contagem de segmentos por célula)
+        occupancy = np.frombuffer(game._occupancy, dtype=np.uint8).reshape(self.grid_height, self.grid_width)
+        np.greater(occupancy, 0, out=planes[BODY_CHANNEL], casting='unsafe')
+        planes[HEAD_CHANNEL:] = 0
+
+        head = game.head
+        if 0 <= head.x < self.grid_width and 0 <= head.y < self.grid_height:
+            # A cabeça tem canal próprio; o corpo só marca a célula se outro segmento também estiver nela
+            planes[BODY_CHANNEL, head.y, head.x] = occupancy[head.y, head.x] > 1
+            planes[HEAD_CHANNEL, head.y, head.x] = 1.0
+        if game.food is not None:
+            planes[FOOD_CHANNEL, game.food.y, game.food.x] = 1.0
+
+        if self.age_channel:
+            length = len(game.snake)
+            age = planes[AGE_CHANNEL]
+            if length <= SHORT_SNAKE:
+                for i, pt in enumerate(game.snake):
+                    if 0 <= pt.x < self.grid_width and 0 <= pt.y < self.grid_height:
+                        age[pt.y, pt.x] = (length - i) / length
+            else:
+                # Coordenadas do corpo (cabeça primeiro) num array só, sem um array por segmento
+                coords = np.fromiter(chain.from_iterable(game.snake), dtype=np.int64, count=2 * length).reshape(length, 2)
+                xs, ys = coords[:, 0], coords[:, 1]
+                ages = (length - np.arange(length)) / length
+                inside = (xs >= 0) & (xs < self.grid_width) & (ys >= 0) & (ys < self.grid_height)
+                age[ys[inside], xs[inside]] = ages[inside]
+            # Só a cabeça pode cair sobre outro segmento (colisão): ela é o segmento mais novo
+            if 0 <= head.x < self.grid_width and 0 <= head.y < self.grid_height:
+                age[head.y, head.x] = 1.0
+        return planes
+
+    def encode_batch(self, env):
+        """Codifica todas as partidas de um BatchSnakeEnv (num_boards == env.num_envs) e retorna o buffer"""
+        buffer = self.buffer
+        ids = self._board_ids
+        np.greater(env.occupancy, 0, out=buffer[:, BODY_CHANNEL], casting='unsafe')
+        buffer[:, HEAD_CHANNEL:] = 0
+
+        # Depois do step as partidas encerradas já foram reiniciadas: cabeças sempre no tabuleiro
+        hx, hy = env.heads[:, 0], env.heads[:, 1]
+        buffer[ids, BODY_CHANNEL, hy, hx] = env.occupancy[ids, hy, hx] > 1
+        buffer[ids, HEAD_CHANNEL, hy, hx] = 1.0
+        buffer[ids, FOOD_CHANNEL, env.food[:, 1], env.food[:, 0]] = 1.0
+
+        if self.age_channel:
+            # Segmento k (0 = cabeça) de cada partida, lido do buffer circular do corpo;
+            # numa partida em andamento cada célula aparece uma vez só
+            k = np.arange(env.lengths.max())
+            ptrs = (env.head_ptr[:, None] - k[None, :]) % env.capacity
+            cells = env.body[ids[:, None], ptrs]
+            lengths = env.lengths[:, None]
+            valid = k[None, :] < lengths
+            ages = (lengths - k[None, :]) / lengths
+            boards = np.broadcast_to(ids[:, None], cells.shape)[valid]
+            cells = cells[valid]
+            buffer[boards, AGE_CHANNEL, cells // self.grid_width, cells % self.grid_width] = ages[valid]
+        return buffer
@@ -0,0 +1,302 @@
+import random
+from enum import Enum
+from functools import lru_cache
+from collections import namedtuple, deque
+from .constants import *
+
+# Motor do jogo sem dependência do pygame (usado no treinamento sem display)
+
+class Direction(Enum):
+    RIGHT = 1
+    LEFT = 2
+    UP = 3
+    DOWN = 4
+
+Point = namedtuple('Point', 'x, y')
+
+# Cópia compacta do estado de um jogo (snapshot/restore): corpo em tupla, grade de
+# ocupação e índice de células livres em cópias planas, estado do gerador da comida
+GameSnapshot = namedtuple('GameSnapshot', [
+    'snake', 'head', 'head_cell', 'direction', 'food', 'food_cell', 'score',
+    'frame_iteration', 'previous_head', 'rng_state',
+    'occupancy', 'free_cells', 'free_pos', 'row_bits', 'col_bits'])
+
+# Ordem horária usada pelas ações relativas ([frente, direita, esquerda])
+CLOCK_WISE = [Direction.RIGHT, Direction.DOWN, Direction.LEFT, Direction.UP]
+CLOCK_WISE_DELTAS = [(1, 0), (0, 1), (-1, 0), (0, -1)]
+
+class GridTables:
+    """
+    Tabelas pré-calculadas por célula (y*W+x) de um tabuleiro W x H, na ordem horária [R, D, L, U]:
+    - points: o Point de cada célula (o motor reaproveita, sem criar Points por passo)
+    - neighbors: célula vizinha em cada direção, ou -1 fora do tabuleiro
+    - rays: células em linha reta em cada direção até a borda (sem a própria célula)
+    - wall_distance: células até a borda em cada direção (tamanho de cada raio)
+    """
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.points = [Point(cell % width, cell // width) for cell in range(width * height)]
+        self.neighbors = []
+        self.rays = []
+        for cell in range(width * height):
+            x, y = cell % width, cell // width
+            neighbors = []
+            rays = []
+            for dx, dy in CLOCK_WISE_DELTAS:
+                ray = []
+                nx, ny = x + dx, y + dy
+                while 0 <= nx < width and 0 <= ny < height:
+                    ray.append(ny * width + nx)
+                    nx, ny = nx + dx, ny + dy
+                neighbors.append(ray[0] if ray else -1)
+                rays.append(tuple(ray))
+            self.neighbors.append(tuple(neighbors))
+            self.rays.append(tuple(rays))
+        self.wall_distance = [tuple(len(ray) for ray in rays) for rays in self.rays]
+
+@lru_cache(maxsize=None)
+def grid_tables(width, height):
+    """Tabelas compartilhadas por todos os jogos com o mesmo tamanho de tabuleiro"""
+    return GridTables(width, height)
+
+class HeadlessSnakeGame:
+    """
+    Lógica pura do jogo da cobrinha, sem pygame.
+    Mesma API de SnakeGame (reset, play_step, is_collision), mas nunca
+    inicializa o pygame nem processa eventos da janela.
+
+    Internamente trabalha com células inteiras (y*W+x): head_cell e food_cell,
+    movimento pela tabela de vizinhos e ocupação indexada por célula. head, food
+    e snake continuam em Points (os mesmos objetos da tabela, sem alocar por passo).
+    """
+    def __init__(self, width=GAME_WIDTH, height=GAME_HEIGHT, seed=None):
+        self.width = width
+        self.height = height
+        self.grid_width = width // GRID_SIZE
+        self.grid_height = height // GRID_SIZE
+
+        # Gerador da comida: com seed a partida é reproduzível, sem seed usa o módulo random
+        self.rng = random.Random(seed) if seed is not None else random
+
+        # Tabelas de vizinhos, raios e Points por célula
+        self.tables = grid_tables(self.grid_width, self.grid_height)
+        self._points = self.tables.points
+        self._neighbors = self.tables.neighbors
+
+        # Grade de ocupação: quantos segmentos da cobra estão em cada célula (y*W+x)
+        self._occupancy = bytearray(self.grid_width * self.grid_height)
+        # Índice de células livres (remoção por troca com o último): lista + posição de cada célula
+        self._free_cells = []
+        self._free_pos = []
+        # Bitboards de ocupação: bit x de row_bits[y] e bit y de col_bits[x] = célula ocupada
+        # (lidas pelo IncrementalGameState para os raios e densidades em O(1))
+        self.row_bits = [0] * self.grid_height
+        self.col_bits = [0] * self.grid_width
+
+        # Contadores para caches por passo: steps conta play_step, epoch muda a cada
+        # reset/set_snake (o par (epoch, steps) identifica a posição atual)
+        self.steps = 0
+        self.epoch = 0
+
+        # Estado do jogo
+        self.reset()
+
+    def reset(self):
+        self.epoch += 1
+        # Estado inicial da cobrinha
+        self.direction = Direction.RIGHT
+        self.head_cell = (self.grid_height//2) * self.grid_width + self.grid_width//2
+        self.head = self._points[self.head_cell]
+        # Corpo em deque: inserir a cabeça e remover a cauda custam O(1)
+        self.snake = deque([self.head,
+                            self._points[self.head_cell - 1],
+                            self._points[self.head_cell - 2]])
+        self._rebuild_occupancy()
+
+        self.score = 0
+        self._food = None
+        self.food_cell = -1
+        self._place_food()
+        self.frame_iteration = 0
+        self.previous_head = None  # Para calcular eficiência do movimento
+
+    def _place_food(self):
+        """Sorteia a comida entre as células livres em O(1); retorna False se o tabuleiro estiver cheio"""
+        if not self._free_cells:
+            return False
+        self.food_cell = self._free_cells[self.rng.randrange(len(self._free_cells))]
+        self._food = self._points[self.food_cell]
+        return True
+
+    @property
+    def food(self):
+        return self._food
+
+    @food.setter
+    def food(self, pt):
+        # Comida definida de fora (testes, sincronização): mantém food_cell em dia
+        self._food = pt
+        self.food_cell = -1 if pt is None else pt.y * self.grid_width + pt.x
+
+    def play_step(self, action=None):
+        self.frame_iteration += 1
+        self.steps += 1
+
+        # 1. Mover (sem ação, ou com action == "manual", segue a direção atual)
+        if action is not None and action != "manual":
+            self._move_ai(action)
+        self._move(self.direction)
+        self.snake.appendleft(self.head)
+        head_cell = self.head_cell
+        if head_cell >= 0:
+            self._occupy(head_cell)
+
+        # 2. Verificar se o jogo acabou (fora do tabuleiro, ou a cabeça divide a célula com o corpo)
+        reward = 0
+        game_over = False
+
+        if head_cell < 0 or self._occupancy[head_cell] > 1 or self.frame_iteration > 100*len(self.snake):
+            game_over = True
+            reward = REWARD_DEATH
+            return reward, game_over, self.score
+
+        # 3. Colocar nova comida ou apenas mover
+        if head_cell == self.food_cell:
+            self.score += 1
+            reward = REWARD_FOOD
+            if not self._place_food():
+                # Tabuleiro cheio: não há onde colocar comida, a partida termina
+                game_over = True
+        else:
+            tail = self.snake.pop()
+            self._vacate(tail.y * self.grid_width + tail.x)
+
+        # 4. Retornar game over e score
+        return reward, game_over, self.score
+
+    def _move_ai(self, action):
+        # action pode ser uma lista [0,0,1] ou um número
+        if isinstance(action, list):
+            # Converter lista para índice
+            action = action.index(1) if 1 in action else 0
+
+        # [straight, right, left]
+        idx = CLOCK_WISE.index(self.direction)
+
+        if action == 0:  # straight
+            new_dir = CLOCK_WISE[idx]
+        elif action == 1:  # right turn
+            next_idx = (idx + 1) % 4
+            new_dir = CLOCK_WISE[next_idx]
+        else:  # left turn
+            next_idx = (idx - 1) % 4
+            new_dir = CLOCK_WISE[next_idx]
+
+        self.direction = new_dir
+
+    def is_collision(self, pt=None):
+        if pt is None:
+            pt = self.head
+        # Bater na borda
+        if pt.x >= self.grid_width or pt.x < 0 or pt.y >= self.grid_height or pt.y < 0:
+            return True
+        # Bater em si mesma (a cabeça, snake[0], não conta)
+        count = self._occupancy[pt.y * self.grid_width + pt.x]
+        if pt == self.head:
+            count -= 1
+        return count > 0
+
+    def _occupy(self, cell):
+        if self._occupancy[cell] == 0:
+            # Remover do índice de livres trocando com a última célula
+            pos = self._free_pos[cell]
+            last = self._free_cells[-1]
+            self._free_cells[pos] = last
+            self._free_pos[last] = pos
+            self._free_cells.pop()
+            self._free_pos[cell] = -1
+            x, y = cell % self.grid_width, cell // self.grid_width
+            self.row_bits[y] |= 1 << x
+            self.col_bits[x] |= 1 << y
+        self._occupancy[cell] += 1
+
+    def _vacate(self, cell):
+        self._occupancy[cell] -= 1
+        if self._occupancy[cell] == 0:
+            self._free_pos[cell] = len(self._free_cells)
+            self._free_cells.append(cell)
+            x, y = cell % self.grid_width, cell // self.grid_width
+            self.row_bits[y] &= ~(1 << x)
+            self.col_bits[x] &= ~(1 << y)
+
+    def _rebuild_occupancy(self):
+        """Recalcula a grade de ocupação, o índice de células livres e as bitboards a partir do corpo da cobra"""
+        num_cells = self.grid_width * self.grid_height
+        self._occupancy = bytearray(num_cells)
+        self._free_cells = list(range(num_cells))
+        self._free_pos = list(range(num_cells))
+        self.row_bits = [0] * self.grid_height
+        self.col_bits = [0] * self.grid_width
+        for pt in self.snake:
+            if 0 <= pt.x < self.grid_width and 0 <= pt.y < self.grid_height:
+                self._occupy(pt.y * self.grid_width + pt.x)
+
+    def _move(self, direction):
+        # Armazenar posição anterior da cabeça
+        self.previous_head = self.head
+
+        idx = CLOCK_WISE.index(direction)
+        cell = self._neighbors[self.head_cell][idx] if self.head_cell >= 0 else -1
+        self.head_cell = cell
+        if cell >= 0:
+            self.head = self._points[cell]
+        else:
+            # Saiu do tabuleiro (fim de jogo): único caso em que um Point novo é criado
+            dx, dy = CLOCK_WISE_DELTAS[idx]
+            self.head = Point(self.head.x + dx, self.head.y + dy)
+
+    def snapshot(self):
+        """
+        Estado atual em um GameSnapshot, para buscas simularem jogadas e voltarem com restore().
+        O(tamanho da cobra) para o corpo mais cópias planas da grade (sem deepcopy do jogo).
+        Sem seed, o gerador da comida é o módulo random: o snapshot guarda o estado global dele.
+        """
+        return GameSnapshot(
+            tuple(self.snake), self.head, self.head_cell, self.direction, self._food, self.food_cell,
+            self.score, self.frame_iteration, self.previous_head, self.rng.getstate(),
+            bytes(self._occupancy), self._free_cells[:], self._free_pos[:], self.row_bits[:], self.col_bits[:])
+
+    def restore(self, snapshot):
+        """Volta ao estado de um snapshot deste jogo (ou de outro com o mesmo tabuleiro)"""
+        self.epoch += 1  # Posição nova para os caches por passo
+        self.snake = deque(snapshot.snake)
+        self.head = snapshot.head
+        self.head_cell = snapshot.head_cell
+        self.direction = snapshot.direction
+        self._food = snapshot.food
+        self.food_cell = snapshot.food_cell
+        self.score = snapshot.score
+        self.frame_iteration = snapshot.frame_iteration
+        self.previous_head = snapshot.previous_head
+        self.rng.setstate(snapshot.rng_state)
+        # Cópia para dentro das estruturas atuais: o snapshot continua intacto para outros restores
+        self._occupancy[:] = snapshot.occupancy
+        self._free_cells[:] = snapshot.free_cells
+        self._free_pos[:] = snapshot.free_pos
+        self.row_bits[:] = snapshot.row_bits
+        self.col_bits[:] = snapshot.col_bits
+
+    def set_snake(self, body, direction=None):
+        """Posiciona a cobra com um corpo arbitrário (cabeça primeiro), útil para testes e benchmarks"""
+        self.epoch += 1
+        self.snake = deque(body)
+        self.head = self.snake[0]
+        inside = 0 <= self.head.x < self.grid_width and 0 <= self.head.y < self.grid_height
+        self.head_cell = self.head.y * self.grid_width + self.head.x if inside else -1
+        self._rebuild_occupancy()
+        if direction is not None:
+            self.direction = direction
+        self.previous_head = None
+        if self.food_cell < 0 or self._occupancy[self.food_cell]:
+            self._place_food()
@@ -0,0 +1,173 @@
+import numpy as np
+from .game_state import GameState
+from .headless_game import Direction, CLOCK_WISE
+from .constants import GRID_WIDTH, GRID_HEIGHT
+
+class IncrementalGameState(GameState):
+    """
+    Mesmas 28 features de GameState.get_state, lidas das bitboards de linha e
+    coluna que o jogo atualiza a cada passo (cabeça entra, cauda sai).
+
+    Os raios de espaço livre e as densidades viram operações de bits em O(1)
+    em vez de varrer célula a célula. Cabeça fora do tabuleiro (fim de jogo)
+    ou tabuleiro com tamanho diferente de GRID_WIDTH x GRID_HEIGHT usam o
+    cálculo original.
+
+    O resultado fica em cache por passo, com a chave (game.epoch, game.steps):
+    get_state e get_game_info chamados várias vezes no mesmo passo (estado,
+    modelagem de recompensa, estado seguinte) calculam tudo uma vez só.
+    Quem alterar o jogo por fora de play_step/reset/set_snake deve chamar
+    invalidate().
+    """
+    def __init__(self, game):
+        super().__init__(game)
+        self._cache_key = None
+        self._cache = None
+
+    def invalidate(self):
+        """Descarta o cache do passo atual"""
+        self._cache_key = None
+        self.reachable.invalidate()
+
+    def get_state(self):
+        return self._analysis()[0]
+
+    def get_game_info(self, reachable=False):
+        """Mesmo dicionário de GameState.get_game_info, com densidades, raios e armadilha do cache"""
+        _, extras = self._analysis()
+        if extras is None:
+            return super().get_game_info(reachable)
+        densities, free_spaces, trap_risk, tail_blocking = extras
+        info = {
+            'score': self.game.score,
+            'snake_length': len(self.game.snake),
+            'food_position': self.game.food,
+            'head_position': self.game.head,
+            'direction': self.game.direction,
+            'frame_iteration': self.game.frame_iteration,
+            'distance_to_food': self.get_distance_to_food(),
+            'state_size': 28,
+            'body_density': sum(densities) / 4,
+            'free_space_ratio': sum(free_spaces) / 4,
+            'trap_risk': trap_risk,
+            'tail_blocking': tail_blocking,
+        }
+        if reachable:
+            info.update(self.get_reachable_info())
+        return info
+
+    def _analysis(self):
+        """(estado, extras) do passo atual, calculados no máximo uma vez por passo"""
+        key = (self.game.epoch, self.game.steps)
+        if key != self._cache_key:
+            self._cache = self._compute()
+            self._cache_key = key
+        return self._cache
+
+    def _compute(self):
+        """
+        Calcula o vetor de 28 features e os valores intermediários usados por get_game_info
+        (densidades e espaços livres normalizados em [esq, dir, cima, baixo], armadilha, cauda).
+        """
+        game = self.game
+        head = game.head
+        x, y = head.x, head.y
+        width, height = game.grid_width, game.grid_height
+        if width != GRID_WIDTH or height != GRID_HEIGHT or not (0 <= x < width and 0 <= y < height):
+            return super().get_state(), None
+
+        # Corpo em cada direção, sem a célula da cabeça (bits mais próximos da cabeça primeiro à direita/abaixo)
+        row = game.row_bits[y]
+        col = game.col_bits[x]
+        right = row >> (x + 1)
+        left = row & ((1 << x) - 1)
+        down = col >> (y + 1)
+        up = col & ((1 << y) - 1)
+
+        # Células livres até o primeiro obstáculo (corpo ou borda)
+        free_left = x - left.bit_length()
+        free_right = (right & -right).bit_length() - 1 if right else width - 1 - x
+        free_up = y - up.bit_length()
+        free_down = (down & -down).bit_length() - 1 if down else height - 1 - y
+
+        # Perigos imediatos: sem nenhuma célula livre na direção
+        blocked = [free_right == 0, free_down == 0, free_left == 0, free_up == 0]
+        idx = CLOCK_WISE.index(game.direction)
+        danger_straight = blocked[idx]
+        danger_right = blocked[(idx + 1) % 4]
+        danger_left = blocked[(idx - 1) % 4]
+
+        food = game.food
+        length = len(game.snake)
+        max_possible = max(GRID_WIDTH, GRID_HEIGHT)
+
+        # Armadilha: mesma regra de _detect_potential_trap, com os raios já calculados
+        frees = (free_left, free_right, free_up, free_down)
+        free_adjacent = sum(1 for free in frees if free > 0)
+        if free_adjacent <= 1:
+            potential_trap = True
+        elif free_adjacent == 2:
+            total_free_space = 0
+            for free in frees:
+                total_free_space += free / max_possible * 10
+            potential_trap = total_free_space < length * 0.5
+        else:
+            potential_trap = False
+
+        densities = (
+            (left >> max(x - 3, 0)).bit_count() / 3,
+            (right & 7).bit_count() / 3,
+            (up >> max(y - 3, 0)).bit_count() / 3,
+            (down & 7).bit_count() / 3,
+        )
+        free_spaces = (
+            free_left / max_possible,
+            free_right / max_possible,
+            free_up / max_possible,
+            free_down / max_possible,
+        )
+        tail_blocking = self._is_tail_blocking_escape()
+
+        state = [
+            # Perigos imediatos (3)
+            danger_straight,
+            danger_right,
+            danger_left,
+
+            # Direção atual (4)
+            game.direction == Direction.LEFT,
+            game.direction == Direction.RIGHT,
+            game.direction == Direction.UP,
+            game.direction == Direction.DOWN,
+
+            # Localização da comida (4)
+            food.x < x,
+            food.x > x,
+            food.y < y,
+            food.y > y,
+
+            # Tamanho da cobra (1)
+            length / (GRID_WIDTH * GRID_HEIGHT),
+
+            # Densidade corporal local (4): segmentos nas 3 células seguintes
+            *densities,
+
+            # Distâncias até bordas (4)
+            x / GRID_WIDTH,
+            (GRID_WIDTH - 1 - x) / GRID_WIDTH,
+            y / GRID_HEIGHT,
+            (GRID_HEIGHT - 1 - y) / GRID_HEIGHT,
+
+            # Espaços livres (4)
+            *free_spaces,
+
+            # Detecção de armadilhas (2)
+            tail_blocking,
+            potential_trap,
+
+            # Informações de movimento (2)
+            (abs(x - food.x) + abs(y - food.y)) / (GRID_WIDTH + GRID_HEIGHT),
+            self._calculate_movement_efficiency()
+        ]
+
+        return np.array(state, dtype=np.float32), (densities, free_spaces, potential_trap, tail_blocking)
@@ -2,10 +2,15 @@ import pygame
 import sys
 from ..game.snake_game import SnakeGame, Direction
 from ..game.constants import *
-from ..ai.agent import Agent
 
 class GameInterface:
-    def __init__(self):
+    def __init__(self, agent=None, lookahead=LOOKAHEAD_PLANNER):
+        """
+        agent: None cria um Agent (torch) e carrega o último modelo. Um agente só de
+        inferência (ex.: NumpyAgent) joga no modo AI_PLAY sem importar o torch.
+        lookahead: no modo AI_PLAY, escolher as jogadas com busca (LookaheadPlanner)
+        sobre o DQN em vez da ação gulosa.
+        """
         pygame.init()
         self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
         pygame.display.set_caption("Snake AI - Jogo da Cobrinha com IA")
@@ -18,10 +23,19 @@ class GameInterface:
         # Inicializar jogo e IA
         self.game = SnakeGame(GAME_WIDTH, GAME_HEIGHT)
         self.game.set_display(self.game_surface)
-        self.agent = Agent()
-        
-        # Tentar carregar o último modelo automaticamente
-        self.agent.auto_load_latest()
+        # Treino, salvar e carregar só existem no Agent com torch
+        self.can_train = agent is None
+        if agent is None:
+            from ..ai.agent import Agent
+            agent = Agent()
+
+            # Tentar carregar o último modelo automaticamente
+            agent.auto_load_latest()
+        self.agent = agent
+        self.planner = None
+        if lookahead:
+            from ..ai.planner import LookaheadPlanner
+            self.planner = LookaheadPlanner(agent)
         
         # Estado do jogo
         self.mode = "MANUAL"  # MANUAL, AI_PLAY, AI_TRAIN
@@ -53,8 +67,14 @@ class GameInterface:
                     self.mode = "AI_PLAY"
                     self.game.reset()
                 elif event.key == pygame.K_t:
+                    if not self.can_train:
+                        print("Agente só de inferência: treino indisponível")
+                        continue
                     self.mode = "AI_TRAIN"
                     self.game.reset()
+                elif not self.can_train and event.key in (pygame.K_s, pygame.K_l, pygame.K_n) \
+                        and pygame.key.get_pressed()[pygame.K_LCTRL]:
+                    print("Agente só de inferência: salvar/carregar/novo treinamento indisponíveis")
                 elif event.key == pygame.K_s and pygame.key.get_pressed()[pygame.K_LCTRL]:
                     # Salvar modelo atual
                     success = self.agent.save_model('models/manual_save.pth')
@@ -67,7 +87,10 @@ class GameInterface:
                         print("Último modelo carregado!")
                 elif event.key == pygame.K_n and pygame.key.get_pressed()[pygame.K_LCTRL]:
                     # Novo treinamento (reset do agente)
+                    from ..ai.agent import Agent
                     self.agent = Agent()
+                    if self.planner is not None:
+                        self.planner.agent = self.agent
                     print("Novo agente criado - treinamento do zero!")
                 # Processar controles de movimento no modo manual
                 elif self.mode == "MANUAL":
@@ -127,7 +150,13 @@ class GameInterface:
             
             epsilon_text = self.font_small.render(f"Epsilon: {stats['epsilon']:.3f}", True, WHITE)
             self.info_surface.blit(epsilon_text, (20, y_offset))
-            y_offset += 40
+            y_offset += 25
+
+            if self.planner is not None and self.mode == "AI_PLAY":
+                depth_text = self.font_small.render(f"Busca: {self.planner.last_depth} jogadas à frente", True, WHITE)
+                self.info_surface.blit(depth_text, (20, y_offset))
+                y_offset += 25
+            y_offset += 15
         
         # Controles
         controls_title = self.font_medium.render("Controles:", True, YELLOW)
@@ -169,13 +198,16 @@ class GameInterface:
         elif self.mode == "AI_PLAY":
             # IA jogando com modelo treinado
             state = self.agent.get_state(self.game)
-            action = self.agent.get_action(state)
+            if self.planner is not None:
+                action = self.planner.get_action(self.game, state)
+            else:
+                action = self.agent.get_action(state, self.game)
             reward, game_over, score = self.game.play_step(action)
             
         elif self.mode == "AI_TRAIN":
             # IA treinando
             state_old = self.agent.get_state(self.game)
-            action = self.agent.get_action(state_old)
+            action = self.agent.get_action(state_old, self.game)
             reward, game_over, score = self.game.play_step(action)
             state_new = self.agent.get_state(self.game)
             
@@ -102,7 +102,7 @@ class TrainingInterface:
             state_old = self.trainer.agent.get_state(self.trainer.game)
             
             # Obter ação
-            final_move = self.trainer.agent.get_action(state_old)
+            final_move = self.trainer.agent.get_action(state_old, self.trainer.game)
             
             # Executar movimento
             reward, done, score = self.trainer.game.play_step(final_move)
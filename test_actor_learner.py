@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Teste do Treino Ator/Aprendiz
+=============================
+
+Verifica o ActorLearnerTrainer (atores e aprendiz em threads):
+- Atores jogam, o aprendiz grava as transições na memória e treina
+- Os atores recebem as cópias dos pesos publicadas pelo aprendiz
+- A cópia publicada não muda quando o aprendiz continua treinando
+- run() para por partidas ou por tempo e encerra as threads
+- Com o escudo de segurança, os atores só morrem sem jogada viva
+
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+import numpy as np
+import torch
+from src.ai.actor_learner import ActorLearnerTrainer, Actor
+from src.game.headless_game import Point, CLOCK_WISE, CLOCK_WISE_DELTAS
+from src.game.constants import *
+
+def test_actors_and_learner():
+    """Transições chegam à memória, o aprendiz atualiza e os atores sincronizam"""
+    print("🧪 Rodando atores e aprendiz")
+    print("=" * 50)
+
+    torch.manual_seed(0)
+    trainer = ActorLearnerTrainer(num_actors=2, seed=0, sync_every=5)
+    stats = trainer.run(duration=3.0)
+
+    assert stats['steps'] > 0 and stats['updates'] > 0, stats
+    assert not any(thread.is_alive() for thread in trainer._threads)
+    memory = trainer.agent.memory
+    assert len(memory) > BATCH_SIZE
+    assert np.all(np.isin(memory.actions[:len(memory)], [0, 1, 2]))
+    assert trainer.agent.trainer.updates == stats['updates']
+    assert all(actor.steps > 0 for actor in trainer.actors), "Algum ator não jogou"
+    versions = [actor.version for actor in trainer.actors]
+    assert all(version >= 1 for version in versions), versions
+    assert trainer.agent.n_games == len(trainer.agent.scores) == stats['games']
+    print(f"✓ {stats['steps']} passos, {stats['updates']} atualizações, {stats['games']} partidas")
+    print(f"✓ Versões dos pesos nos atores: {versions}")
+    return True
+
+def test_weight_snapshots():
+    """A cópia publicada é independente da rede em treino e carregada igual no ator"""
+    print("\n🧪 Testando cópias dos pesos")
+    print("=" * 50)
+
+    trainer = ActorLearnerTrainer(num_actors=1, seed=1)
+    version, weights = trainer.weights
+    actor = Actor(seed=1)
+    actor.load_weights(weights, version)
+    for name, tensor in actor.model.state_dict().items():
+        assert torch.equal(tensor, weights[name])
+
+    with torch.no_grad():
+        trainer.agent.model.fc1.weight.add_(1.0)
+    assert not torch.equal(trainer.agent.model.fc1.weight, weights['fc1.weight'])
+    assert torch.equal(actor.model.fc1.weight, weights['fc1.weight'])
+
+    trainer._publish_weights()
+    new_version, new_weights = trainer.weights
+    assert new_version == version + 1
+    assert torch.equal(new_weights['fc1.weight'], trainer.agent.model.fc1.weight)
+    print("✓ Cópias isoladas e versionadas")
+    return True
+
+def test_stop_by_games():
+    """run(max_games=n) para depois de n partidas novas"""
+    print("\n🧪 Parando por número de partidas")
+    print("=" * 50)
+
+    trainer = ActorLearnerTrainer(num_actors=2, seed=2)
+    ended = []
+    stats = trainer.run(max_games=5, on_game_end=ended.append)
+    assert stats['games'] >= 5 and len(ended) == stats['games']
+    assert trainer.agent.record == max(ended)
+    assert not any(thread.is_alive() for thread in trainer._threads)
+    print(f"✓ {stats['games']} partidas em {stats['seconds']:.1f}s")
+    return True
+
+def test_actor_shield():
+    """Escudo ligado no treinador chega aos atores; mortes só quando toda jogada bate"""
+    print("\n🧪 Escudo de segurança nos atores")
+    print("=" * 50)
+
+    trainer = ActorLearnerTrainer(num_actors=2, seed=3, safety_shield=True)
+    assert all(actor.safety_shield for actor in trainer.actors)
+
+    torch.manual_seed(3)
+    actor = Actor(seed=3, safety_shield=True)
+    deaths = 0
+    for step in range(3000):
+        game = actor.game
+        idx = CLOCK_WISE.index(game.direction)
+        alive = [turn for turn in (0, 1, 3)
+                 if not game.is_collision(Point(game.head.x + CLOCK_WISE_DELTAS[(idx + turn) % 4][0],
+                                                game.head.y + CLOCK_WISE_DELTAS[(idx + turn) % 4][1]))]
+        starved = game.frame_iteration + 1 > 100 * len(game.snake)  # Fim por tempo, não por colisão
+        # Alterna exploração total e política gulosa
+        _, done, _ = actor.step(1.0 if step % 2 else 0.0)
+        if done and not starved:
+            deaths += 1
+            assert not alive, f"Ator morreu no passo {step} com jogadas vivas"
+    assert actor.shielded > 0
+    print(f"✓ {deaths} colisões em 3000 passos, todas sem jogada viva; escudo atuou {actor.shielded} vezes")
+    return True
+
+def main():
+    """Função principal de teste"""
+    print("🚀 Iniciando Testes do Treino Ator/Aprendiz")
+    print("=" * 60)
+
+    tests = [
+        ("Atores e aprendiz", test_actors_and_learner),
+        ("Cópias dos pesos", test_weight_snapshots),
+        ("Parada por partidas", test_stop_by_games),
+        ("Escudo nos atores", test_actor_shield),
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for name, test_func in tests:
+        print(f"\n🧪 Executando: {name}")
+        try:
+            if test_func():
+                print(f"✅ {name}: PASSOU")
+                passed += 1
+            else:
+                print(f"❌ {name}: FALHOU")
+        except Exception as e:
+            print(f"💥 {name}: ERRO - {e}")
+            import traceback
+            traceback.print_exc()
+
+    print(f"\n📊 Resultado Final:")
+    print(f"   Testes passaram: {passed}/{total}")
+
+    return passed == total
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
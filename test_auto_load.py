@@ -13,6 +13,7 @@ sys.path.insert(0, src_path)
 
 # Importações com path correto
 from src.ai.agent import Agent
+from src.game.constants import STATE_SIZE
 
 def test_auto_load():
     """Testa o carregamento automático de modelos"""
@@ -43,7 +44,7 @@ def test_auto_load():
     print("\n2. Testando salvamento de checkpoint...")
     # Simular algum progresso e salvar
     agent.n_games += 1
-    agent.memory.append(([0,0,0,0,0,0,0,0,0,0,0], 0, 10, [0,0,0,0,0,0,0,0,0,0,0], False))
+    agent.remember([0] * STATE_SIZE, [1, 0, 0], 10, [0] * STATE_SIZE, False)
     agent.save_model()
     print(f"✅ Checkpoint salvo para game {agent.n_games}")
     
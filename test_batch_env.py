@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Teste do Ambiente em Lote
+=========================
+
+Verifica que o BatchSnakeEnv segue exatamente as regras do jogo:
+- Mesmas recompensas, scores, cabeças e tamanhos que o HeadlessSnakeGame
+- get_state em lote idêntico ao GameState.get_state de cada partida
+- Raios e densidades vetorizados (features.py) iguais às funções do GameState
+- game_grid com as dimensões do próprio jogo (tabuleiro fora do padrão)
+
+"""
+
+import sys
+import os
+import random
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+import numpy as np
+from src.game.headless_game import HeadlessSnakeGame, Point
+from src.game.game_state import GameState
+from src.game.batch_env import BatchSnakeEnv, CLOCK_WISE
+from src.game.features import game_grid, directional_features
+from src.game.constants import *
+
+def _sync_game(game, env, env_id):
+    """Copia o tabuleiro da partida env_id do lote para um HeadlessSnakeGame"""
+    game.set_snake(env.get_snake(env_id), CLOCK_WISE[env.directions[env_id]])
+    game.food = Point(int(env.food[env_id, 0]), int(env.food[env_id, 1]))
+    game.score = int(env.scores[env_id])
+    game.frame_iteration = int(env.frame_iteration[env_id])
+    if env.has_previous[env_id]:
+        game.previous_head = Point(int(env.previous_heads[env_id, 0]), int(env.previous_heads[env_id, 1]))
+
+def _greedy_actions(env, states, rng):
+    """Política simples que busca a comida evitando perigos imediatos (faz as cobras crescerem)"""
+    actions = np.zeros(env.num_envs, dtype=np.int64)
+    for i in range(env.num_envs):
+        safe = [a for a in range(3) if not states[i, a]]
+        if not safe:
+            continue
+        best = None
+        for a in safe:
+            d = (env.directions[i] + [0, 1, 3][a]) % 4
+            x = env.heads[i, 0] + [1, 0, -1, 0][d]
+            y = env.heads[i, 1] + [0, 1, 0, -1][d]
+            distance = abs(x - env.food[i, 0]) + abs(y - env.food[i, 1]) + rng.random()
+            if best is None or distance < best[0]:
+                best = (distance, a)
+        actions[i] = best[1]
+    return actions
+
+def test_batch_rules_match_single_game():
+    """Cada partida do lote deve evoluir como um HeadlessSnakeGame com a mesma comida"""
+    print("🧪 Comparando BatchSnakeEnv com HeadlessSnakeGame")
+    print("=" * 50)
+
+    num_envs = 16
+    env = BatchSnakeEnv(num_envs, seed=0)
+    games = [HeadlessSnakeGame(seed=i) for i in range(num_envs)]
+    rng = random.Random(0)
+    finished = 0
+
+    for _ in range(3000):
+        for i, game in enumerate(games):
+            # Mesma comida do lote antes de cada passo
+            game.food = Point(int(env.food[i, 0]), int(env.food[i, 1]))
+        # Ações com viés para frente, para as partidas durarem mais
+        actions = np.array([rng.choice([0, 0, 0, 1, 2]) for _ in range(num_envs)])
+        rewards, dones, scores = env.step(actions)
+
+        for i, game in enumerate(games):
+            reward, done, score = game.play_step(int(actions[i]))
+            assert reward == rewards[i] and done == dones[i] and score == scores[i], f"Partida {i} divergiu"
+            if done:
+                game.reset()
+                finished += 1
+            else:
+                assert game.head == Point(int(env.heads[i, 0]), int(env.heads[i, 1]))
+                assert len(game.snake) == env.lengths[i]
+                assert list(game.snake) == env.get_snake(i)
+
+    print(f"✓ 3000 passos x {num_envs} partidas idênticos ({finished} partidas encerradas)")
+    return True
+
+def test_batch_state_matches_game_state():
+    """get_state em lote deve ser igual ao GameState.get_state de cada partida"""
+    print("\n🧪 Comparando estados em lote com GameState")
+    print("=" * 50)
+
+    num_envs = 32
+    env = BatchSnakeEnv(num_envs, seed=1)
+    game = HeadlessSnakeGame()
+    game_state = GameState(game)
+    rng = np.random.default_rng(1)
+    compared = 0
+    longest = 0
+
+    for _ in range(1500):
+        states = env.get_state()
+        assert states.shape == (num_envs, STATE_SIZE) and states.dtype == np.float32
+        for i in range(num_envs):
+            _sync_game(game, env, i)
+            expected = game_state.get_state()
+            assert np.array_equal(states[i], expected), \
+                f"Estado divergente na partida {i}: {np.flatnonzero(states[i] != expected)}"
+            compared += 1
+        if rng.random() < 0.1:
+            env.step(rng.choice([0, 0, 0, 1, 2], size=num_envs))
+        else:
+            env.step(_greedy_actions(env, states, rng))
+        longest = max(longest, int(env.lengths.max()))
+
+    print(f"✓ {compared} estados idênticos (maior cobra: {longest})")
+    return True
+
+def test_directional_features_match_game_state():
+    """directional_features deve repetir as funções de raio do GameState, em lote e para um tabuleiro"""
+    print("\n🧪 Comparando raios vetorizados com GameState")
+    print("=" * 50)
+
+    num_envs = 32
+    env = BatchSnakeEnv(num_envs, seed=2)
+    game = HeadlessSnakeGame()
+    game_state = GameState(game)
+    rng = np.random.default_rng(2)
+    max_possible = max(GRID_WIDTH, GRID_HEIGHT)
+    offsets = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+    compared = 0
+
+    for _ in range(500):
+        densities, free_counts, blocked = directional_features(env._grid, env.heads)
+        for i in range(num_envs):
+            _sync_game(game, env, i)
+            head = game.head
+            expected_densities = [game_state._count_body_segments_in_direction(head, d, 3) for d in offsets]
+            expected_free = [game_state._count_free_spaces_in_direction(head, d) for d in offsets]
+            expected_blocked = [game.is_collision(Point(head.x + dx, head.y + dy)) for dx, dy in offsets]
+            assert list(densities[i]) == expected_densities
+            assert list(free_counts[i] / max_possible) == expected_free
+            assert list(blocked[i]) == expected_blocked
+
+            # Um tabuleiro só, com a grade montada a partir do corpo do jogo
+            single = directional_features(game_grid(game), np.array([[head.x, head.y]]))
+            assert all(np.array_equal(a[0], b[i]) for a, b in zip(single, (densities, free_counts, blocked)))
+            compared += 1
+        states = env.get_state()
+        env.step(_greedy_actions(env, states, rng))
+
+    print(f"✓ {compared} tabuleiros com densidades, raios e vizinhas idênticos")
+    return True
+
+def test_game_grid_other_board_size():
+    """game_grid usa as dimensões do jogo: igual à grade do lote num tabuleiro 12x7"""
+    print("\n🧪 Grade de um jogo com tabuleiro fora do padrão")
+    print("=" * 50)
+
+    width, height = 12 * GRID_SIZE, 7 * GRID_SIZE
+    env = BatchSnakeEnv(8, width=width, height=height, seed=5)
+    game = HeadlessSnakeGame(width, height)
+    rng = np.random.default_rng(5)
+    for _ in range(200):
+        for i in range(env.num_envs):
+            _sync_game(game, env, i)
+            grid = game_grid(game)
+            assert grid.shape == env._grid[i:i + 1].shape
+            assert np.array_equal(grid[0], env._grid[i]), f"Grade divergente na partida {i}"
+        env.step(rng.choice([0, 0, 0, 1, 2], size=env.num_envs))
+
+    print(f"✓ 200 passos x {env.num_envs} grades 12x7 idênticas às do lote")
+    return True
+
+def main():
+    """Função principal de teste"""
+    print("🚀 Iniciando Testes do Ambiente em Lote")
+    print("=" * 60)
+
+    tests = [
+        ("Regras em lote", test_batch_rules_match_single_game),
+        ("Estado em lote", test_batch_state_matches_game_state),
+        ("Raios vetorizados", test_directional_features_match_game_state),
+        ("Grade fora do padrão", test_game_grid_other_board_size),
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for name, test_func in tests:
+        print(f"\n🧪 Executando: {name}")
+        try:
+            if test_func():
+                print(f"✅ {name}: PASSOU")
+                passed += 1
+            else:
+                print(f"❌ {name}: FALHOU")
+        except Exception as e:
+            print(f"💥 {name}: ERRO - {e}")
+            import traceback
+            traceback.print_exc()
+
+    print(f"\n📊 Resultado Final:")
+    print(f"   Testes passaram: {passed}/{total}")
+
+    return passed == total
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
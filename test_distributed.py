@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Teste do Treino Distribuído
+===========================
+
+Verifica o treino data-parallel com torch.distributed (gloo, ranks locais):
+- average_gradients deixa em cada rank a média dos gradientes de todos
+- Réplicas treinando com partidas diferentes terminam com os mesmos pesos
+- Os ranks param juntos ao atingir o total de partidas somando todos
+
+"""
+
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+import numpy as np
+import torch
+import torch.distributed as dist
+import torch.multiprocessing as mp
+from src.ai.distributed import average_gradients, launch_local, run_local
+from src.ai.neural_network import DQN
+
+def _gradients_rank(results):
+    """Rank de teste: gradiente de uma perda que depende do rank, antes e depois da média"""
+    torch.manual_seed(0)
+    model = DQN(4, 8, 3)
+    rank = dist.get_rank()
+    loss = model(torch.full((2, 4), float(rank + 1))).sum() * (rank + 1)
+    loss.backward()
+    local = [param.grad.numpy().copy() for param in model.parameters()]
+    average_gradients(model)
+    # Arrays NumPy: tensores iriam por memória compartilhada, que some quando o rank termina
+    results.put((rank, local, [param.grad.numpy().copy() for param in model.parameters()]))
+
+def test_average_gradients():
+    """Depois do all-reduce cada rank tem a média dos gradientes locais"""
+    print("🧪 Média dos gradientes entre ranks")
+    print("=" * 50)
+
+    results = mp.get_context('spawn').SimpleQueue()
+    launch_local(2, _gradients_rank, results)
+    ranks = sorted((results.get() for _ in range(2)), key=lambda item: item[0])
+    (_, local_0, averaged_0), (_, local_1, averaged_1) = ranks
+    for grad_0, grad_1, mean_0, mean_1 in zip(local_0, local_1, averaged_0, averaged_1):
+        assert not np.array_equal(grad_0, grad_1)
+        assert np.allclose(mean_0, (grad_0 + grad_1) / 2)
+        assert np.array_equal(mean_0, mean_1)
+
+    print("✓ Os dois ranks ficam com a média exata dos gradientes")
+    return True
+
+def test_replicas_in_sync():
+    """Sementes diferentes por rank, mesmos pesos no fim; passos e atualizações em passo fixo"""
+    print("\n🧪 Réplicas sincronizadas")
+    print("=" * 50)
+
+    stats = run_local(2, {'seed': 3}, max_steps=300)
+    assert [rank['rank'] for rank in stats] == [0, 1]
+    assert stats[0]['steps'] == stats[1]['steps'] == 300
+    assert stats[0]['updates'] == stats[1]['updates'] > 0
+    assert stats[0]['checksum'] == stats[1]['checksum'], "Pesos divergiram entre as réplicas"
+    assert stats[0]['total_steps'] == 600
+
+    print(f"✓ {stats[0]['updates']} atualizações por rank, pesos idênticos (checksum {stats[0]['checksum']:.4f})")
+    print(f"✓ {stats[0]['total_steps_per_second']:.0f} passos/s somando os ranks")
+    return True
+
+def test_stop_on_total_games():
+    """max_games conta as partidas de todos os ranks e todos param no mesmo passo"""
+    print("\n🧪 Parada conjunta")
+    print("=" * 50)
+
+    stats = run_local(2, {'seed': 0}, max_games=4)
+    assert stats[0]['total_games'] >= 4
+    assert stats[0]['total_games'] == sum(rank['games'] for rank in stats)
+    assert stats[0]['steps'] == stats[1]['steps']
+
+    print(f"✓ {stats[0]['total_games']} partidas somando os ranks, {stats[0]['steps']} passos em cada")
+    return True
+
+def main():
+    """Função principal de teste"""
+    print("🚀 Iniciando Testes do Treino Distribuído")
+    print("=" * 60)
+
+    tests = [
+        ("Média dos gradientes", test_average_gradients),
+        ("Réplicas sincronizadas", test_replicas_in_sync),
+        ("Parada conjunta", test_stop_on_total_games),
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for name, test_func in tests:
+        print(f"\n🧪 Executando: {name}")
+        try:
+            if test_func():
+                print(f"✅ {name}: PASSOU")
+                passed += 1
+            else:
+                print(f"❌ {name}: FALHOU")
+        except Exception as e:
+            print(f"💥 {name}: ERRO - {e}")
+            import traceback
+            traceback.print_exc()
+
+    print(f"\n📊 Resultado Final:")
+    print(f"   Testes passaram: {passed}/{total}")
+
+    return passed == total
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Teste da Área Alcançável (Flood Fill)
+=====================================
+
+Verifica que ReachableArea (flood fill em bitsets) dá as mesmas áreas que uma
+busca em largura simples, limitadas ao tamanho da cobra:
+- Em partidas com cobras longas, em tabuleiros pequenos (bolsões frequentes)
+- Com o reaproveitamento entre passos e entre jogadas do mesmo passo ativos
+- Tabela de pontos simples (remoção que não separa a região)
+- Jogada com área 0 é exatamente a que morre em play_step (inclusive entrar na cauda)
+- get_game_info(reachable=True) expõe as áreas e o aviso de bolsão
+
+"""
+
+import sys
+import os
+import random
+from collections import deque
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.game.headless_game import HeadlessSnakeGame, Direction, Point
+from src.game.flood_fill import ReachableArea, SIMPLE_POINT, CLOCK_WISE, CLOCK_WISE_DELTAS
+from src.game.incremental_state import IncrementalGameState
+from src.game.constants import *
+
+def _bfs_areas(game):
+    """Áreas de referência: BFS célula a célula, cauda livre depois da primeira jogada, limitadas a len(snake)"""
+    body = set(game.snake)
+    body.discard(game.snake[-1])
+    length = len(game.snake)
+
+    def free(pt):
+        return 0 <= pt.x < game.grid_width and 0 <= pt.y < game.grid_height and pt not in body
+
+    areas = []
+    idx = CLOCK_WISE.index(game.direction)
+    for turn in (0, 1, 3):
+        dx, dy = CLOCK_WISE_DELTAS[(idx + turn) % 4]
+        start = Point(game.head.x + dx, game.head.y + dy)
+        if not free(start) or start == game.snake[-1]:
+            areas.append(0)
+            continue
+        seen = {start}
+        queue = deque([start])
+        while queue and len(seen) < length:
+            pt = queue.popleft()
+            for ndx, ndy in CLOCK_WISE_DELTAS:
+                neighbor = Point(pt.x + ndx, pt.y + ndy)
+                if neighbor not in seen and free(neighbor):
+                    seen.add(neighbor)
+                    queue.append(neighbor)
+        areas.append(min(len(seen), length))
+    return tuple(areas)
+
+def _surviving_action(game, rng):
+    """Jogada que não morre no próximo passo, com preferência pela comida (as cobras crescem)"""
+    idx = CLOCK_WISE.index(game.direction)
+    options = []
+    for action, turn in enumerate((0, 1, 3)):
+        dx, dy = CLOCK_WISE_DELTAS[(idx + turn) % 4]
+        target = Point(game.head.x + dx, game.head.y + dy)
+        if not game.is_collision(target):
+            distance = abs(target.x - game.food.x) + abs(target.y - game.food.y)
+            options.append((distance + rng.random() * 3, action))
+    return min(options)[1] if options else 0
+
+def test_matches_bfs():
+    """Áreas iguais à BFS de referência a cada passo, com reaproveitamento ativo"""
+    print("🧪 Comparando flood fill em bitsets com BFS")
+    print("=" * 50)
+
+    rng = random.Random(0)
+    compared = enclosed = longest = 0
+    total_floods = total_reused = 0
+    for size in (8, 12, 20, 30):
+        game = HeadlessSnakeGame(width=size * GRID_SIZE, height=size * GRID_SIZE, seed=size)
+        reachable = ReachableArea(game)
+        for _ in range(6000):
+            areas = reachable.get_areas()
+            assert areas == _bfs_areas(game), f"{size}x{size}: {areas} != {_bfs_areas(game)}"
+            assert reachable.get_areas() is areas  # cache do passo
+            compared += 1
+            enclosed += max(areas) < len(game.snake)
+            longest = max(longest, len(game.snake))
+
+            _, done, _ = game.play_step(_surviving_action(game, rng))
+            if done:
+                game.reset()
+        total_floods += reachable.floods
+        total_reused += reachable.reused
+
+    assert total_reused > 0, "Nenhum resultado reaproveitado"
+    print(f"✓ {compared} posições iguais à BFS (maior cobra: {longest}, {enclosed} em bolsão)")
+    print(f"✓ {total_floods} floods, {total_reused} jogadas reaproveitadas")
+    return True
+
+def _dies(game, action):
+    """Se a jogada bate (parede, corpo ou cauda) no play_step real; o jogo volta ao estado anterior"""
+    snapshot = game.snapshot()
+    reward, done, _ = game.play_step(action)
+    game.restore(snapshot)
+    return done and reward == REWARD_DEATH
+
+def test_matches_play_step():
+    """Área 0 para as jogadas que morrem de fato, comparando com play_step em snapshot/restore"""
+    print("\n🧪 Comparando áreas com play_step")
+    print("=" * 50)
+
+    # Caso da revisão: virar para a cauda é colisão, não uma célula livre
+    game = HeadlessSnakeGame(seed=0)
+    game.set_snake([Point(5, 5), Point(4, 5), Point(4, 6), Point(5, 6)], Direction.DOWN)
+    reachable = ReachableArea(game)
+    areas = reachable.get_areas()
+    assert areas == (0, 0, 4), areas
+    assert [_dies(game, action) for action in range(3)] == [True, True, False]
+
+    rng = random.Random(1)
+    compared = tail_moves = 0
+    for size in (8, 12, 20):
+        game = HeadlessSnakeGame(width=size * GRID_SIZE, height=size * GRID_SIZE, seed=size)
+        reachable = ReachableArea(game)
+        for _ in range(3000):
+            areas = reachable.get_areas()
+            # Sem o limite de frames: ele encerra a partida sem colisão
+            if game.frame_iteration + 1 <= 100 * len(game.snake):
+                idx = CLOCK_WISE.index(game.direction)
+                for action, turn in enumerate((0, 1, 3)):
+                    dx, dy = CLOCK_WISE_DELTAS[(idx + turn) % 4]
+                    tail_moves += Point(game.head.x + dx, game.head.y + dy) == game.snake[-1]
+                    assert (areas[action] == 0) == _dies(game, action), f"{size}x{size}, jogada {action}: {areas}"
+                    compared += 1
+            _, done, _ = game.play_step(_surviving_action(game, rng))
+            if done:
+                game.reset()
+
+    assert tail_moves > 0, "Nenhuma jogada para a cauda testada"
+    print(f"✓ {compared} jogadas iguais ao play_step ({tail_moves} para a cauda)")
+    return True
+
+def test_simple_points():
+    """Tabela de pontos simples do anel 3x3 (bits N, NE, E, SE, S, SW, W, NW)"""
+    print("\n🧪 Testando pontos simples")
+    print("=" * 50)
+
+    N, NE, E, SE, S, SW, W, NW = (1 << i for i in range(8))
+    assert SIMPLE_POINT[0xFF]                 # Espaço aberto
+    assert SIMPLE_POINT[N | NE | E]           # Canto: N e E continuam ligados por NE
+    assert SIMPLE_POINT[W]                    # Fim de corredor
+    assert not SIMPLE_POINT[N | S]            # Corredor: remover separa N de S
+    assert not SIMPLE_POINT[N | E]            # N e E só se ligavam pela célula removida
+    assert not SIMPLE_POINT[0]                # Célula isolada
+    assert not SIMPLE_POINT[NE]               # Só diagonal: não toca a célula
+    print("✓ Corredores e cantos classificados corretamente")
+    return True
+
+def test_game_info():
+    """get_game_info expõe as áreas e marca bolsões"""
+    print("\n🧪 Testando get_game_info")
+    print("=" * 50)
+
+    game = HeadlessSnakeGame()
+    game_state = IncrementalGameState(game)
+    assert 'reachable_areas' not in game_state.get_game_info(), "Flood fill só quando pedido"
+    info = game_state.get_game_info(reachable=True)
+    assert info['reachable_areas'] == (3, 3, 3) and not info['enclosed']
+
+    # Cabeça no topo, ao lado de uma célula presa entre o corpo e a parede de cima
+    body = [Point(1, 0), Point(1, 1), Point(2, 1), Point(3, 1), Point(3, 0), Point(4, 0), Point(5, 0)]
+    game.set_snake(body, Direction.UP)
+    info = game_state.get_game_info(reachable=True)
+    # Frente: parede; direita: (2, 0), bolsão fechado; esquerda: (0, 0), região aberta
+    assert info['reachable_areas'][0] == 0
+    assert info['reachable_areas'][1] == 1
+    assert info['reachable_areas'][2] == len(body)
+    assert not info['enclosed']
+
+    # Única jogada livre leva à célula presa: a cobra fica sem saída
+    game.set_snake([Point(2, 0), Point(1, 0), Point(1, 1), Point(2, 1), Point(3, 1),
+                    Point(4, 1), Point(4, 0), Point(5, 0)], Direction.RIGHT)
+    info = game_state.get_game_info(reachable=True)
+    assert info['reachable_areas'] == (1, 0, 0) and info['enclosed']
+    print("✓ Áreas por jogada e aviso de bolsão corretos")
+    return True
+
+def main():
+    """Função principal de teste"""
+    print("🚀 Iniciando Testes da Área Alcançável")
+    print("=" * 60)
+
+    tests = [
+        ("Flood fill vs BFS", test_matches_bfs),
+        ("Áreas vs play_step", test_matches_play_step),
+        ("Pontos simples", test_simple_points),
+        ("get_game_info", test_game_info),
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for name, test_func in tests:
+        print(f"\n🧪 Executando: {name}")
+        try:
+            if test_func():
+                print(f"✅ {name}: PASSOU")
+                passed += 1
+            else:
+                print(f"❌ {name}: FALHOU")
+        except Exception as e:
+            print(f"💥 {name}: ERRO - {e}")
+            import traceback
+            traceback.print_exc()
+
+    print(f"\n📊 Resultado Final:")
+    print(f"   Testes passaram: {passed}/{total}")
+
+    return passed == total
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Teste do Motor do Jogo
+======================
+
+Verifica que o motor headless reproduz exatamente o SnakeGame:
+- Mesmas trajetórias, scores e recompensas para a mesma semente
+- Nenhuma importação do pygame no caminho de treinamento
+- Células inteiras e tabelas de vizinhos/raios coerentes com os Points da API
+- snapshot()/restore() voltam exatamente ao mesmo estado (inclusive a próxima comida)
+
+"""
+
+import sys
+import os
+import random
+import subprocess
+import numpy as np
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+# Permite criar o SnakeGame (pygame) em máquinas sem display
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+from src.game.headless_game import HeadlessSnakeGame, Direction, Point
+
+def _rollout(game, seed, steps=2000):
+    """Joga ações aleatórias e registra tudo que o jogo expõe"""
+    random.seed(seed)
+    actions = random.Random(seed + 1)
+    game.reset()
+    history = []
+    for _ in range(steps):
+        reward, done, score = game.play_step(actions.randint(0, 2))
+        history.append((reward, done, score, game.head, game.direction, game.food, len(game.snake)))
+        if done:
+            game.reset()
+    return history
+
+def test_headless_matches_pygame_game():
+    """O motor headless deve produzir a mesma partida que o SnakeGame"""
+    print("🧪 Comparando HeadlessSnakeGame com SnakeGame")
+    print("=" * 50)
+
+    from src.game.snake_game import SnakeGame
+
+    for seed in range(5):
+        assert _rollout(HeadlessSnakeGame(), seed) == _rollout(SnakeGame(), seed), \
+            f"Partidas diferentes para a semente {seed}"
+
+    print("✓ Trajetórias idênticas em 5 sementes")
+    return True
+
+def test_headless_does_not_import_pygame():
+    """O caminho de treinamento headless não pode importar o pygame"""
+    print("\n🧪 Verificando importações do modo headless")
+    print("=" * 50)
+
+    code = (
+        "import sys\n"
+        "from src.game.headless_game import HeadlessSnakeGame\n"
+        "from src.game.game_state import GameState\n"
+        "game = HeadlessSnakeGame()\n"
+        "GameState(game).get_state()\n"
+        "game.play_step([1, 0, 0])\n"
+        "print('pygame' in sys.modules)\n"
+    )
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__)))
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == 'False', "pygame foi importado pelo motor headless"
+
+    print("✓ pygame não foi importado")
+    return True
+
+def test_set_snake():
+    """set_snake deve posicionar a cobra e manter a comida fora do corpo"""
+    print("\n🧪 Testando set_snake")
+    print("=" * 50)
+
+    game = HeadlessSnakeGame()
+    body = [Point(x, 5) for x in range(20, 0, -1)]
+    game.set_snake(body, Direction.RIGHT)
+
+    assert game.head == Point(20, 5)
+    assert len(game.snake) == 20
+    assert game.food not in game.snake
+    assert game.is_collision(Point(10, 5))
+    assert not game.is_collision(Point(21, 5))
+
+    print("✓ Cobra posicionada corretamente")
+    return True
+
+def test_occupancy_matches_body():
+    """is_collision pela grade de ocupação deve coincidir com a busca no corpo"""
+    print("\n🧪 Testando grade de ocupação")
+    print("=" * 50)
+
+    game = HeadlessSnakeGame()
+    actions = random.Random(7)
+    checked = 0
+    for _ in range(3000):
+        reward, done, score = game.play_step(actions.randint(0, 2))
+        body = list(game.snake)[1:]
+        for x in range(-1, game.grid_width + 1):
+            for y in range(-1, game.grid_height + 1):
+                pt = Point(x, y)
+                out_of_bounds = not (0 <= x < game.grid_width and 0 <= y < game.grid_height)
+                expected = out_of_bounds or pt in body
+                assert game.is_collision(pt) == expected, f"Divergência em {pt}"
+                checked += 1
+        if done:
+            game.reset()
+
+    print(f"✓ {checked} consultas de colisão conferidas")
+    return True
+
+def test_food_placement():
+    """Comida sempre em célula livre, reproduzível com seed e sem recursão com o tabuleiro cheio"""
+    print("\n🧪 Testando posicionamento da comida")
+    print("=" * 50)
+
+    # Mesma seed, mesma sequência de comidas
+    foods = []
+    for _ in range(2):
+        game = HeadlessSnakeGame(seed=123)
+        actions = random.Random(3)
+        sequence = []
+        for _ in range(2000):
+            reward, done, score = game.play_step(actions.randint(0, 2))
+            assert game.food not in list(game.snake)[1:] or done
+            sequence.append(game.food)
+            if done:
+                game.reset()
+        foods.append(sequence)
+    assert foods[0] == foods[1], "Sequência de comidas não é reproduzível"
+    print("✓ Sequência de comidas reproduzível com seed")
+
+    # Tabuleiro 4x4 quase cheio: a comida só pode ir para a última célula livre
+    from benchmark_engine import hamiltonian_cycle, cycle_action_table, place_snake_on_cycle
+    game = HeadlessSnakeGame(width=80, height=80, seed=1)
+    cycle = hamiltonian_cycle(game.grid_width, game.grid_height)
+    place_snake_on_cycle(game, cycle, len(cycle) - 1)
+    assert game.food == cycle[-1]
+    print("✓ Comida na única célula livre")
+
+    # Comer a última comida enche o tabuleiro e encerra a partida
+    reward, done, score = game.play_step(cycle_action_table(cycle)[(game.head, game.direction)])
+    assert done and score == 1 and len(game.snake) == len(cycle)
+    print("✓ Tabuleiro cheio encerra a partida")
+    return True
+
+def test_cell_tables():
+    """Tabelas por célula e células internas (head_cell, food_cell) batem com os Points"""
+    print("\n🧪 Testando células inteiras e tabelas")
+    print("=" * 50)
+
+    game = HeadlessSnakeGame(width=200, height=120)
+    tables = game.tables
+    width, height = game.grid_width, game.grid_height
+    deltas = [(1, 0), (0, 1), (-1, 0), (0, -1)]
+    for cell, pt in enumerate(tables.points):
+        assert pt == Point(cell % width, cell // width)
+        for d, (dx, dy) in enumerate(deltas):
+            ray = []
+            x, y = pt.x + dx, pt.y + dy
+            while 0 <= x < width and 0 <= y < height:
+                ray.append(y * width + x)
+                x, y = x + dx, y + dy
+            assert tables.rays[cell][d] == tuple(ray)
+            assert tables.neighbors[cell][d] == (ray[0] if ray else -1)
+            assert tables.wall_distance[cell][d] == len(ray)
+    assert HeadlessSnakeGame(width=200, height=120).tables is tables  # Compartilhadas por tamanho
+    print(f"✓ Vizinhos, raios e distâncias até a borda de {len(tables.points)} células")
+
+    actions = random.Random(11)
+    for _ in range(3000):
+        reward, done, score = game.play_step(actions.randint(0, 2))
+        if not done:
+            # Cabeça e comida são os Points da tabela, sem alocação por passo
+            assert game.head is tables.points[game.head_cell]
+            assert game.food is tables.points[game.food_cell]
+        else:
+            game.reset()
+    game.food = Point(1, 2)
+    assert game.food_cell == 2 * width + 1
+    print("✓ head_cell/food_cell coerentes com head/food")
+    return True
+
+def _game_fields(game):
+    """Tudo que define a partida, para comparar estados"""
+    return (list(game.snake), game.head, game.head_cell, game.direction, game.food, game.food_cell,
+            game.score, game.frame_iteration, game.previous_head, bytes(game._occupancy),
+            list(game._free_cells), list(game._free_pos), list(game.row_bits), list(game.col_bits))
+
+def test_snapshot_restore():
+    """Simular jogadas a partir de um snapshot e voltar: mesmo estado e mesma continuação"""
+    print("\n🧪 Testando snapshot/restore")
+    print("=" * 50)
+
+    from src.game.incremental_state import IncrementalGameState
+    from src.game.game_state import GameState
+
+    game = HeadlessSnakeGame(seed=21)
+    incremental = IncrementalGameState(game)
+    actions = random.Random(21)
+    checked = 0
+    for _ in range(300):
+        # Avançar a partida real alguns passos
+        for _ in range(actions.randint(1, 10)):
+            reward, done, score = game.play_step(actions.randint(0, 2))
+            if done:
+                game.reset()
+        incremental.get_state()
+
+        snapshot = game.snapshot()
+        before = _game_fields(game)
+        plan = [actions.randint(0, 2) for _ in range(20)]
+
+        # Duas simulações a partir do mesmo snapshot devem ser idênticas (comida e colisões inclusas)
+        outcomes = []
+        for _ in range(2):
+            game.restore(snapshot)
+            assert _game_fields(game) == before
+            # Cache por passo não pode devolver o estado de antes do restore
+            assert np.array_equal(incremental.get_state(), GameState(game).get_state())
+            trajectory = []
+            for action in plan:
+                result = game.play_step(action)
+                trajectory.append((result, game.head, game.food))
+                if result[1]:
+                    break
+            outcomes.append(trajectory)
+        assert outcomes[0] == outcomes[1]
+        game.restore(snapshot)
+        checked += 1
+
+    print(f"✓ {checked} snapshots restaurados e simulados de forma idêntica")
+    return True
+
+def main():
+    """Função principal de teste"""
+    print("🚀 Iniciando Testes do Motor do Jogo")
+    print("=" * 60)
+
+    tests = [
+        ("Headless = SnakeGame", test_headless_matches_pygame_game),
+        ("Headless sem pygame", test_headless_does_not_import_pygame),
+        ("set_snake", test_set_snake),
+        ("Grade de ocupação", test_occupancy_matches_body),
+        ("Posicionamento da comida", test_food_placement),
+        ("Células e tabelas", test_cell_tables),
+        ("snapshot/restore", test_snapshot_restore),
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for name, test_func in tests:
+        print(f"\n🧪 Executando: {name}")
+        try:
+            if test_func():
+                print(f"✅ {name}: PASSOU")
+                passed += 1
+            else:
+                print(f"❌ {name}: FALHOU")
+        except Exception as e:
+            print(f"💥 {name}: ERRO - {e}")
+            import traceback
+            traceback.print_exc()
+
+    print(f"\n📊 Resultado Final:")
+    print(f"   Testes passaram: {passed}/{total}")
+
+    return passed == total
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Teste do Codificador em Grade
+=============================
+
+Verifica que GridEncoder gera a imagem (C, H, W) esperada:
+- Canais de corpo, cabeça, comida e idade iguais a uma montagem a partir do corpo
+- Lote do BatchSnakeEnv igual à codificação de cada partida isolada
+- Sempre o mesmo buffer (sem realocação), compartilhado com torch.from_numpy
+
+"""
+
+import sys
+import os
+import random
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+import numpy as np
+from src.game.headless_game import HeadlessSnakeGame, Point
+from src.game.batch_env import BatchSnakeEnv, CLOCK_WISE
+from src.game.grid_encoder import GridEncoder, BODY_CHANNEL, HEAD_CHANNEL, FOOD_CHANNEL, AGE_CHANNEL
+from src.game.constants import *
+
+def _reference_planes(game):
+    """Imagem de referência montada segmento a segmento (cabeça primeiro)"""
+    planes = np.zeros((4, game.grid_height, game.grid_width), dtype=np.float32)
+    length = len(game.snake)
+    for i, pt in reversed(list(enumerate(game.snake))):
+        if 0 <= pt.x < game.grid_width and 0 <= pt.y < game.grid_height:
+            if i > 0:
+                planes[BODY_CHANNEL, pt.y, pt.x] = 1.0
+            planes[AGE_CHANNEL, pt.y, pt.x] = (length - i) / length
+    head = game.head
+    if 0 <= head.x < game.grid_width and 0 <= head.y < game.grid_height:
+        planes[HEAD_CHANNEL, head.y, head.x] = 1.0
+    planes[FOOD_CHANNEL, game.food.y, game.food.x] = 1.0
+    return planes
+
+def _food_seeking_action(game, rng):
+    """Jogada que não morre no próximo passo, com preferência pela comida (as cobras crescem)"""
+    if rng.random() < 0.05:
+        return rng.randint(0, 2)
+    idx = CLOCK_WISE.index(game.direction)
+    options = []
+    for action, turn in enumerate((0, 1, 3)):
+        dx, dy = [(1, 0), (0, 1), (-1, 0), (0, -1)][(idx + turn) % 4]
+        target = Point(game.head.x + dx, game.head.y + dy)
+        if not game.is_collision(target):
+            options.append((abs(target.x - game.food.x) + abs(target.y - game.food.y) + rng.random(), action))
+    return min(options)[1] if options else 0
+
+def test_single_game():
+    """Partidas com busca de comida: canais iguais à referência a cada passo, no mesmo buffer"""
+    print("🧪 Codificando partidas isoladas")
+    print("=" * 50)
+
+    game = HeadlessSnakeGame(seed=0)
+    encoder = GridEncoder(age_channel=True)
+    plain = GridEncoder()
+    buffer = encoder.buffer
+    rng = random.Random(0)
+    longest = 0
+
+    for _ in range(3000):
+        planes = encoder.encode(game)
+        assert planes.shape == (4, GRID_HEIGHT, GRID_WIDTH) and planes.dtype == np.float32
+        assert np.array_equal(planes, _reference_planes(game))
+        assert np.array_equal(plain.encode(game), planes[:3])
+        assert encoder.buffer is buffer and np.shares_memory(planes, buffer)
+        longest = max(longest, len(game.snake))
+
+        _, done, _ = game.play_step(_food_seeking_action(game, rng))
+        if done:
+            # Estado final (cabeça fora do tabuleiro ou sobre o corpo) também precisa codificar
+            assert np.array_equal(encoder.encode(game), _reference_planes(game))
+            game.reset()
+
+    print(f"✓ 3000 passos com canais idênticos à referência (maior cobra: {longest})")
+    return True
+
+def test_batch_env():
+    """encode_batch deve ser igual a encode de cada partida do lote"""
+    print("\n🧪 Codificando o lote do BatchSnakeEnv")
+    print("=" * 50)
+
+    num_envs = 32
+    env = BatchSnakeEnv(num_envs, seed=1)
+    encoder = GridEncoder(num_boards=num_envs, age_channel=True)
+    single = GridEncoder(age_channel=True)
+    game = HeadlessSnakeGame()
+    rng = np.random.default_rng(1)
+
+    for _ in range(300):
+        batch = encoder.encode_batch(env)
+        assert batch is encoder.buffer and batch.shape == (num_envs, 4, GRID_HEIGHT, GRID_WIDTH)
+        for i in range(num_envs):
+            game.set_snake(env.get_snake(i), CLOCK_WISE[env.directions[i]])
+            game.food = Point(int(env.food[i, 0]), int(env.food[i, 1]))
+            assert np.array_equal(batch[i], single.encode(game)), f"Partida {i} divergiu"
+        env.step(rng.choice([0, 0, 0, 1, 2], size=num_envs))
+
+    print(f"✓ 300 passos x {num_envs} partidas idênticos à codificação isolada")
+    return True
+
+def test_zero_copy_tensor():
+    """Um tensor criado uma vez com torch.from_numpy enxerga as novas codificações"""
+    print("\n🧪 Testando saída sem cópia")
+    print("=" * 50)
+
+    try:
+        import torch
+    except ImportError:
+        print("⚠️  torch não instalado, teste ignorado")
+        return True
+
+    env = BatchSnakeEnv(4, seed=2)
+    encoder = GridEncoder(num_boards=4)
+    tensor = torch.from_numpy(encoder.buffer)
+    for _ in range(10):
+        encoder.encode_batch(env)
+        assert torch.equal(tensor, torch.from_numpy(encoder.buffer.copy()))
+        env.step(np.zeros(4, dtype=np.int64))
+    assert tensor.data_ptr() == encoder.buffer.ctypes.data
+    print("✓ Tensor compartilha a memória do buffer")
+    return True
+
+def main():
+    """Função principal de teste"""
+    print("🚀 Iniciando Testes do Codificador em Grade")
+    print("=" * 60)
+
+    tests = [
+        ("Partida isolada", test_single_game),
+        ("Lote", test_batch_env),
+        ("Saída sem cópia", test_zero_copy_tensor),
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for name, test_func in tests:
+        print(f"\n🧪 Executando: {name}")
+        try:
+            if test_func():
+                print(f"✅ {name}: PASSOU")
+                passed += 1
+            else:
+                print(f"❌ {name}: FALHOU")
+        except Exception as e:
+            print(f"💥 {name}: ERRO - {e}")
+            import traceback
+            traceback.print_exc()
+
+    print(f"\n📊 Resultado Final:")
+    print(f"   Testes passaram: {passed}/{total}")
+
+    return passed == total
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
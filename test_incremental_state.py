@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Teste do Extrator Incremental de Estado
+=======================================
+
+Verifica que IncrementalGameState.get_state produz exatamente o mesmo vetor
+de 28 features que GameState.get_state:
+- Em partidas aleatórias (incluindo os estados finais com colisão)
+- Em cobras longas posicionadas com set_snake
+- Com as bitboards do jogo sempre iguais a uma varredura do corpo
+- Cache por passo: get_state/get_game_info calculados uma vez e sempre atuais
+
+"""
+
+import sys
+import os
+import random
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+import numpy as np
+from src.game.headless_game import HeadlessSnakeGame, Direction, Point
+from src.game.game_state import GameState
+from src.game.incremental_state import IncrementalGameState
+from src.game.constants import *
+from benchmark_engine import hamiltonian_cycle, place_snake_on_cycle
+
+def _assert_same_state(game, reference, incremental, context):
+    expected = reference.get_state()
+    state = incremental.get_state()
+    assert state.dtype == np.float32 and state.shape == (STATE_SIZE,)
+    assert np.array_equal(state, expected), \
+        f"{context}: features divergentes {np.flatnonzero(state != expected).tolist()}"
+
+def _assert_bitboards(game):
+    """row_bits/col_bits devem marcar exatamente as células do corpo dentro do tabuleiro"""
+    rows = [0] * game.grid_height
+    cols = [0] * game.grid_width
+    for pt in game.snake:
+        if 0 <= pt.x < game.grid_width and 0 <= pt.y < game.grid_height:
+            rows[pt.y] |= 1 << pt.x
+            cols[pt.x] |= 1 << pt.y
+    assert game.row_bits == rows and game.col_bits == cols, "Bitboards fora de sincronia com o corpo"
+
+def _food_seeking_action(game, state, rng):
+    """Evita perigos imediatos e busca a comida, para as cobras crescerem"""
+    if rng.random() < 0.1:
+        return rng.randint(0, 2)
+    safe = [a for a in range(3) if not state[a]]
+    if not safe:
+        return 0
+    clock_wise = [Direction.RIGHT, Direction.DOWN, Direction.LEFT, Direction.UP]
+    idx = clock_wise.index(game.direction)
+    best = None
+    for a in safe:
+        d = clock_wise[(idx + [0, 1, 3][a]) % 4]
+        dx, dy = {Direction.RIGHT: (1, 0), Direction.DOWN: (0, 1), Direction.LEFT: (-1, 0), Direction.UP: (0, -1)}[d]
+        distance = abs(game.head.x + dx - game.food.x) + abs(game.head.y + dy - game.food.y) + rng.random()
+        if best is None or distance < best[0]:
+            best = (distance, a)
+    return best[1]
+
+def test_random_rollouts():
+    """Partidas aleatórias e com busca de comida: mesmo estado a cada passo"""
+    print("🧪 Comparando estados em partidas aleatórias")
+    print("=" * 50)
+
+    rng = random.Random(0)
+    game = HeadlessSnakeGame(seed=0)
+    reference = GameState(game)
+    incremental = IncrementalGameState(game)
+    compared = 0
+    games = 0
+    longest = 0
+
+    while compared < 60000:
+        state = incremental.get_state()
+        _assert_same_state(game, reference, incremental, f"passo {compared}")
+        action = _food_seeking_action(game, state, rng) if games % 2 else rng.choice([0, 0, 0, 1, 2])
+        _, done, _ = game.play_step(action)
+        compared += 1
+        longest = max(longest, len(game.snake))
+        if done:
+            # Estado final (cabeça na parede ou no corpo) também precisa coincidir
+            _assert_same_state(game, reference, incremental, f"fim da partida {games}")
+            game.reset()
+            games += 1
+        if compared % 1000 == 0:
+            _assert_bitboards(game)
+
+    print(f"✓ {compared} estados idênticos em {games} partidas (maior cobra: {longest})")
+    return True
+
+def test_long_snakes():
+    """Cobras longas (até quase encher o tabuleiro) em posições variadas"""
+    print("\n🧪 Comparando estados com cobras longas")
+    print("=" * 50)
+
+    rng = random.Random(1)
+    game = HeadlessSnakeGame(seed=1)
+    reference = GameState(game)
+    incremental = IncrementalGameState(game)
+    cycle = hamiltonian_cycle(game.grid_width, game.grid_height)
+    compared = 0
+
+    for _ in range(300):
+        length = rng.randint(4, len(cycle) - 2)
+        start = rng.randrange(len(cycle))
+        rotated = cycle[start:] + cycle[:start]
+        place_snake_on_cycle(game, rotated, length)
+        _assert_bitboards(game)
+        # Alguns passos aleatórios a partir da posição (inclui colisões)
+        for _ in range(20):
+            _assert_same_state(game, reference, incremental, f"tamanho {length}")
+            compared += 1
+            _, done, _ = game.play_step(rng.randint(0, 2))
+            if done:
+                _assert_same_state(game, reference, incremental, f"fim com tamanho {length}")
+                break
+        _assert_bitboards(game)
+
+    print(f"✓ {compared} estados idênticos com cobras de 4 a {len(cycle) - 2} segmentos")
+    return True
+
+def test_other_board_sizes():
+    """Tabuleiros de outro tamanho usam o cálculo original (mesmo resultado por definição)"""
+    print("\n🧪 Tabuleiro menor que a grade padrão")
+    print("=" * 50)
+
+    rng = random.Random(2)
+    game = HeadlessSnakeGame(200, 200, seed=2)
+    reference = GameState(game)
+    incremental = IncrementalGameState(game)
+    for _ in range(2000):
+        _assert_same_state(game, reference, incremental, "tabuleiro 10x10")
+        _, done, _ = game.play_step(rng.randint(0, 2))
+        if done:
+            game.reset()
+    print("✓ 2000 estados idênticos em tabuleiro 10x10")
+    return True
+
+def test_step_cache():
+    """Várias leituras no mesmo passo calculam uma vez só e batem com o GameState original"""
+    print("\n🧪 Testando cache por passo")
+    print("=" * 50)
+
+    rng = random.Random(3)
+    game = HeadlessSnakeGame(seed=3)
+    reference = GameState(game)
+    incremental = IncrementalGameState(game)
+
+    computed = []
+    compute = incremental._compute
+    incremental._compute = lambda: computed.append(1) or compute()
+
+    steps = 0
+    for _ in range(5000):
+        # Mesmo padrão do Trainer: estado, informações para recompensa, estado de novo
+        state = incremental.get_state()
+        info = incremental.get_game_info(reachable=True)
+        assert incremental.get_state() is state
+        if 0 <= game.head.x < game.grid_width and 0 <= game.head.y < game.grid_height:
+            assert info == reference.get_game_info(reachable=True), "get_game_info divergiu do GameState"
+        assert np.array_equal(state, reference.get_state())
+
+        _, done, _ = game.play_step(_food_seeking_action(game, state, rng))
+        steps += 1
+        if done:
+            incremental.get_state()
+            game.reset()
+            steps += 1  # O reset também é uma posição nova
+
+    assert len(computed) == steps, f"{len(computed)} cálculos para {steps} posições"
+    print(f"✓ Um cálculo por posição ({steps} posições), resultados iguais ao GameState")
+
+    # Alterações por fora de play_step exigem invalidate()
+    state = incremental.get_state()
+    free = game._free_cells[0]
+    game.food = Point(free % game.grid_width, free // game.grid_width)
+    incremental.invalidate()
+    assert np.array_equal(incremental.get_state(), reference.get_state())
+    print("✓ invalidate() recalcula após mudança manual da comida")
+    return True
+
+def main():
+    """Função principal de teste"""
+    print("🚀 Iniciando Testes do Extrator Incremental de Estado")
+    print("=" * 60)
+
+    tests = [
+        ("Partidas aleatórias", test_random_rollouts),
+        ("Cobras longas", test_long_snakes),
+        ("Outros tamanhos", test_other_board_sizes),
+        ("Cache por passo", test_step_cache),
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for name, test_func in tests:
+        print(f"\n🧪 Executando: {name}")
+        try:
+            if test_func():
+                print(f"✅ {name}: PASSOU")
+                passed += 1
+            else:
+                print(f"❌ {name}: FALHOU")
+        except Exception as e:
+            print(f"💥 {name}: ERRO - {e}")
+            import traceback
+            traceback.print_exc()
+
+    print(f"\n📊 Resultado Final:")
+    print(f"   Testes passaram: {passed}/{total}")
+
+    return passed == total
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
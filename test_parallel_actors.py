@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Teste dos Atores em Processos
+=============================
+
+Verifica o ParallelActorTrainer e a memória compartilhada dos pesos:
+- Layout dos pesos igual ao state_dict do DQN
+- SharedWeights: ida e volta dos pesos, versões e leitura no meio de uma escrita
+- Workers jogam, as transições chegam à memória de replay e o aprendiz treina
+- Processos encerrados e memória compartilhada liberada no fim
+- Workers criados com spawn; com o escudo, só morrem sem jogada viva
+
+"""
+
+import sys
+import os
+import random
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+import numpy as np
+import torch
+from multiprocessing import shared_memory
+from src.ai.neural_network import DQN
+from src.ai.numpy_policy import NumpyDQN
+from src.ai.parallel_actors import ParallelActorTrainer, SharedWeights, weight_layout, _choose_action
+from src.game.headless_game import HeadlessSnakeGame, Point, CLOCK_WISE, CLOCK_WISE_DELTAS
+from src.game.incremental_state import IncrementalGameState
+from src.game.constants import *
+
+def test_shared_weights():
+    """Pesos escritos pelo aprendiz e lidos por outro handle do mesmo bloco"""
+    print("🧪 Testando pesos em memória compartilhada")
+    print("=" * 50)
+
+    torch.manual_seed(0)
+    model = DQN()
+    state_dict = model.state_dict()
+    layout = weight_layout()
+    assert [name for name, _, _ in layout] == list(state_dict.keys())
+    assert all(tuple(state_dict[name].shape) == shape for name, shape, _ in layout)
+
+    writer = SharedWeights(layout)
+    reader = SharedWeights(layout, name=writer.name)
+    try:
+        assert reader.version == 0
+        writer.write(state_dict)
+        version, weights = reader.read(-1)
+        assert version == 2
+        for name, tensor in state_dict.items():
+            assert np.array_equal(weights[name], tensor.numpy())
+        assert reader.read(version) is None, "Versão já conhecida não deve ser relida"
+
+        # Mesma saída que o NumpyDQN montado direto do state_dict
+        states = np.random.default_rng(0).random((16, STATE_SIZE), dtype=np.float32)
+        assert np.allclose(NumpyDQN(weights)(states), NumpyDQN(state_dict)(states))
+
+        # Escrita em andamento (versão ímpar): o leitor descarta
+        writer._version[0] += 1
+        assert reader.read(version) is None
+        writer._version[0] += 1
+        assert reader.read(version)[0] == version + 2
+    finally:
+        reader.close()
+        writer.close()
+        writer.unlink()
+    print("✓ Layout, versões e seqlock corretos")
+    return True
+
+def test_workers_and_learner():
+    """Workers jogam, a memória recebe os blocos e o aprendiz atualiza os pesos compartilhados"""
+    print("\n🧪 Rodando workers e aprendiz")
+    print("=" * 50)
+
+    torch.manual_seed(0)
+    trainer = ParallelActorTrainer(num_workers=2, seed=0, sync_every=5, flush_every=32)
+    name = trainer.shared.name
+    try:
+        stats = trainer.run(duration=4.0)
+        assert stats['steps'] > 0 and stats['updates'] > 0, stats
+        assert stats['steps'] % 32 == 0, "Blocos incompletos"
+        assert not trainer._processes
+        memory = trainer.agent.memory
+        assert len(memory) == min(stats['steps'], memory.capacity)
+        assert np.all(np.isin(memory.actions[:len(memory)], [0, 1, 2]))
+        assert trainer.agent.n_games == len(trainer.agent.scores) == stats['games']
+        assert trainer.shared.version == 2 * (1 + stats['updates'] // 5)
+
+        # Pesos compartilhados iguais aos da última publicação do aprendiz
+        _, weights = trainer.shared.read(-1)
+        assert weights['fc1.weight'].shape == (HIDDEN_SIZE, STATE_SIZE)
+
+        # Segunda rodada só de atores: nenhuma atualização
+        more = trainer.run(duration=1.0, learn=False)
+        assert more['updates'] == 0 and more['steps'] > 0
+    finally:
+        trainer.close()
+
+    try:
+        shared_memory.SharedMemory(name=name)
+        assert False, "Memória compartilhada não foi liberada"
+    except FileNotFoundError:
+        pass
+    print(f"✓ {stats['steps']} passos, {stats['updates']} atualizações, {stats['games']} partidas")
+    return True
+
+def test_worker_shield():
+    """Escolha do worker com escudo: colisões só sem jogada viva; trainer com escudo e spawn"""
+    print("\n🧪 Escudo de segurança nos workers")
+    print("=" * 50)
+
+    torch.manual_seed(4)
+    policy = NumpyDQN(DQN().state_dict())
+    game = HeadlessSnakeGame(seed=4)
+    game_state = IncrementalGameState(game)
+    rng = random.Random(4)
+    collisions = 0
+    for step in range(3000):
+        idx = CLOCK_WISE.index(game.direction)
+        alive = [turn for turn in (0, 1, 3)
+                 if not game.is_collision(Point(game.head.x + CLOCK_WISE_DELTAS[(idx + turn) % 4][0],
+                                                game.head.y + CLOCK_WISE_DELTAS[(idx + turn) % 4][1]))]
+        starved = game.frame_iteration + 1 > 100 * len(game.snake)  # Fim por tempo, não por colisão
+        state = game_state.get_state()
+        action = _choose_action(game, game_state, policy, state, rng, 1.0 if step % 2 else 0.0, True)
+        _, done, _ = game.play_step(action)
+        if done:
+            if not starved:
+                collisions += 1
+                assert not alive, f"Worker morreu no passo {step} com jogadas vivas"
+            game.reset()
+    print(f"✓ {collisions} colisões em 3000 passos, todas sem jogada viva")
+
+    trainer = ParallelActorTrainer(num_workers=1, seed=4, flush_every=32, safety_shield=True)
+    try:
+        assert trainer.context.get_start_method() == 'spawn'
+        stats = trainer.run(duration=2.0, learn=False)
+        assert stats['steps'] > 0, stats
+    finally:
+        trainer.close()
+    print(f"✓ Worker spawn com escudo: {stats['steps']} passos")
+    return True
+
+def main():
+    """Função principal de teste"""
+    print("🚀 Iniciando Testes dos Atores em Processos")
+    print("=" * 60)
+
+    tests = [
+        ("Pesos compartilhados", test_shared_weights),
+        ("Workers e aprendiz", test_workers_and_learner),
+        ("Escudo nos workers", test_worker_shield),
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for name, test_func in tests:
+        print(f"\n🧪 Executando: {name}")
+        try:
+            if test_func():
+                print(f"✅ {name}: PASSOU")
+                passed += 1
+            else:
+                print(f"❌ {name}: FALHOU")
+        except Exception as e:
+            print(f"💥 {name}: ERRO - {e}")
+            import traceback
+            traceback.print_exc()
+
+    print(f"\n📊 Resultado Final:")
+    print(f"   Testes passaram: {passed}/{total}")
+
+    return passed == total
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Teste do Treino Populacional
+============================
+
+Verifica o pbt.py e o que ele usa do agente:
+- Agent.checkpoint/load_checkpoint levam rede, rede alvo e estado do Adam
+  (em memória e pelo arquivo de save_model/load_model)
+- Perturbação dos hiperparâmetros e pesos por componente das recompensas
+- Vitória com tabuleiro cheio pesa como comida, não como morte
+- exploit_fraction validada; piores e doadores nunca se sobrepõem
+- Uma rodada com 2 membros: o pior fica com os pesos e o otimizador do melhor
+  e com os hiperparâmetros dele perturbados
+
+"""
+
+import sys
+import os
+import random
+import tempfile
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+import numpy as np
+import torch
+from src.ai.agent import Agent
+from src.ai.pbt import (PopulationTrainer, default_hyperparameters, perturb,
+                        checkpoint_to_bytes, checkpoint_from_bytes)
+from src.ai.rewards import weighted_reward
+from src.game.constants import *
+
+def _trained_agent(seed):
+    """Agente com algumas atualizações (estado do Adam preenchido)"""
+    torch.manual_seed(seed)
+    rng = np.random.default_rng(seed)
+    agent = Agent(target_network=True)
+    for _ in range(BATCH_SIZE):
+        action = [0, 0, 0]
+        action[int(rng.integers(3))] = 1
+        agent.remember(rng.random(STATE_SIZE), action, float(rng.normal()), rng.random(STATE_SIZE), False)
+    for _ in range(3):
+        agent.train_long_memory()
+    agent.n_games = 7
+    return agent
+
+def _same_state(first, second):
+    """Compara state_dicts do otimizador ou da rede (tensores e números aninhados)"""
+    if isinstance(first, dict):
+        return first.keys() == second.keys() and all(_same_state(first[key], second[key]) for key in first)
+    if isinstance(first, (list, tuple)):
+        return len(first) == len(second) and all(_same_state(a, b) for a, b in zip(first, second))
+    if isinstance(first, torch.Tensor):
+        return torch.equal(first, second)
+    return first == second
+
+def test_checkpoint_transfer():
+    """Checkpoint em bytes: pesos, rede alvo e Adam iguais; lr e estatísticas do destino mantidos"""
+    print("🧪 Transferência de checkpoint em memória")
+    print("=" * 50)
+
+    source = _trained_agent(0)
+    target = Agent(target_network=True)
+    target.trainer.set_learning_rate(0.0005)
+    target.load_checkpoint(checkpoint_from_bytes(checkpoint_to_bytes(source.checkpoint())), statistics=False)
+
+    assert _same_state(target.model.state_dict(), source.model.state_dict())
+    assert _same_state(target.trainer.target_model.state_dict(), source.trainer.target_model.state_dict())
+    source_adam = source.trainer.optimizer.state_dict()['state']
+    assert _same_state(target.trainer.optimizer.state_dict()['state'], source_adam) and source_adam
+    assert target.trainer.lr == 0.0005
+    assert all(group['lr'] == 0.0005 for group in target.trainer.optimizer.param_groups)
+    assert target.n_games == 0
+    print("✓ Rede, rede alvo e estado do Adam copiados; lr e n_games do destino mantidos")
+
+    # O arquivo de save_model é o mesmo checkpoint: load_model agora também restaura o Adam
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'model.pth')
+        source.save_model(path)
+        loaded = Agent(target_network=True)
+        assert loaded.load_model(path)
+    assert _same_state(loaded.trainer.optimizer.state_dict()['state'], source_adam)
+    assert loaded.n_games == 7
+    print("✓ save_model/load_model com o estado do otimizador")
+    return True
+
+def test_perturb_and_reward_weights():
+    """Fatores aplicados a cada hiperparâmetro; pesos 1 não mudam a recompensa"""
+    print("\n🧪 Perturbação e pesos das recompensas")
+    print("=" * 50)
+
+    base = default_hyperparameters()
+    for seed in range(20):
+        perturbed = perturb(base, random.Random(seed), factors=(0.8, 1.2))
+        assert perturbed['lr'] in (LEARNING_RATE * 0.8, LEARNING_RATE * 1.2)
+        assert 0 < perturbed['gamma'] <= 0.999
+        assert isinstance(perturbed['epsilon_games'], int) and perturbed['epsilon_games'] >= 1
+        assert set(perturbed['reward_weights'].values()) <= {0.8, 1.2}
+    assert perturb(base, random.Random(3)) == perturb(base, random.Random(3))
+    assert base == default_hyperparameters(), "perturb alterou o original"
+    print("✓ Hiperparâmetros perturbados dentro dos limites, original intacto")
+
+    ones = {'food': 1.0, 'death': 1.0, 'shaping': 1.0}
+    weights = {'food': 2.0, 'death': 0.5, 'shaping': 0.0}
+    assert weighted_reward(REWARD_FOOD, REWARD_FOOD + 3, False, ones) == REWARD_FOOD + 3
+    assert weighted_reward(REWARD_FOOD, REWARD_FOOD + 3, False, weights) == 2 * REWARD_FOOD
+    assert weighted_reward(REWARD_DEATH, REWARD_DEATH, True, weights) == 0.5 * REWARD_DEATH
+    assert weighted_reward(REWARD_MOVE, REWARD_MOVE - 1, False, {**ones, 'shaping': 2.0}) == REWARD_MOVE - 2
+    # Tabuleiro cheio: done=True com REWARD_FOOD é vitória
+    assert weighted_reward(REWARD_FOOD, REWARD_FOOD, True, weights) == 2 * REWARD_FOOD
+    print("✓ Pesos de comida, morte e modelagem aplicados por componente (vitória conta como comida)")
+    return True
+
+def test_exploit_selection():
+    """Frações fora de (0, 0.5] recusadas; piores e doadores sempre disjuntos"""
+    print("\n🧪 Seleção do exploit")
+    print("=" * 50)
+
+    for fraction in (0, 0.75, 1.0):
+        try:
+            PopulationTrainer(population=4, exploit_fraction=fraction)
+            return False
+        except ValueError:
+            pass
+    print("✓ exploit_fraction fora de (0, 0.5]: ValueError")
+
+    for population in (2, 3, 4, 5, 8):
+        trainer = PopulationTrainer(population=population, exploit_fraction=0.5, seed=population)
+        # Sem processos: checkpoint vazio, exploit só registrado
+        trainer._request = lambda index, *command: b'' if command[0] == 'checkpoint' else True
+        trainer.scores = [float(score) for score in range(population)]
+        exploited = trainer._exploit_and_explore()
+        members = {member for member, _ in exploited}
+        donors = {donor for _, donor in exploited}
+        assert len(exploited) == population // 2
+        assert not members & donors, f"Membro copiado e doador ao mesmo tempo: {exploited}"
+        assert all(trainer.scores[member] < trainer.scores[donor] for member, donor in exploited)
+    print("✓ Até metade da população copiada, sempre de membros melhores")
+    return True
+
+def test_population_round():
+    """Rodada com 2 membros: o pior recebe o checkpoint do melhor e hiperparâmetros perturbados"""
+    print("\n🧪 Rodada de exploit/explore")
+    print("=" * 50)
+
+    trainer = PopulationTrainer(population=2, interval=2, seed=0)
+    try:
+        record = trainer.run_round()
+        assert len(record['scores']) == 2 and record['steps_per_second'] > 0
+        assert len(record['exploited']) == 1
+        member, donor = record['exploited'][0]
+        assert donor == record['best'] and member != donor
+        assert record['scores'][donor] >= record['scores'][member]
+
+        donor_checkpoint = checkpoint_from_bytes(trainer._request(donor, 'checkpoint'))
+        member_checkpoint = checkpoint_from_bytes(trainer._request(member, 'checkpoint'))
+        assert _same_state(member_checkpoint['model_state_dict'], donor_checkpoint['model_state_dict'])
+        assert _same_state(member_checkpoint['optimizer_state_dict']['state'],
+                           donor_checkpoint['optimizer_state_dict']['state'])
+        assert member_checkpoint['learning_rate'] == trainer.hyperparameters[member]['lr']
+        assert trainer.hyperparameters[member] != trainer.hyperparameters[donor]
+        # Estatísticas continuam do membro
+        assert member_checkpoint['n_games'] == 2
+    finally:
+        trainer.close()
+
+    print(f"✓ Membro {member} copiou o membro {donor}: pesos e Adam iguais, hiperparâmetros perturbados")
+    return True
+
+def main():
+    """Função principal de teste"""
+    print("🚀 Iniciando Testes do Treino Populacional")
+    print("=" * 60)
+
+    tests = [
+        ("Transferência de checkpoint", test_checkpoint_transfer),
+        ("Perturbação e recompensas", test_perturb_and_reward_weights),
+        ("Seleção do exploit", test_exploit_selection),
+        ("Rodada de exploit/explore", test_population_round),
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for name, test_func in tests:
+        print(f"\n🧪 Executando: {name}")
+        try:
+            if test_func():
+                print(f"✅ {name}: PASSOU")
+                passed += 1
+            else:
+                print(f"❌ {name}: FALHOU")
+        except Exception as e:
+            print(f"💥 {name}: ERRO - {e}")
+            import traceback
+            traceback.print_exc()
+
+    print(f"\n📊 Resultado Final:")
+    print(f"   Testes passaram: {passed}/{total}")
+
+    return passed == total
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Teste do Planejador com Busca
+=============================
+
+Verifica o LookaheadPlanner (busca em feixe sobre o DQN):
+- Evita uma jogada que a rede prefere mas que leva a um bolsão sem saída
+- Sem orçamento de tempo joga a ação gulosa do DQN
+- Não altera o jogo real nem o gerador global de números aleatórios
+- Avalia as folhas em lote: uma chamada da rede por camada
+
+"""
+
+import sys
+import os
+import random
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+import numpy as np
+from src.game.headless_game import HeadlessSnakeGame, Direction, Point
+from src.ai.planner import LookaheadPlanner
+from src.ai.agent import Agent
+from src.game.constants import *
+
+class FixedPreferenceAgent:
+    """Agente de teste: os mesmos Q-values para qualquer estado; registra o tamanho de cada lote"""
+    def __init__(self, q):
+        self.q = np.asarray(q, dtype=np.float32)
+        self.batches = []
+
+    def q_values(self, states):
+        self.batches.append(len(states))
+        return np.tile(self.q, (len(states), 1))
+
+def _pocket_game():
+    """Cabeça no topo: frente é parede, direita é uma célula presa, esquerda é a região aberta"""
+    game = HeadlessSnakeGame(seed=0)
+    body = [Point(1, 0), Point(1, 1), Point(2, 1), Point(3, 1), Point(3, 0), Point(4, 0), Point(5, 0)]
+    game.set_snake(body, Direction.UP)
+    game.food = Point(20, 20)
+    return game
+
+def test_avoids_dead_end():
+    """A rede prefere virar à direita (bolsão); a busca escolhe a esquerda"""
+    print("🧪 Evitando bolsão sem saída")
+    print("=" * 50)
+
+    game = _pocket_game()
+    agent = FixedPreferenceAgent([0.0, 1.0, 0.0])
+    planner = LookaheadPlanner(agent, depth=3, time_budget=10.0)
+
+    assert planner.plan(game) == 2, "Busca deveria escolher a esquerda"
+    assert planner.last_depth == 3
+    assert planner.get_action(game) == [0, 0, 1]
+    print(f"✓ Jogada para a região aberta (profundidade {planner.last_depth})")
+
+    # Com uma camada só, a célula presa ainda não mata: fica a preferência da rede
+    shallow = LookaheadPlanner(agent, depth=1, time_budget=10.0)
+    assert shallow.plan(game) == 1
+    print("✓ Com 1 camada segue a preferência da rede")
+    return True
+
+def test_zero_budget_is_greedy():
+    """Sem tempo para uma camada, o planejador devolve a ação gulosa"""
+    print("\n🧪 Orçamento esgotado")
+    print("=" * 50)
+
+    game = _pocket_game()
+    planner = LookaheadPlanner(FixedPreferenceAgent([0.0, 1.0, 0.0]), time_budget=0.0)
+    assert planner.plan(game) == 1
+    assert planner.last_depth == 0 and planner.greedy_fallbacks == 1
+    print("✓ Ação gulosa do DQN quando o tempo acaba")
+    return True
+
+def test_game_untouched():
+    """Jogando com a busca, o jogo real e o random global só mudam pelas jogadas de verdade"""
+    print("\n🧪 Jogo real intacto durante a busca")
+    print("=" * 50)
+
+    random.seed(0)
+    agent = Agent()
+    planner = LookaheadPlanner(agent, depth=3, time_budget=10.0)
+    game = HeadlessSnakeGame()  # Sem seed: a comida usa o módulo random
+    games = 0
+    for _ in range(300):
+        before = game.snapshot()
+        random_state = random.getstate()
+        state = agent.get_state(game)
+        action = planner.get_action(game, state)
+        assert game.snapshot() == before, "Busca alterou o jogo"
+        assert random.getstate() == random_state, "Busca consumiu o random global"
+        assert np.array_equal(agent.get_state(game), state)
+        _, done, _ = game.play_step(action)
+        if done:
+            games += 1
+            game.reset()
+
+    print(f"✓ 300 jogadas ({games} partidas encerradas) sem efeito colateral")
+    return True
+
+def test_batched_leaf_evaluation():
+    """Uma chamada da rede para a raiz e uma por camada, com no máximo beam_width * 3 estados"""
+    print("\n🧪 Avaliação das folhas em lote")
+    print("=" * 50)
+
+    game = HeadlessSnakeGame(seed=3)
+    agent = FixedPreferenceAgent([1.0, 0.5, 0.0])
+    planner = LookaheadPlanner(agent, depth=4, beam_width=5, time_budget=10.0)
+    planner.plan(game)
+    assert planner.last_depth == 4
+    assert len(agent.batches) == 1 + 4, agent.batches
+    assert agent.batches[0] == 1 and agent.batches[1] == 3
+    assert all(size <= 5 * 3 for size in agent.batches)
+    print(f"✓ Lotes por camada: {agent.batches}")
+    return True
+
+def main():
+    """Função principal de teste"""
+    print("🚀 Iniciando Testes do Planejador")
+    print("=" * 60)
+
+    tests = [
+        ("Bolsão sem saída", test_avoids_dead_end),
+        ("Orçamento esgotado", test_zero_budget_is_greedy),
+        ("Jogo intacto", test_game_untouched),
+        ("Folhas em lote", test_batched_leaf_evaluation),
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for name, test_func in tests:
+        print(f"\n🧪 Executando: {name}")
+        try:
+            if test_func():
+                print(f"✅ {name}: PASSOU")
+                passed += 1
+            else:
+                print(f"❌ {name}: FALHOU")
+        except Exception as e:
+            print(f"💥 {name}: ERRO - {e}")
+            import traceback
+            traceback.print_exc()
+
+    print(f"\n📊 Resultado Final:")
+    print(f"   Testes passaram: {passed}/{total}")
+
+    return passed == total
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
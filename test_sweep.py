@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Teste da Varredura de Hiperparâmetros
+=====================================
+
+Verifica o sweep.py:
+- Busca em grade e aleatória geram as combinações pedidas
+- Cada job treina com as próprias constantes, num diretório próprio,
+  sem alterar as constantes deste processo; jobs com erro vão para o fim
+- apply_overrides recusa constantes desconhecidas e módulos já importados
+
+Só importa src.ai.sweep no topo: os processos do pool reimportam este arquivo
+e não podem carregar o treino antes das sobrescritas.
+
+"""
+
+import sys
+import os
+import json
+import tempfile
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from src.ai.sweep import grid_space, random_space, apply_overrides, run_sweep, format_summary
+from src.game import constants
+
+def test_search_spaces():
+    """Grade: produto cartesiano; aleatória: sorteios reprodutíveis dentro dos limites"""
+    print("🧪 Espaços de busca")
+    print("=" * 50)
+
+    jobs = grid_space({'LEARNING_RATE': [0.001, 0.0005], 'GAMMA': [0.9, 0.95, 0.99]})
+    assert len(jobs) == 6
+    assert {'LEARNING_RATE': 0.0005, 'GAMMA': 0.99} in jobs
+    print(f"✓ Grade 2x3: {len(jobs)} jobs")
+
+    space = {'LEARNING_RATE': {'min': 1e-4, 'max': 1e-2, 'log': True},
+             'BATCH_SIZE': {'min': 16, 'max': 128},
+             'REWARD_FOOD': [10, 20]}
+    jobs = random_space(space, 20, seed=1)
+    assert jobs == random_space(space, 20, seed=1)
+    assert all(1e-4 <= job['LEARNING_RATE'] <= 1e-2 for job in jobs)
+    assert all(isinstance(job['BATCH_SIZE'], int) and 16 <= job['BATCH_SIZE'] <= 128 for job in jobs)
+    assert {job['REWARD_FOOD'] for job in jobs} == {10, 20}
+    print("✓ Aleatória: reprodutível com seed, limites e inteiros respeitados")
+
+    for bad in (lambda: grid_space({'GAMMA': {'min': 0.9, 'max': 0.99}}),
+                lambda: random_space({'GAMMA': 0.9}, 1)):
+        try:
+            bad()
+            return False
+        except ValueError:
+            pass
+    print("✓ Especificações inválidas geram ValueError")
+    return True
+
+def test_isolated_jobs():
+    """HIDDEN_SIZE diferente por job aparece no modelo salvo de cada um; o processo pai não muda"""
+    print("\n🧪 Jobs isolados")
+    print("=" * 50)
+    import torch
+
+    jobs = [{'HIDDEN_SIZE': 16}, {'HIDDEN_SIZE': 32}, {'NOT_A_CONSTANT': 1}]
+    with tempfile.TemporaryDirectory() as output_dir:
+        results = run_sweep(jobs, workers=2, max_games=1, output_dir=output_dir)
+        assert len(results) == 3
+        assert 'error' in results[-1] and results[-1]['job'] == 2, "Job com erro deveria ficar no fim"
+
+        for result in results[:2]:
+            assert result['games'] == 1 and result['steps'] > 0 and result['steps_per_second'] > 0
+            assert os.path.dirname(result['output_dir']) == os.path.abspath(output_dir)
+            checkpoint = torch.load(os.path.join(result['output_dir'], 'models', 'model_final.pth'),
+                                    weights_only=False)
+            hidden = checkpoint['model_state_dict']['fc1.weight'].shape[0]
+            assert hidden == result['overrides']['HIDDEN_SIZE'], "Sobrescrita não chegou ao modelo do job"
+            with open(os.path.join(result['output_dir'], 'result.json')) as file:
+                assert json.load(file)['job'] == result['job']
+
+        with open(os.path.join(output_dir, 'summary.json')) as file:
+            assert len(json.load(file)['results']) == 3
+        print(format_summary(results))
+
+    assert constants.HIDDEN_SIZE == 512, "Sobrescrita vazou para o processo pai"
+    print("✓ Cada job com sua rede; constantes do processo pai intactas")
+    return True
+
+def test_override_guards():
+    """Constante desconhecida ou módulo do treino já importado: erro em vez de valor ignorado"""
+    print("\n🧪 Proteções das sobrescritas")
+    print("=" * 50)
+
+    try:
+        apply_overrides({'NOT_A_CONSTANT': 1})
+        return False
+    except ValueError:
+        print("✓ Constante desconhecida: ValueError")
+
+    import src.ai.rewards
+    try:
+        apply_overrides({'REWARD_FOOD': 1})
+        return False
+    except RuntimeError as e:
+        assert 'src.ai.rewards' in str(e)
+    assert constants.REWARD_FOOD == 20
+    print("✓ Módulo já importado com a constante: RuntimeError, nada alterado")
+    return True
+
+def main():
+    """Função principal de teste"""
+    print("🚀 Iniciando Testes da Varredura")
+    print("=" * 60)
+
+    tests = [
+        ("Espaços de busca", test_search_spaces),
+        ("Jobs isolados", test_isolated_jobs),
+        ("Proteções das sobrescritas", test_override_guards),
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for name, test_func in tests:
+        print(f"\n🧪 Executando: {name}")
+        try:
+            if test_func():
+                print(f"✅ {name}: PASSOU")
+                passed += 1
+            else:
+                print(f"❌ {name}: FALHOU")
+        except Exception as e:
+            print(f"💥 {name}: ERRO - {e}")
+            import traceback
+            traceback.print_exc()
+
+    print(f"\n📊 Resultado Final:")
+    print(f"   Testes passaram: {passed}/{total}")
+
+    return passed == total
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
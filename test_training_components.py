@@ -0,0 +1,511 @@
+#!/usr/bin/env python3
+"""
+Teste dos Componentes de Treinamento
+====================================
+
+Verifica as peças do aprendizado por reforço:
+- train_step vetorizado produz as mesmas atualizações que o laço original
+- ReplayBuffer guarda, sobrescreve e amostra transições como a memória em deque
+- SumTree e replay priorizado amostram proporcionalmente à prioridade
+- Rede alvo (cópia e Polyak), alvo Double-DQN e checkpoints com a rede alvo
+- Caminho de inferência (inference_mode e DQN traçado) decide como o original
+- NumpyDQN reproduz o forward do DQN sem importar o torch
+- Trainer calcula as features uma vez por passo (cache compartilhado)
+- Escudo de segurança descarta jogadas que entram em bolsões
+
+"""
+
+import sys
+import os
+import copy
+import random
+import tempfile
+import subprocess
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+import numpy as np
+import torch
+from src.ai.neural_network import DQN, QTrainer
+from src.ai.agent import Agent
+from src.ai.replay_buffer import ReplayBuffer, SumTree, PrioritizedReplayBuffer
+from src.ai.numpy_policy import NumpyDQN, NumpyAgent, export_weights
+from src.game.headless_game import HeadlessSnakeGame, Direction, Point, CLOCK_WISE, CLOCK_WISE_DELTAS
+from src.ai.training import Trainer
+from src.game.constants import *
+from benchmark_training import legacy_train_step, legacy_predict_action, random_batch
+
+def _assert_same_parameters(model_a, model_b, atol=1e-6):
+    for (name, a), (_, b) in zip(model_a.named_parameters(), model_b.named_parameters()):
+        assert torch.allclose(a, b, atol=atol), f"Parâmetro {name} divergiu (máx {torch.max(torch.abs(a - b)).item():.2e})"
+
+def test_vectorized_train_step_matches_legacy():
+    """O train_step vetorizado deve atualizar a rede como o laço por amostra original"""
+    print("🧪 Comparando train_step vetorizado com o original")
+    print("=" * 50)
+
+    torch.manual_seed(0)
+    rng = np.random.default_rng(0)
+    model = DQN()
+    legacy_model = copy.deepcopy(model)
+    trainer = QTrainer(model)
+    legacy_trainer = QTrainer(legacy_model)
+    # Com SGD a atualização é proporcional ao gradiente (o Adam amplifica ruído de arredondamento
+    # em gradientes próximos de zero), então parâmetros iguais significam gradientes iguais
+    trainer.optimizer = torch.optim.SGD(model.parameters(), lr=0.01)
+    legacy_trainer.optimizer = torch.optim.SGD(legacy_model.parameters(), lr=0.01)
+
+    for step in range(20):
+        # Alternar lotes grandes (memória longa) e amostras únicas (memória curta)
+        if step % 2 == 0:
+            batch = random_batch(64, rng)
+        else:
+            states, actions, rewards, next_states, dones = random_batch(1, rng)
+            batch = (states[0], actions[0], rewards[0], next_states[0], dones[0])
+        trainer.train_step(*batch)
+        legacy_train_step(legacy_trainer, *batch)
+        _assert_same_parameters(model, legacy_model)
+
+    print("✓ Parâmetros iguais após 20 atualizações (lotes e amostras únicas)")
+    return True
+
+def test_replay_buffer():
+    """ReplayBuffer deve se comportar como o deque(maxlen) de tuplas que substituiu"""
+    print("🧪 Testando ReplayBuffer")
+    print("=" * 50)
+
+    rng = np.random.default_rng(0)
+    capacity = 50
+    buffer = ReplayBuffer(capacity, STATE_SIZE, seed=0)
+    transitions = list(zip(*random_batch(120, rng)))
+    for i, transition in enumerate(transitions):
+        buffer.push(*transition)
+        assert len(buffer) == min(i + 1, capacity)
+    assert buffer.maxlen == capacity
+
+    # Após dar a volta, o buffer guarda exatamente as últimas `capacity` transições
+    kept = {(t[0].tobytes(), int(np.argmax(t[1])), t[2], t[4]) for t in transitions[-capacity:]}
+    stored = {(buffer.states[i].tobytes(), int(buffer.actions[i]), float(buffer.rewards[i]), bool(buffer.dones[i]))
+              for i in range(capacity)}
+    assert kept == stored, "Conteúdo do buffer diferente das últimas transições"
+    print(f"✓ {len(transitions)} inserções em capacidade {capacity}: restam as {capacity} mais recentes")
+
+    states, actions, rewards, next_states, dones = buffer.sample(BATCH_SIZE)
+    assert states.shape == (BATCH_SIZE, STATE_SIZE) and states.dtype == np.float32
+    assert next_states.shape == (BATCH_SIZE, STATE_SIZE) and actions.shape == (BATCH_SIZE,)
+    assert actions.dtype == np.int8 and rewards.dtype == np.float32 and dones.dtype == bool
+    print("✓ Lote amostrado com formas e tipos corretos")
+
+    # Inserção em lote (BatchSnakeEnv) equivale a várias inserções unitárias
+    batched = ReplayBuffer(capacity, STATE_SIZE)
+    single = ReplayBuffer(capacity, STATE_SIZE)
+    for _ in range(4):
+        count = 30
+        block = (rng.random((count, STATE_SIZE), dtype=np.float32), rng.integers(0, 3, count),
+                 rng.random(count, dtype=np.float32), rng.random((count, STATE_SIZE), dtype=np.float32),
+                 rng.random(count) < 0.1)
+        batched.extend(*block)
+        for i in range(count):
+            single.push(*(column[i] for column in block))
+    for name in ('states', 'actions', 'rewards', 'next_states', 'dones'):
+        assert np.array_equal(getattr(batched, name), getattr(single, name)), f"extend divergiu em {name}"
+    assert batched.position == single.position and len(batched) == len(single)
+    print("✓ extend equivale a push repetido")
+
+    # Com menos transições que o lote, treinar com o buffer = treinar com a memória inteira original
+    torch.manual_seed(0)
+    model = DQN()
+    legacy_model = copy.deepcopy(model)
+    trainer = QTrainer(model)
+    legacy_trainer = QTrainer(legacy_model)
+    trainer.optimizer = torch.optim.SGD(model.parameters(), lr=0.01)
+    legacy_trainer.optimizer = torch.optim.SGD(legacy_model.parameters(), lr=0.01)
+
+    small = ReplayBuffer(capacity, STATE_SIZE)
+    for transition in transitions[:20]:
+        small.push(*transition)
+    trainer.train_step(*small.sample(BATCH_SIZE))
+    legacy_train_step(legacy_trainer, *zip(*transitions[:20]))
+    _assert_same_parameters(model, legacy_model)
+    print("✓ Atualização com memória pequena igual à do deque original")
+    return True
+
+def test_prioritized_replay():
+    """Somas da SumTree e frequências de amostragem proporcionais à prioridade"""
+    print("🧪 Testando SumTree e PrioritizedReplayBuffer")
+    print("=" * 50)
+
+    rng = np.random.default_rng(0)
+    capacity = 37  # Não potência de 2
+    tree = SumTree(capacity)
+    priorities = np.zeros(capacity)
+    for _ in range(200):
+        idx = rng.integers(0, capacity, size=rng.integers(1, 8))
+        values = rng.random(len(idx))
+        tree.update(idx, values)
+        for i, value in zip(idx, values):
+            priorities[i] = value  # Com índices repetidos vale o último
+    assert np.isclose(tree.total, priorities.sum()), "Raiz diferente da soma das prioridades"
+
+    # find() deve devolver a folha que contém cada valor da soma acumulada
+    cumulative = np.cumsum(priorities)
+    values = rng.random(5000) * tree.total
+    expected = np.minimum(np.searchsorted(cumulative, values, side='right'), capacity - 1)
+    assert np.array_equal(tree.find(values), expected), "find() divergiu da busca na soma acumulada"
+    print(f"✓ SumTree com {capacity} folhas: somas e buscas corretas após 200 atualizações")
+
+    # Frequência de amostragem ~ prioridade^alpha
+    buffer = PrioritizedReplayBuffer(capacity, STATE_SIZE, alpha=1.0, seed=0)
+    for transition in zip(*random_batch(capacity, rng)):
+        buffer.push(*transition)
+    td_errors = np.linspace(0, 3, capacity)
+    buffer.update_priorities(np.arange(capacity), td_errors)
+
+    counts = np.zeros(capacity)
+    for _ in range(2000):
+        batch, indices, weights = buffer.sample(BATCH_SIZE)
+        assert batch[0].shape == (BATCH_SIZE, STATE_SIZE) and weights.shape == (BATCH_SIZE,)
+        assert weights.max() == 1.0 and np.all(weights > 0)
+        np.add.at(counts, indices, 1)
+    expected = (td_errors + PER_EPSILON) / (td_errors + PER_EPSILON).sum()
+    observed = counts / counts.sum()
+    assert np.abs(observed - expected).max() < 0.005, "Frequências fora da proporção das prioridades"
+    assert PER_BETA_START < buffer.beta <= 1.0, "beta deve crescer até 1"
+    print("✓ Frequências de amostragem proporcionais às prioridades, pesos em (0, 1]")
+
+    # Com pesos iguais a 1 a perda ponderada é a MSE original
+    torch.manual_seed(0)
+    model = DQN()
+    weighted_model = copy.deepcopy(model)
+    trainer = QTrainer(model)
+    weighted_trainer = QTrainer(weighted_model)
+    batch = random_batch(64, rng)
+    td = trainer.train_step(*batch)
+    weighted_td = weighted_trainer.train_step(*batch, weights=np.ones(64, dtype=np.float32))
+    _assert_same_parameters(model, weighted_model)
+    assert td.shape == (64,) and np.allclose(td, weighted_td)
+    print("✓ Perda com pesos unitários igual à MSE original")
+    return True
+
+def _expected_td(trainer, batch):
+    """Erro TD calculado à mão, antes da atualização"""
+    states, actions, rewards, next_states, dones = (torch.as_tensor(np.array(x)) for x in batch)
+    actions = torch.argmax(actions, dim=1)
+    rows = torch.arange(len(actions))
+    with torch.no_grad():
+        pred = trainer.model(states.float())[rows, actions]
+        target_q = trainer.target_model(next_states.float())
+        if trainer.double_dqn:
+            next_q = target_q[rows, torch.argmax(trainer.model(next_states.float()), dim=1)]
+        else:
+            next_q = target_q.max(dim=1)[0]
+    q_new = torch.where(dones, rewards.float(), rewards.float() + trainer.gamma * next_q)
+    return (q_new - pred).numpy()
+
+def test_target_network():
+    """Alvo de Bellman vindo da rede alvo, sincronizações e checkpoints"""
+    print("🧪 Testando rede alvo e Double-DQN")
+    print("=" * 50)
+
+    rng = np.random.default_rng(0)
+    torch.manual_seed(0)
+
+    for double_dqn in (False, True):
+        trainer = QTrainer(DQN(), target_network=True, target_update=5, double_dqn=double_dqn)
+        # Rede alvo diferente da online, para o teste distinguir as duas
+        trainer.train_step(*random_batch(64, rng))
+        for step in range(2, 11):
+            batch = random_batch(64, rng)
+            expected = _expected_td(trainer, batch)
+            td_errors = trainer.train_step(*batch)
+            assert np.allclose(td_errors, expected, atol=1e-5), "Erro TD diferente do alvo esperado"
+            same = all(torch.equal(a, b) for a, b in zip(trainer.model.parameters(), trainer.target_model.parameters()))
+            assert same == (step % 5 == 0), f"Sincronização fora de hora na atualização {step}"
+        name = "Double-DQN" if double_dqn else "rede alvo"
+        print(f"✓ {name}: alvo de Bellman correto e cópia a cada 5 atualizações")
+
+    # Polyak: alvo = tau * online + (1 - tau) * alvo
+    trainer = QTrainer(DQN(), target_network=True, tau=0.1)
+    trainer.train_step(*random_batch(64, rng))
+    before = [p.clone() for p in trainer.target_model.parameters()]
+    trainer.train_step(*random_batch(64, rng))
+    for old, target, online in zip(before, trainer.target_model.parameters(), trainer.model.parameters()):
+        assert torch.allclose(target, 0.9 * old + 0.1 * online, atol=1e-6)
+    print("✓ Sincronização suave (Polyak) correta")
+
+    # Checkpoint guarda e restaura a rede alvo
+    agent = Agent(target_network=True)
+    agent.trainer.train_step(*random_batch(64, rng))
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'models', 'checkpoint.pth')
+        agent.save_model(path)
+        loaded = Agent(target_network=True)
+        assert loaded.load_model(path)
+    _assert_same_parameters(agent.trainer.target_model, loaded.trainer.target_model, atol=0)
+    _assert_same_parameters(agent.model, loaded.model, atol=0)
+    print("✓ Checkpoint salva e carrega a rede alvo")
+    return True
+
+def test_inference_path():
+    """predict_action (eager e traçado) deve escolher a mesma ação que o caminho original"""
+    print("🧪 Testando caminho de inferência do Agent")
+    print("=" * 50)
+
+    torch.manual_seed(0)
+    rng = np.random.default_rng(0)
+    agent = Agent()
+    traced_agent = Agent()
+    traced_agent.model.load_state_dict(agent.model.state_dict())
+    traced_agent.use_traced_policy()
+
+    def check(states):
+        for state in states:
+            expected = legacy_predict_action(agent, state)
+            assert agent.predict_action(state) == expected, "inference_mode escolheu outra ação"
+            assert traced_agent.predict_action(state) == expected, "Política traçada escolheu outra ação"
+        q_eager = agent.model(torch.as_tensor(states)).detach()
+        with torch.inference_mode():
+            q_traced = traced_agent.policy(torch.as_tensor(states))
+        assert torch.allclose(q_eager, q_traced, atol=1e-5)
+
+    check(rng.random((500, STATE_SIZE), dtype=np.float32))
+    print("✓ 500 decisões iguais ao caminho original (eager e traçado)")
+
+    # O módulo traçado usa os parâmetros da rede: treino e load_model continuam valendo
+    for _ in range(5):
+        batch = random_batch(64, rng)
+        agent.trainer.train_step(*batch)
+        traced_agent.trainer.train_step(*batch)
+    check(rng.random((200, STATE_SIZE), dtype=np.float32))
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'models', 'model.pth')
+        Agent().save_model(path, save_training_data=False)
+        agent.load_model(path)
+        traced_agent.load_model(path)
+    check(rng.random((200, STATE_SIZE), dtype=np.float32))
+    print("✓ Política traçada acompanha treino e load_model")
+
+    # Estados em lista (como get_action pode receber) e ações em lote
+    state = rng.random(STATE_SIZE, dtype=np.float32)
+    assert agent.predict_action(list(state)) == legacy_predict_action(agent, state)
+    assert traced_agent.get_actions(np.stack([state] * 4)).shape == (4,)
+    print("✓ Entradas em lista e em lote")
+    return True
+
+def test_numpy_policy():
+    """NumpyDQN deve reproduzir o DQN (lote e estado único) e carregar sem torch"""
+    print("🧪 Testando NumpyDQN")
+    print("=" * 50)
+
+    torch.manual_seed(0)
+    rng = np.random.default_rng(0)
+    agent = Agent()
+    for _ in range(5):
+        agent.trainer.train_step(*random_batch(64, rng))
+    agent.n_games, agent.record = 321, 12
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'model.npz')
+        agent.export_numpy(path)
+        policy = NumpyDQN.load(path)
+        numpy_agent = NumpyAgent.load(path)
+
+        states = rng.random((2000, STATE_SIZE), dtype=np.float32)
+        with torch.no_grad():
+            expected = agent.model(torch.as_tensor(states)).numpy()
+        q_values = policy(states)
+        assert q_values.dtype == np.float32 and q_values.shape == expected.shape
+        assert np.allclose(q_values, expected, atol=1e-5), f"Forward divergiu ({np.abs(q_values - expected).max():.2e})"
+        assert np.array_equal(policy.predict_actions(states), expected.argmax(axis=1))
+        for state in states[:200]:
+            assert policy.predict_action(state) == agent.predict_action(state)
+        print(f"✓ Q-values iguais ao DQN (máx. diferença {np.abs(q_values - expected).max():.1e}), mesmas ações")
+
+        # Superfície usada pelo GameInterface no modo AI_PLAY
+        game = HeadlessSnakeGame(seed=0)
+        state = numpy_agent.get_state(game)
+        action = numpy_agent.get_action(state)
+        assert sum(action) == 1 and action.index(1) == agent.predict_action(state)
+        stats = numpy_agent.get_stats()
+        assert stats['games_played'] == 321 and stats['record_score'] == 12
+        assert set(stats) == set(agent.get_stats())
+        print("✓ NumpyAgent joga com a mesma interface do Agent")
+
+        # Processo novo: carregar e decidir sem nunca importar o torch
+        code = (
+            "import sys, numpy as np\n"
+            "from src.ai.numpy_policy import NumpyAgent\n"
+            "from src.game.headless_game import HeadlessSnakeGame\n"
+            f"agent = NumpyAgent.load({path!r})\n"
+            "game = HeadlessSnakeGame(seed=0)\n"
+            "for _ in range(50):\n"
+            "    _, done, _ = game.play_step(agent.get_action(agent.get_state(game)))\n"
+            "    if done: game.reset()\n"
+            "print('torch' in sys.modules)\n"
+        )
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)))
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == 'False', "torch foi importado pelo NumpyAgent"
+    print("✓ torch não foi importado")
+    return True
+
+def test_trainer_feature_cache():
+    """Estado, modelagem de recompensa e estado seguinte devem compartilhar um cálculo por passo"""
+    print("🧪 Testando cache de features no Trainer")
+    print("=" * 50)
+
+    torch.manual_seed(0)
+    trainer = Trainer(headless=True, seed=0)
+    assert trainer.game_state is trainer.agent.get_state_engine(trainer.game)
+
+    computed = []
+    compute = trainer.game_state._compute
+    trainer.game_state._compute = lambda: computed.append(1) or compute()
+
+    positions = 1  # Posição inicial
+    for _ in range(500):
+        done, score = trainer.train_step()
+        positions += 1
+        if done:
+            trainer.end_game(score)
+            positions += 1
+    # A posição após um reset só é calculada quando o próximo passo começa
+    expected = positions - 1 if done else positions
+    assert len(computed) == expected, f"{len(computed)} cálculos para {expected} posições"
+    print(f"✓ {len(computed)} cálculos em 500 passos de treino (um por posição)")
+    return True
+
+def test_safety_shield():
+    """Escudo de segurança: jogadas para bolsões menores que a cobra nunca são escolhidas"""
+    print("\n🧪 Testando escudo de segurança")
+    print("=" * 50)
+
+    torch.manual_seed(0)
+    random.seed(0)
+    game = HeadlessSnakeGame(seed=0)
+    # Cabeça no topo: frente é parede, direita é uma célula presa, esquerda é a região aberta
+    game.set_snake([Point(1, 0), Point(1, 1), Point(2, 1), Point(3, 1), Point(3, 0), Point(4, 0), Point(5, 0)],
+                   Direction.UP)
+    agent = Agent(safety_shield=True)
+    unshielded = Agent(safety_shield=False)
+    with torch.no_grad():
+        # A rede prefere virar à direita (para dentro do bolsão)
+        for model in (agent.model, unshielded.model):
+            model.fc3.bias.copy_(torch.tensor([0.0, 100.0, 0.0]))
+    state = agent.get_state(game)
+    assert agent.safe_actions(game) == [2]
+
+    # Ramo aleatório (epsilon = 1 no jogo 0) e ramo guloso
+    for n_games in (0, 100_000):
+        agent.n_games = unshielded.n_games = n_games
+        moves = {tuple(agent.get_action(state, game)) for _ in range(200)}
+        assert moves == {(0, 0, 1)}, moves
+    assert unshielded.get_action(state, game) == [0, 1, 0]
+    print("✓ Aleatória e gulosa restritas à região aberta")
+
+    # Todas seguras: nada é descartado
+    game.reset()
+    assert agent.safe_actions(game) is None
+
+    # No treino o flood fill do escudo é o mesmo da penalidade de bolsão (cache por passo)
+    trainer = Trainer(headless=True, seed=0, safety_shield=True, enclosed_penalty=True)
+    reachable = trainer.game_state.reachable
+    computed = []
+    compute = reachable._compute
+    reachable._compute = lambda key: computed.append(key) or compute(key)
+    steps = 0
+    for _ in range(500):
+        done, score = trainer.train_step()
+        steps += 1
+        if done:
+            trainer.end_game(score)
+    assert len(computed) == len(set(computed)), "Flood fill repetido na mesma posição"
+    print(f"✓ {len(computed)} flood fills em {steps} passos de treino, {trainer.agent.shielded} decisões filtradas")
+    return True
+
+def test_shield_never_allows_death():
+    """Nenhuma jogada permitida pelo escudo morre no passo seguinte (simulada com snapshot/restore)"""
+    print("\n🧪 Escudo contra morte imediata")
+    print("=" * 50)
+
+    agent = Agent(safety_shield=True)
+    rng = random.Random(0)
+    checked = filtered = tail_moves = 0
+    for seed in range(300):
+        game = HeadlessSnakeGame(width=10 * GRID_SIZE, height=10 * GRID_SIZE, seed=seed)
+        for _ in range(150):
+            allowed = agent.safe_actions(game)
+            snapshot = game.snapshot()
+            outcomes = []
+            for action in range(ACTION_SIZE):
+                reward, done, _ = game.play_step(action)
+                game.restore(snapshot)
+                outcomes.append(done and reward == REWARD_DEATH)
+            if allowed is None:
+                # Nada descartado: ou todas as jogadas vivem, ou todas morrem
+                assert len(set(outcomes)) == 1, (seed, outcomes)
+                options = list(range(ACTION_SIZE))
+            else:
+                assert not any(outcomes[action] for action in allowed), (seed, allowed, outcomes)
+                filtered += 1
+                options = allowed
+            checked += 1
+
+            idx = CLOCK_WISE.index(game.direction)
+            for turn in (0, 1, 3):
+                dx, dy = CLOCK_WISE_DELTAS[(idx + turn) % 4]
+                tail_moves += Point(game.head.x + dx, game.head.y + dy) == game.snake[-1]
+
+            # Vai atrás da comida entre as jogadas permitidas (cobras longas, cauda por perto)
+            def distance(action):
+                dx, dy = CLOCK_WISE_DELTAS[(idx + (0, 1, 3)[action]) % 4]
+                return abs(game.head.x + dx - game.food.x) + abs(game.head.y + dy - game.food.y) + rng.random()
+            _, done, _ = game.play_step(min(options, key=distance))
+            if done:
+                break
+
+    assert tail_moves > 0, "Nenhuma posição com a cauda ao lado da cabeça"
+    print(f"✓ {checked} decisões ({filtered} filtradas, {tail_moves} jogadas para a cauda) sem morte permitida")
+    return True
+
+def main():
+    """Função principal de teste"""
+    print("🚀 Iniciando Testes dos Componentes de Treinamento")
+    print("=" * 60)
+
+    tests = [
+        ("train_step vetorizado", test_vectorized_train_step_matches_legacy),
+        ("ReplayBuffer", test_replay_buffer),
+        ("Replay priorizado", test_prioritized_replay),
+        ("Rede alvo", test_target_network),
+        ("Caminho de inferência", test_inference_path),
+        ("NumpyDQN", test_numpy_policy),
+        ("Cache de features no Trainer", test_trainer_feature_cache),
+        ("Escudo de segurança", test_safety_shield),
+        ("Escudo contra morte imediata", test_shield_never_allows_death),
+    ]
+
+    passed = 0
+    total = len(tests)
+
+    for name, test_func in tests:
+        print(f"\n🧪 Executando: {name}")
+        try:
+            if test_func():
+                print(f"✅ {name}: PASSOU")
+                passed += 1
+            else:
+                print(f"❌ {name}: FALHOU")
+        except Exception as e:
+            print(f"💥 {name}: ERRO - {e}")
+            import traceback
+            traceback.print_exc()
+
+    print(f"\n📊 Resultado Final:")
+    print(f"   Testes passaram: {passed}/{total}")
+
+    return passed == total
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)